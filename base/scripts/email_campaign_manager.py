@@ -14,6 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 sys.path.append(os.path.dirname(__file__))
 
 from quantex.core import database_manager as db
+from quantex.core.empresa_cache import get_empresas_by_rut
 from gmail_sender import GmailSender
 from gmail_monitor import GmailMonitor
 
@@ -82,23 +83,26 @@ class EmailCampaignManager:
                 self.logger.info(f"📋 {len(result.data)} prospectos encontrados")
                 return result.data
             else:
-                # Fallback: query simple
-                empresas = db.supabase.table('empresas').select('rut_empresa, razon_social, region').limit(limit).execute()
-                personas = db.supabase.table('personas').select('*').not_.is_('email_contacto', 'null').limit(limit).execute()
+                # Fallback: personas con email + sus empresas en una sola consulta in_
+                personas = db.supabase.table('personas').select('rut_empresa, nombre_contacto, cargo_contacto, email_contacto').not_.is_('email_contacto', 'null').neq('email_contacto', '').limit(limit).execute()
+                empresas = get_empresas_by_rut([p['rut_empresa'] for p in personas.data or []], supabase=db.supabase)
                 
+                # Un contacto por empresa (el primero encontrado)
                 prospects = []
-                for empresa in empresas.data:
-                    for persona in personas.data:
-                        if empresa['rut_empresa'] == persona['rut_empresa']:
-                            prospects.append({
-                                'rut_empresa': empresa['rut_empresa'],
-                                'razon_social': empresa['razon_social'],
-                                'region': empresa['region'],
-                                'nombre_contacto': persona['nombre_contacto'],
-                                'cargo_contacto': persona['cargo_contacto'],
-                                'email_contacto': persona['email_contacto']
-                            })
-                            break
+                seen_ruts = set()
+                for persona in personas.data or []:
+                    empresa = empresas.get(persona['rut_empresa'])
+                    if not empresa or persona['rut_empresa'] in seen_ruts:
+                        continue
+                    seen_ruts.add(persona['rut_empresa'])
+                    prospects.append({
+                        'rut_empresa': empresa['rut_empresa'],
+                        'razon_social': empresa['razon_social'],
+                        'region': empresa['region'],
+                        'nombre_contacto': persona['nombre_contacto'],
+                        'cargo_contacto': persona['cargo_contacto'],
+                        'email_contacto': persona['email_contacto']
+                    })
                 
                 self.logger.info(f"📋 {len(prospects)} prospectos encontrados (fallback)")
                 return prospects
@@ -15,7 +15,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
 
 from quantex.core import database_manager as db
-from rut_normalizer import normalize_rut, validate_rut
+from crm_bulk_loader import (
+    iter_sheet_chunks, clean_text, normalize_rut_column, preload_existing_keys,
+    write_in_batches, ThroughputMeter, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_SIZE
+)
 
 def setup_logging():
     """Configurar logging para el script"""
@@ -35,33 +38,50 @@ def setup_logging():
     
     return logging.getLogger(__name__)
 
-# Función normalize_rut ahora importada desde utils
+SHEET_NAME = '7000 ACTUALIZACION'
 
-def validate_empresa_data(row):
+# Columnas de texto del Excel -> columnas de la tabla empresas
+EMPRESA_TEXT_COLUMNS = {
+    'RazonSocial': 'razon_social',
+    'NombreFantasia': 'nombre_fantasia',
+    'TipoEmpresa': 'tipo_empresa',
+    'ACTIVIDAD ECONOMICA': 'actividad_economica',
+    'Direccion': 'direccion',
+    'Comuna': 'comuna',
+    'Ciudad': 'ciudad',
+    'Region': 'region',
+    'SitioWeb': 'sitio_web',
+    'COD ACT': 'cod_act',  # ← NUEVO CAMPO
+}
+
+def validate_empresa_chunk(chunk):
     """
-    Valida que los datos obligatorios estén presentes y filtra solo empresas GRANDE
+    Valida un bloque de filas de una vez y filtra solo empresas GRANDE.
+    Devuelve (ruts normalizados, máscara válida, máscara fallo de validación, máscara no GRANDE).
     """
-    required_fields = ['Rut', 'RazonSocial']
-    
-    for field in required_fields:
-        if pd.isna(row.get(field)) or str(row.get(field)).strip() == '':
-            return False, f"Campo obligatorio faltante: {field}"
-    
-    # Validar RUT
-    rut = normalize_rut(row.get('Rut'))
-    if not rut or not validate_rut(row.get('Rut')):
-        return False, "RUT inválido o faltante"
+    ruts = normalize_rut_column(chunk, 'Rut')
+    razon_social = clean_text(chunk, 'RazonSocial')
+    tipo_empresa = clean_text(chunk, 'TipoEmpresa')
     
+    # Campos obligatorios y RUT válido
+    failed_validation = razon_social.isna() | ruts.isna()
     # FILTRO: Solo empresas GRANDE
-    tipo_empresa = str(row.get('TipoEmpresa', '')).strip()
-    if tipo_empresa != 'GRANDE':
-        return False, f"Empresa no es GRANDE (tipo: {tipo_empresa})"
-    
-    return True, "OK"
+    not_grande = ~failed_validation & (tipo_empresa != 'GRANDE')
+    valid = ~failed_validation & ~not_grande
+    return ruts, valid, failed_validation, not_grande
 
-def process_hoja1():
+def build_empresa_records(chunk, ruts):
+    """Registros listos para upsert en la tabla empresas."""
+    data = pd.DataFrame({'rut_empresa': ruts}, index=chunk.index)
+    for source, target in EMPRESA_TEXT_COLUMNS.items():
+        data[target] = clean_text(chunk, source)
+    data['pais'] = 'Chile'
+    return data.to_dict('records')
+
+def process_hoja1(chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
     """
     Procesa la Hoja 1: "7000 ACTUALIZACION" - SOLO EMPRESAS GRANDE
+    (Carga masiva: lectura por bloques, deduplicación contra un set precargado y upsert por lotes)
     """
     logger = setup_logging()
     logger.info("=== INICIANDO PROCESAMIENTO HOJA 1: 7000 ACTUALIZACION (SOLO EMPRESAS GRANDE) ===")
@@ -74,13 +94,7 @@ def process_hoja1():
         return
     
     try:
-        # Leer la hoja
-        logger.info("Leyendo hoja '7000 ACTUALIZACION'...")
-        df = pd.read_excel(excel_path, sheet_name='7000 ACTUALIZACION')
-        logger.info(f"Hoja cargada: {df.shape[0]} filas x {df.shape[1]} columnas")
-        
         # Estadísticas iniciales
-        total_rows = len(df)
         processed = 0
         inserted = 0
         skipped_validation = 0
@@ -88,66 +102,32 @@ def process_hoja1():
         skipped_not_grande = 0  # Nueva estadística para empresas no grandes
         errors = 0
         
-        logger.info(f"Procesando {total_rows} empresas...")
+        # RUTs ya existentes en Supabase (una lectura paginada en vez de una consulta por fila)
+        existing_ruts = preload_existing_keys(db.supabase, 'empresas', ['rut_empresa'])
+        meter = ThroughputMeter()
         
-        # Procesar cada fila
-        for index, row in df.iterrows():
-            processed += 1
+        logger.info(f"Leyendo hoja '{SHEET_NAME}' en bloques de {chunk_size} filas...")
+        for chunk in iter_sheet_chunks(excel_path, SHEET_NAME, chunk_size):
+            processed += len(chunk)
+            
+            ruts, valid, failed_validation, not_grande = validate_empresa_chunk(chunk)
+            skipped_validation += int(failed_validation.sum())
+            skipped_not_grande += int(not_grande.sum())
+            if failed_validation.any():
+                logger.warning(f"Filas con campos obligatorios faltantes o RUT inválido: {list(chunk.index[failed_validation])[:20]}")
+            
+            # Duplicados contra la base y dentro del propio archivo
+            is_new = valid & ~ruts.isin(existing_ruts) & ~ruts.where(valid).duplicated()
+            skipped_duplicate += int((valid & ~is_new).sum())
             
-            if processed % 1000 == 0:
-                logger.info(f"Procesadas {processed}/{total_rows} empresas...")
+            records = build_empresa_records(chunk[is_new], ruts[is_new])
+            written, failed = write_in_batches(db.supabase, 'empresas', records, batch_size, on_conflict='rut_empresa')
+            inserted += written
+            errors += failed
+            existing_ruts.update(ruts[is_new])
             
-            try:
-                # Validar datos
-                is_valid, validation_msg = validate_empresa_data(row)
-                if not is_valid:
-                    if "no es GRANDE" in validation_msg:
-                        skipped_not_grande += 1
-                    else:
-                        logger.warning(f"Fila {index}: {validation_msg}")
-                        skipped_validation += 1
-                    continue
-                
-                # Normalizar RUT
-                rut_empresa = normalize_rut(row.get('Rut'))
-                
-                # Verificar si ya existe en Supabase
-                existing = db.supabase.table('empresas').select('id').eq('rut_empresa', rut_empresa).execute()
-                if existing.data:
-                    skipped_duplicate += 1
-                    continue
-                
-                # Preparar datos para inserción
-                empresa_data = {
-                    'rut_empresa': rut_empresa,
-                    'razon_social': str(row.get('RazonSocial', '')).strip(),
-                    'nombre_fantasia': str(row.get('NombreFantasia', '')).strip() if pd.notna(row.get('NombreFantasia')) else None,
-                    'tipo_empresa': str(row.get('TipoEmpresa', '')).strip() if pd.notna(row.get('TipoEmpresa')) else None,
-                    'actividad_economica': str(row.get('ACTIVIDAD ECONOMICA', '')).strip() if pd.notna(row.get('ACTIVIDAD ECONOMICA')) else None,
-                    'direccion': str(row.get('Direccion', '')).strip() if pd.notna(row.get('Direccion')) else None,
-                    'comuna': str(row.get('Comuna', '')).strip() if pd.notna(row.get('Comuna')) else None,
-                    'ciudad': str(row.get('Ciudad', '')).strip() if pd.notna(row.get('Ciudad')) else None,
-                    'region': str(row.get('Region', '')).strip() if pd.notna(row.get('Region')) else None,
-                    'pais': 'Chile',
-                    'sitio_web': str(row.get('SitioWeb', '')).strip() if pd.notna(row.get('SitioWeb')) else None,
-                    'cod_act': str(row.get('COD ACT', '')).strip() if pd.notna(row.get('COD ACT')) else None  # ← NUEVO CAMPO
-                }
-                
-                # Limpiar valores vacíos
-                empresa_data = {k: v if v != '' else None for k, v in empresa_data.items()}
-                
-                # Insertar en Supabase
-                result = db.supabase.table('empresas').insert(empresa_data).execute()
-                
-                if result.data:
-                    inserted += 1
-                else:
-                    logger.error(f"Error insertando empresa {rut_empresa}")
-                    errors += 1
-                
-            except Exception as e:
-                logger.error(f"Error procesando fila {index}: {e}")
-                errors += 1
+            meter.add(len(chunk))
+            logger.info(f"Procesadas {processed} empresas... {meter.summary()}")
         
         # Estadísticas finales
         logger.info("=== RESUMEN FINAL ===")
@@ -157,6 +137,7 @@ def process_hoja1():
         logger.info(f"Saltadas por validación: {skipped_validation}")
         logger.info(f"Saltadas por duplicados: {skipped_duplicate}")
         logger.info(f"Errores: {errors}")
+        logger.info(f"Throughput: {meter.summary()}")
         
         logger.info("=== PROCESAMIENTO COMPLETADO ===")
         
@@ -15,7 +15,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '.
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
 
 from quantex.core import database_manager as db
-from rut_normalizer import normalize_rut, validate_rut
+from crm_bulk_loader import (
+    iter_sheet_chunks, clean_text, normalize_rut_column, preload_existing_keys,
+    write_in_batches, ThroughputMeter, DEFAULT_CHUNK_SIZE, DEFAULT_BATCH_SIZE
+)
 
 def setup_logging():
     """Configurar logging para el script"""
@@ -35,27 +38,44 @@ def setup_logging():
     
     return logging.getLogger(__name__)
 
-def validate_persona_data(row):
+SHEET_NAME = '7000 ACTUALIZACION'
+
+def validate_persona_chunk(chunk):
     """
-    Valida que los datos del contacto estén presentes y que la empresa sea GRANDE
+    Valida un bloque de filas de una vez: la empresa debe ser GRANDE y debe haber
+    nombre de contacto y RUT de empresa válido.
+    Devuelve (ruts normalizados, nombres, máscara válida, máscara no GRANDE, máscara sin contacto).
     """
-    # Verificar que la empresa sea GRANDE
-    tipo_empresa = str(row.get('TipoEmpresa', '')).strip()
-    if tipo_empresa != 'GRANDE':
-        return False, f"Empresa no es GRANDE (tipo: {tipo_empresa})"
-    
-    # Verificar que haya datos de contacto
-    nombre_contacto = str(row.get('NombreContacto', '')).strip()
-    if pd.isna(row.get('NombreContacto')) or nombre_contacto == '':
-        return False, "Nombre de contacto faltante"
+    tipo_empresa = clean_text(chunk, 'TipoEmpresa')
+    nombres = clean_text(chunk, 'NombreContacto')
+    # Normalizar RUT empresa usando el mismo normalizador que el script de empresas
+    ruts = normalize_rut_column(chunk, 'Rut')
     
+    not_grande = tipo_empresa != 'GRANDE'
     # Solo verificar que haya nombre de contacto (sin filtrar por datos de contacto)
-    
-    return True, "OK"
+    no_contacto = ~not_grande & (nombres.isna() | ruts.isna())
+    valid = ~not_grande & ~no_contacto
+    return ruts, nombres, valid, not_grande, no_contacto
+
+def build_persona_records(chunk, ruts, nombres):
+    """Registros listos para insertar en la tabla personas."""
+    data = pd.DataFrame({
+        'rut_empresa': ruts,
+        'nombre_contacto': nombres,
+        'cargo_contacto': clean_text(chunk, 'CargoContacto'),
+        'celular_contacto': clean_text(chunk, 'CelularContacto'),
+        'telefono_contacto': clean_text(chunk, 'TelefonoContacto'),
+        'email_contacto': clean_text(chunk, 'Email'),
+        'tipo_empresa': clean_text(chunk, 'TipoEmpresa'),  # NUEVO: Para auditoría
+    }, index=chunk.index)
+    data['fuente_datos'] = SHEET_NAME
+    data['estado'] = 'ACTIVO'
+    return data.to_dict('records')
 
-def process_personas_hoja1():
+def process_personas_hoja1(chunk_size=DEFAULT_CHUNK_SIZE, batch_size=DEFAULT_BATCH_SIZE):
     """
     Procesa contactos de la Hoja 1: "7000 ACTUALIZACION" - SOLO EMPRESAS GRANDE
+    (Carga masiva: lectura por bloques, verificación contra sets precargados e inserción por lotes)
     """
     logger = setup_logging()
     logger.info("=== INICIANDO PROCESAMIENTO PERSONAS HOJA 1: 7000 ACTUALIZACION (SOLO EMPRESAS GRANDE) ===")
@@ -68,13 +88,7 @@ def process_personas_hoja1():
         return
     
     try:
-        # Leer la hoja
-        logger.info("Leyendo hoja '7000 ACTUALIZACION'...")
-        df = pd.read_excel(excel_path, sheet_name='7000 ACTUALIZACION')
-        logger.info(f"Hoja cargada: {df.shape[0]} filas x {df.shape[1]} columnas")
-        
         # Estadísticas iniciales
-        total_rows = len(df)
         processed = 0
         inserted = 0
         skipped_not_grande = 0
@@ -83,75 +97,39 @@ def process_personas_hoja1():
         skipped_duplicate = 0
         errors = 0
         
-        logger.info(f"Procesando {total_rows} registros para extraer contactos...")
+        # Empresas existentes y contactos ya cargados (una lectura paginada de cada tabla)
+        existing_empresas = preload_existing_keys(db.supabase, 'empresas', ['rut_empresa'])
+        existing_personas = preload_existing_keys(db.supabase, 'personas', ['rut_empresa', 'nombre_contacto'])
+        meter = ThroughputMeter()
         
-        # Procesar cada fila
-        for index, row in df.iterrows():
-            processed += 1
+        logger.info(f"Leyendo hoja '{SHEET_NAME}' en bloques de {chunk_size} filas...")
+        for chunk in iter_sheet_chunks(excel_path, SHEET_NAME, chunk_size):
+            processed += len(chunk)
+            
+            ruts, nombres, valid, not_grande, no_contacto = validate_persona_chunk(chunk)
+            skipped_not_grande += int(not_grande.sum())
+            skipped_no_contacto += int(no_contacto.sum())
+            
+            # VERIFICAR que la empresa exista en la tabla empresas (con RUT normalizado)
+            empresa_no_existe = valid & ~ruts.isin(existing_empresas)
+            skipped_empresa_no_existe += int(empresa_no_existe.sum())
+            if empresa_no_existe.any():
+                logger.warning(f"{int(empresa_no_existe.sum())} contactos con empresa inexistente en tabla empresas - saltando (ej. {list(ruts[empresa_no_existe].unique()[:10])})")
+            candidates = valid & ~empresa_no_existe
+            
+            # Contacto ya existente para esta empresa (en la base o repetido en el archivo)
+            keys = pd.Series(list(zip(ruts, nombres)), index=chunk.index)
+            is_new = candidates & ~keys.isin(existing_personas) & ~keys.where(candidates).duplicated()
+            skipped_duplicate += int((candidates & ~is_new).sum())
             
-            if processed % 1000 == 0:
-                logger.info(f"Procesadas {processed}/{total_rows} filas...")
+            records = build_persona_records(chunk[is_new], ruts[is_new], nombres[is_new])
+            written, failed = write_in_batches(db.supabase, 'personas', records, batch_size)
+            inserted += written
+            errors += failed
+            existing_personas.update(keys[is_new])
             
-            try:
-                # Validar datos del contacto
-                is_valid, validation_msg = validate_persona_data(row)
-                if not is_valid:
-                    if "no es GRANDE" in validation_msg:
-                        skipped_not_grande += 1
-                    else:
-                        logger.warning(f"Fila {index}: {validation_msg}")
-                        skipped_no_contacto += 1
-                    continue
-                
-                # Normalizar RUT empresa usando el mismo normalizador que el script de empresas
-                rut_empresa = normalize_rut(row.get('Rut'))
-                if not rut_empresa:
-                    logger.warning(f"Fila {index}: RUT empresa faltante o inválido")
-                    skipped_no_contacto += 1
-                    continue
-                
-                # VERIFICAR que la empresa exista en la tabla empresas (con RUT normalizado)
-                empresa_exists = db.supabase.table('empresas').select('id').eq('rut_empresa', rut_empresa).execute()
-                if not empresa_exists.data:
-                    logger.warning(f"Fila {index}: Empresa {rut_empresa} no existe en tabla empresas - saltando contacto")
-                    skipped_empresa_no_existe += 1
-                    continue
-                
-                # Verificar si ya existe este contacto para esta empresa
-                # (asumiendo que no hay duplicados por ahora, pero registramos)
-                existing = db.supabase.table('personas').select('id').eq('rut_empresa', rut_empresa).eq('nombre_contacto', str(row.get('NombreContacto', '')).strip()).execute()
-                if existing.data:
-                    skipped_duplicate += 1
-                    continue
-                
-                # Preparar datos para inserción
-                persona_data = {
-                    'rut_empresa': rut_empresa,
-                    'nombre_contacto': str(row.get('NombreContacto', '')).strip(),
-                    'cargo_contacto': str(row.get('CargoContacto', '')).strip() if pd.notna(row.get('CargoContacto')) else None,
-                    'celular_contacto': str(row.get('CelularContacto', '')).strip() if pd.notna(row.get('CelularContacto')) else None,
-                    'telefono_contacto': str(row.get('TelefonoContacto', '')).strip() if pd.notna(row.get('TelefonoContacto')) else None,
-                    'email_contacto': str(row.get('Email', '')).strip() if pd.notna(row.get('Email')) else None,
-                    'tipo_empresa': str(row.get('TipoEmpresa', '')).strip(),  # NUEVO: Para auditoría
-                    'fuente_datos': '7000 ACTUALIZACION',
-                    'estado': 'ACTIVO'
-                }
-                
-                # Limpiar valores vacíos
-                persona_data = {k: v if v != '' else None for k, v in persona_data.items()}
-                
-                # Insertar en Supabase
-                result = db.supabase.table('personas').insert(persona_data).execute()
-                
-                if result.data:
-                    inserted += 1
-                else:
-                    logger.error(f"Error insertando contacto para empresa {rut_empresa}")
-                    errors += 1
-                
-            except Exception as e:
-                logger.error(f"Error procesando fila {index}: {e}")
-                errors += 1
+            meter.add(len(chunk))
+            logger.info(f"Procesadas {processed} filas... {meter.summary()}")
         
         # Estadísticas finales
         logger.info("=== RESUMEN FINAL ===")
@@ -162,6 +140,7 @@ def process_personas_hoja1():
         logger.info(f"Saltadas por empresa no existe: {skipped_empresa_no_existe}")
         logger.info(f"Saltadas por duplicados: {skipped_duplicate}")
         logger.info(f"Errores: {errors}")
+        logger.info(f"Throughput: {meter.summary()}")
         
         logger.info("=== PROCESAMIENTO COMPLETADO ===")
         
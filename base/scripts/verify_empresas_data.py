@@ -12,8 +12,10 @@ import logging
 
 # Agregar el path del proyecto principal
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'utils'))
 
 from quantex.core import database_manager as db
+from rut_normalizer import normalize_rut_frame
 
 def setup_logging():
     """Configurar logging para el script"""
@@ -107,6 +109,15 @@ def verify_empresas_data():
         else:
             logger.info("✅ Todos los RUTs tienen formato válido")
         
+        # Verificar dígito verificador (vectorizado sobre toda la columna)
+        rut_check = normalize_rut_frame(df['rut_empresa'])
+        wrong_dv = df[rut_check['valid'] & (rut_check['normalized'] != df['rut_empresa'])]
+        if len(wrong_dv) > 0:
+            logger.warning(f"⚠️ Se encontraron {len(wrong_dv)} RUTs cuyo DV o formato no coincide con el normalizado")
+            logger.warning(f"RUTs problemáticos: {wrong_dv['rut_empresa'].tolist()[:50]}")
+        else:
+            logger.info("✅ Todos los RUTs coinciden con su forma normalizada")
+        
         # 6. Análisis geográfico
         logger.info("\n=== ANÁLISIS GEOGRÁFICO ===")
         
@@ -144,6 +155,7 @@ def verify_empresas_data():
         logger.info(f"✅ Todas son empresas GRANDE: {'Sí' if tipo_empresa_counts.get('GRANDE', 0) == total_empresas else 'No'}")
         logger.info(f"✅ RUTs únicos: {'Sí' if rut_duplicates == 0 else 'No'}")
         logger.info(f"✅ Formato RUTs válido: {'Sí' if len(invalid_ruts) == 0 else 'No'}")
+        logger.info(f"✅ DV de RUTs consistente: {'Sí' if len(wrong_dv) == 0 else 'No'}")
         
         logger.info("=== VERIFICACIÓN COMPLETADA ===")
         
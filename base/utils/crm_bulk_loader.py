@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Cargador masivo para la ingesta CRM desde Excel (empresas / personas)
+
+- Lee la hoja en bloques de filas con openpyxl en modo read-only (sin cargar el libro entero)
+- Normaliza y valida RUTs por columna (rut_normalizer.normalize_rut_series)
+- Deduplica contra Supabase con un set precargado (una lectura paginada, no una consulta por fila)
+- Escribe en lotes (upsert / insert) y reporta el throughput en filas por segundo
+"""
+
+import time
+import logging
+import pandas as pd
+from openpyxl import load_workbook
+
+from rut_normalizer import normalize_rut_series
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_BATCH_SIZE = 500
+PAGE_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def iter_sheet_chunks(excel_path, sheet_name, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Itera la hoja en DataFrames de 'chunk_size' filas. La primera fila es el encabezado.
+    El índice de cada bloque es la posición de la fila de datos (como en pd.read_excel).
+    """
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c).strip() if c is not None else f"col_{i}" for i, c in enumerate(header)]
+
+        buffer, start = [], 0
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)), dtype=object)
+                start += len(buffer)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns, index=range(start, start + len(buffer)), dtype=object)
+    finally:
+        workbook.close()
+
+
+def clean_text(df, column):
+    """Columna como texto sin espacios; vacíos y NaN quedan en None (listo para JSON)."""
+    if column not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    text = df[column].astype('string').str.strip()
+    return text.astype(object).where(text.notna() & (text != ''), None)
+
+
+def normalize_rut_column(df, column='Rut'):
+    """RUTs normalizados ('12345678-9') o None si son inválidos."""
+    if column not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+    return normalize_rut_series(df[column]).astype(object).where(lambda s: s.notna(), None)
+
+
+def preload_existing_keys(supabase, table, columns):
+    """
+    Set con las claves ya existentes en 'table' (lectura paginada).
+    Con una columna devuelve valores sueltos; con varias, tuplas.
+    Las páginas se ordenan por 'id' para que no se solapen ni salten filas.
+    """
+    keys = set()
+    select = ', '.join(columns)
+    offset = 0
+    while True:
+        response = supabase.table(table).select(select) \
+            .order('id').range(offset, offset + PAGE_SIZE - 1).execute()
+        data = response.data or []
+        for row in data:
+            keys.add(row[columns[0]] if len(columns) == 1 else tuple(row[c] for c in columns))
+        if len(data) < PAGE_SIZE:
+            break
+        offset += PAGE_SIZE
+    logger.info(f"Precargadas {len(keys)} claves existentes de '{table}'")
+    return keys
+
+
+def write_in_batches(supabase, table, records, batch_size=DEFAULT_BATCH_SIZE, on_conflict=None):
+    """
+    Inserta (o hace upsert con 'on_conflict', ignorando duplicados) en lotes.
+    Devuelve (filas escritas, filas con error).
+    """
+    written, errors = 0, 0
+    for i in range(0, len(records), batch_size):
+        batch = records[i:i + batch_size]
+        try:
+            if on_conflict:
+                result = supabase.table(table).upsert(batch, on_conflict=on_conflict, ignore_duplicates=True).execute()
+            else:
+                result = supabase.table(table).insert(batch).execute()
+            written += len(result.data or [])
+        except Exception as e:
+            logger.error(f"Error escribiendo lote {i // batch_size + 1} en '{table}' ({len(batch)} filas): {e}")
+            errors += len(batch)
+    return written, errors
+
+
+class ThroughputMeter:
+    """Filas por segundo acumuladas durante la carga."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.rows = 0
+
+    def add(self, rows):
+        self.rows += rows
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self):
+        return f"{self.rows} filas en {self.elapsed:.1f}s ({self.rows_per_second:,.0f} filas/s)"
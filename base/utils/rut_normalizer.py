@@ -4,6 +4,7 @@ Utilidades para normalización y validación de RUTs chilenos
 """
 
 import re
+import numpy as np
 import pandas as pd
 
 def calculate_dv(rut_number):
@@ -137,6 +138,106 @@ def format_rut_for_display(rut_value):
         return f"{formatted_number}-{dv}"
     return None
 
+# --- Versión vectorizada (columnas completas) ---
+# Los RUTs se tratan como una matriz de códigos Unicode (filas x caracteres) y toda la
+# lógica de normalize_rut (limpieza, separación número/DV, módulo 11, formato) se
+# resuelve con aritmética NumPy sobre esa matriz, sin bucles por fila en Python.
+DV_MULTIPLIERS = np.array([2, 3, 4, 5, 6, 7, 2, 3], dtype=np.int64)
+DIGIT_POWERS = 10 ** np.arange(7, -1, -1, dtype=np.int64)
+_ZERO, _HYPHEN, _DOT, _SPACE, _K, _K_LOWER = (ord(c) for c in '0-. Kk')
+
+def _dv_codes(numbers):
+    """Códigos Unicode del dígito verificador (misma regla que calculate_dv)."""
+    digits = (numbers[:, None] // DIGIT_POWERS) % 10  # 8 dígitos con ceros a la izquierda
+    dv = 11 - (digits * DV_MULTIPLIERS).sum(axis=1) % 11
+    return np.where(dv == 11, _ZERO, np.where(dv == 10, _K, _ZERO + dv)).astype(np.uint32)
+
+def calculate_dv_array(numbers):
+    """
+    Dígito verificador para un array de números de RUT (misma regla que calculate_dv).
+    """
+    return _dv_codes(np.asarray(numbers, dtype=np.int64)).view('U1')
+
+def _codes_to_strings(codes):
+    """Matriz de códigos (n, ancho) -> array de strings de ancho fijo."""
+    codes = np.ascontiguousarray(codes, dtype=np.uint32)
+    return codes.view(f'U{codes.shape[1]}').ravel()
+
+def normalize_rut_frame(series):
+    """
+    Normaliza, valida y formatea una columna completa de RUTs en una sola pasada.
+    Reproduce normalize_rut / validate_rut / format_rut_for_display fila a fila
+    (solo se reconocen dígitos ASCII).
+    
+    Args:
+        series: pandas Series (o lista) con RUTs en cualquier formato
+    
+    Returns:
+        pandas DataFrame con columnas 'normalized' ('12345678-9' o None),
+        'valid' (bool) y 'display' ('12.345.678-9' o None), mismo índice.
+    """
+    series = pd.Series(series)
+    normalized_out = np.full(len(series), None, dtype=object)
+    display_out = np.full(len(series), None, dtype=object)
+    valid = np.zeros(len(series), dtype=bool)
+    result = lambda: pd.DataFrame({'normalized': normalized_out, 'valid': valid, 'display': display_out}, index=series.index)
+    if series.empty:
+        return result()
+    
+    text = series.astype(str).to_numpy(dtype=str)
+    missing = series.isna().to_numpy() | (text == '')
+    codes = text.view(np.uint32).reshape(len(text), -1)
+    width = codes.shape[1]
+    
+    # Solo cuentan dígitos, guiones y K/k (el resto se descarta, como el re.sub original)
+    is_digit = (codes >= _ZERO) & (codes <= _ZERO + 9)
+    is_hyphen = codes == _HYPHEN
+    is_k = (codes == _K) | (codes == _K_LOWER)
+    n_digits = is_digit.sum(axis=1)
+    n_hyphens = is_hyphen.sum(axis=1)
+    
+    # Caso 1: 'número-dv' con un solo guión y solo dígitos antes -> se recalcula el DV
+    hyphen_pos = np.where(n_hyphens == 1, is_hyphen.argmax(axis=1), width)
+    before_hyphen = np.arange(width) < hyphen_pos[:, None]
+    digits_before = (is_digit & before_hyphen).sum(axis=1)
+    with_hyphen = ~missing & (n_hyphens == 1) & ~(is_k & before_hyphen).any(axis=1) & (digits_before >= 1) & (digits_before <= 8)
+    # Caso 2: solo dígitos -> se calcula el DV
+    only_digits = ~missing & (n_hyphens == 0) & ~is_k.any(axis=1) & (n_digits >= 1) & (n_digits <= 8)
+    # Caso 3: contiene K (sin caer en los anteriores) -> todos los dígitos + DV 'K'
+    with_k = ~missing & ~with_hyphen & ~only_digits & is_k.any(axis=1) & (n_digits >= 1) & (n_digits <= 8)
+    
+    valid = with_hyphen | only_digits | with_k
+    if not valid.any():
+        return result()
+    
+    # Valor numérico de los dígitos usados en cada fila
+    used = np.where(with_hyphen[:, None], is_digit & before_hyphen, is_digit)[valid]
+    digit_values = codes[valid].astype(np.int64) - _ZERO
+    numbers = np.zeros(int(valid.sum()), dtype=np.int64)
+    for col in range(width):  # Horner por columna (ancho del string, no por fila)
+        numbers = np.where(used[:, col], numbers * 10 + digit_values[:, col], numbers)
+    dv = np.where(with_k[valid], _K, _dv_codes(numbers)).astype(np.uint32)
+    
+    # 'NNNNNNNN-D'
+    padded = ((numbers[:, None] // DIGIT_POWERS) % 10 + _ZERO).astype(np.uint32)
+    normalized = _codes_to_strings(np.column_stack([padded, np.full(len(numbers), _HYPHEN), dv]))
+    
+    # 'N.NNN.NNN-D' sin ceros a la izquierda: se arma a ancho fijo y se recortan los ceros y puntos iniciales
+    significant = np.searchsorted(DIGIT_POWERS[::-1][1:], numbers, side='right') + 1
+    dots = np.full(len(numbers), _DOT, dtype=np.uint32)
+    display = np.column_stack([padded[:, :2], dots, padded[:, 2:5], dots, padded[:, 5:], np.full(len(numbers), _HYPHEN), dv])
+    digit_slots = np.array([0, 1, 3, 4, 5, 7, 8, 9])
+    leading = np.zeros(display.shape, dtype=bool)
+    leading[:, digit_slots] = np.arange(8) < (8 - significant)[:, None]
+    leading[:, 2] = significant <= 6
+    leading[:, 6] = significant <= 3
+    display[leading] = _SPACE
+    display = np.strings.lstrip(_codes_to_strings(display))
+    
+    normalized_out[valid] = normalized
+    display_out[valid] = display
+    return result()
+
 # Función de conveniencia para usar en pandas
 def normalize_rut_series(series):
     """
@@ -148,7 +249,56 @@ def normalize_rut_series(series):
     Returns:
         pandas Series: Serie con RUTs normalizados
     """
-    return series.apply(normalize_rut)
+    return normalize_rut_frame(series)['normalized']
+
+def benchmark_rut_normalization(rows=50000, repeats=3):
+    """
+    Micro-benchmark: series.apply(normalize_rut) (ruta anterior) vs normalize_rut_frame,
+    sobre RUTs sintéticos en formatos mixtos. Verifica que ambos resultados coincidan.
+    """
+    import time
+    
+    rng = np.random.default_rng(0)
+    numbers = rng.integers(1_000_000, 99_999_999, rows)
+    formats = [
+        lambda n: str(n),
+        lambda n: f"{n}-{calculate_dv(n)}",
+        lambda n: f"{n:,}".replace(',', '.') + '-0',
+        lambda n: f"{n}k",
+        lambda n: None,
+        lambda n: f"ABC{n}9",
+    ]
+    series = pd.Series([formats[i % len(formats)](n) for i, n in enumerate(numbers)])
+    
+    def _best_of(fn):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            out = fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings), out
+    
+    # Ruta anterior: un apply por columna (normalizado, válido y formato de despliegue)
+    def _per_row_path():
+        return pd.DataFrame({
+            'normalized': series.apply(normalize_rut),
+            'valid': series.apply(validate_rut),
+            'display': series.apply(format_rut_for_display)
+        })
+    
+    apply_ms, _ = _best_of(lambda: series.apply(normalize_rut))
+    per_row_ms, expected = _best_of(_per_row_path)
+    vector_ms, frame = _best_of(lambda: normalize_rut_frame(series))
+    for column in ('normalized', 'valid', 'display'):
+        assert frame[column].tolist() == expected[column].tolist(), f"Diferencia en la columna '{column}'"
+    return {
+        'rows': rows,
+        'apply_normalize_ms': round(apply_ms, 1),
+        'per_row_ms': round(per_row_ms, 1),
+        'vectorized_ms': round(vector_ms, 1),
+        'speedup_normalize': round(apply_ms / vector_ms, 1) if vector_ms else None,
+        'speedup': round(per_row_ms / vector_ms, 1) if vector_ms else None
+    }
 
 # Ejemplos de uso
 if __name__ == "__main__":
@@ -179,54 +329,6 @@ if __name__ == "__main__":
         print(f"  Formateado: {formatted}")
         print()
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+    print("=== BENCHMARK NORMALIZACIÓN VECTORIZADA ===")
+    result = benchmark_rut_normalization()
+    print(f"{result['rows']} RUTs | apply(normalize_rut): {result['apply_normalize_ms']} ms | por fila (3 columnas): {result['per_row_ms']} ms | vectorizado: {result['vectorized_ms']} ms | x{result['speedup_normalize']} / x{result['speedup']}")
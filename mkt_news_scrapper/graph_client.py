@@ -1,4 +1,5 @@
 import os
+import sys
 import uuid
 from datetime import datetime, timezone
 
@@ -6,8 +7,14 @@ from env_loader import load_env_with_fallback
 
 load_env_with_fallback()
 
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+	sys.path.append(PROJECT_ROOT)
+
 try:
-	from supabase import create_client
+	from quantex.core.supabase_pool import get_supabase_client
+	from quantex.core.entity_cache import upsert_entities
+	from quantex.core.node_dedup import document_exists_by_url, document_exists_by_hash
 except Exception as e:
 	raise RuntimeError("Supabase client not installed. Add 'supabase' to requirements.txt")
 
@@ -15,41 +22,22 @@ except Exception as e:
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_KEY')
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 def node_exists_by_original_url(original_url: str) -> bool:
-	if not original_url:
-		return False
-	res = supabase.table('nodes') \
-		.select('id', count='exact') \
-		.eq('type', 'Documento') \
-		.eq('properties->>original_url', original_url.strip()) \
-		.execute()
-	return (res.count or 0) > 0
+	# Indexed dedup_url column (falls back to properties->>original_url)
+	return document_exists_by_url(original_url, supabase)
 
 
 def node_exists_by_hash(item_hash: str) -> bool:
 	"""Check if a Documento with the same logical hash already exists."""
-	if not item_hash:
-		return False
-	res = supabase.table('nodes') \
-		.select('id', count='exact') \
-		.eq('type', 'Documento') \
-		.eq('properties->>hash', item_hash) \
-		.execute()
-	return (res.count or 0) > 0
+	return document_exists_by_hash(item_hash, supabase)
 
 
 def upsert_entity_nodes(entity_labels: list[str]) -> dict[str, str]:
-	if not entity_labels:
-		return {}
-	# Upsert by (label,type)
-	supabase.table('nodes').upsert(
-		[{"type": "Entidad", "label": label} for label in entity_labels], on_conflict='label,type'
-	).execute()
-	rows = supabase.table('nodes').select('id,label').eq('type','Entidad').in_('label', entity_labels).execute().data
-	return {row['label']: row['id'] for row in rows}
+	# Upsert by (label,type), resolved through the shared label->id cache
+	return upsert_entities(entity_labels, supabase)
 
 
 def insert_document_node(node_content: str, document_title: str, properties: dict) -> str:
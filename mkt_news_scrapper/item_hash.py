@@ -0,0 +1,14 @@
+import hashlib
+
+
+def compute_item_hash(title: str, time_text: str | None, precomputed: str | None = None) -> str:
+	"""Stable hash of a news card: sha256(lower(strip(title)) + "|" + time_text).
+
+	Shared by text_processing and the scraper's in-browser extraction (which
+	computes the same key with crypto.subtle and must stay in sync with it).
+	"""
+	# Prefer precomputed stable hash if provided by source
+	if precomputed:
+		return precomputed
+	key = (title or '').strip().lower() + '|' + (time_text or '')
+	return hashlib.sha256(key.encode('utf-8')).hexdigest()
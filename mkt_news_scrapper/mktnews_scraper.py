@@ -23,13 +23,19 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from item_hash import compute_item_hash
+
 MKTPAGE_URL = "https://mktnews.net/index.html"
 DEBUGGER_ADDRESS = "127.0.0.1:9222"
 CHROME_PROFILE_DIR = os.path.join(os.getcwd(), "chrome_profile")
 # Unificar carpeta de exportación con ingest_from_md.py (misma carpeta del script)
 EXPORTS_DIR = os.path.join(os.path.dirname(__file__), "exports")
+# Hashes of the most recent saved cards (newest first); extraction stops at the first one found
+SEEN_HASHES_PATH = os.path.join(EXPORTS_DIR, "mktnews_seen_hashes.json")
+SEEN_HASHES_MAX = 500
 
 _driver = None
+_seen_hashes = None
 
 
 def _is_port_open(host: str, port: int) -> bool:
@@ -133,7 +139,7 @@ def initialize_page(driver: webdriver.Chrome) -> None:
 	try:
 		important_button = wait.until(EC.element_to_be_clickable((By.XPATH, "//main//button[contains(., 'Important') or contains(., 'Important Only') or contains(., 'Importante')]")))
 		important_button.click()
-		time.sleep(1.5)
+		_wait_for_dom_quiet(driver)
 	except Exception:
 		pass
 def _refresh_feed(driver: webdriver.Chrome) -> None:
@@ -142,168 +148,225 @@ def _refresh_feed(driver: webdriver.Chrome) -> None:
 		cache_bust = int(time.time())
 		driver.get(f"{MKTPAGE_URL}?t={cache_bust}")
 		WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.XPATH, "//main")))
-		time.sleep(0.8)
+		_wait_for_dom_quiet(driver)
 	except Exception:
 		pass
 
 
+# Resolves once <main> has had no DOM mutations for quiet_ms (or after timeout_ms)
+_WAIT_DOM_QUIET_JS = r"""
+const [quietMs, timeoutMs, done] = arguments;
+const root = document.querySelector('main') || document.documentElement;
+let quietTimer = null;
+const finish = () => { obs.disconnect(); clearTimeout(quietTimer); clearTimeout(hardTimer); done(true); };
+const obs = new MutationObserver(() => { clearTimeout(quietTimer); quietTimer = setTimeout(finish, quietMs); });
+obs.observe(root, {childList: true, subtree: true, characterData: true});
+quietTimer = setTimeout(finish, quietMs);
+const hardTimer = setTimeout(finish, timeoutMs);
+"""
 
-def _visible_human_scroll(driver: webdriver.Chrome, total_steps: int = 12, step_px: int = 600, pause_s: float = 0.35) -> None:
-	for _ in range(total_steps):
-		driver.execute_script("window.scrollBy(0, arguments[0]);", step_px)
-		time.sleep(pause_s)
-	# small bounce to trigger lazy-load observers
-	driver.execute_script("window.scrollBy(0, -200);")
-	time.sleep(0.5)
 
-def _go_to_top_and_render(driver: webdriver.Chrome) -> None:
-	"""Vuelve al tope y fuerza un pequeño render del primer viewport."""
+def _wait_for_dom_quiet(driver: webdriver.Chrome, quiet_ms: int = 300, timeout_ms: int = 3000) -> None:
+	"""Replaces fixed sleeps: wait until the feed stops re-rendering."""
 	try:
-		driver.execute_script("window.scrollTo(0, 0);")
-		time.sleep(0.4)
-		for _ in range(3):
-			driver.execute_script("window.scrollBy(0, 200);"); time.sleep(0.15)
-			driver.execute_script("window.scrollBy(0, -200);"); time.sleep(0.15)
+		driver.set_script_timeout(timeout_ms / 1000 + 5)
+		driver.execute_async_script(_WAIT_DOM_QUIET_JS, quiet_ms, timeout_ms)
 	except Exception:
 		pass
 
 
-def extract_visible_news(driver: webdriver.Chrome, max_items: int = 50) -> list:
-	# Focus only within <main> area; ignore sidebars and chat
-	news_items = []
+# Single in-browser extraction pass. Same selectors as the previous per-card
+# find_elements calls, evaluated in the page with document.evaluate. Cards are
+# read in DOM order (newest first); lazy-load is triggered by scrolling only when
+# more cards are needed, waiting for DOM mutations instead of fixed sleeps. Each
+# card is keyed with the same hash as item_hash.compute_item_hash
+# (sha256(lower(trim(title)) + '|' + time)) and extraction stops at the first
+# card already seen. Returns {items, cards, reached_seen, hashed, elapsed_ms, debug_html}.
+_EXTRACT_CARDS_JS = r"""
+const [maxItems, seenList, timeoutMs, growMs, done] = arguments;
+const seen = new Set(seenList || []);
+const t0 = performance.now();
+const CARD_XPATH = ".//div[((contains(@class,'flash') and contains(@class,'item')) or contains(@class,'news')) and not(ancestor::*[contains(@class,'chat') or contains(@id,'chat')])]";
+const TITLE_XPATHS = [".//div[contains(@class,'flash-title')][normalize-space()]",
+	".//*[self::h1 or self::h2 or self::h3 or contains(@class,'title') or contains(@class,'headline')][normalize-space()]"];
+const CONTENT_XPATHS = [".//div[contains(@class,'flash-content')][normalize-space()]",
+	".//*[contains(@class,'content') or contains(@class,'body') or contains(@class,'desc') or self::p][normalize-space()]"];
+const TS_XPATH = ".//span[normalize-space()][1]";
+const BADGE_XPATH = ".//*[contains(@class,'badge') or contains(@class,'tag') or contains(@class,'label')][normalize-space()]";
+const TIME_LINE = /^\d{2}:\d{2}(?::\d{2})?$/;
+
+const snapshot = (xpath, ctx) => {
+	const res = document.evaluate(xpath, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+	const out = [];
+	for (let i = 0; i < res.snapshotLength; i++) out.push(res.snapshotItem(i));
+	return out;
+};
+const first = (xpath, ctx) => document.evaluate(xpath, ctx, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+const getMain = () => first('//main', document);
+const getCards = (main) => {
+	let cards = snapshot(CARD_XPATH, main);
+	if (!cards.length) cards = Array.from(main.querySelectorAll('div.flash.item, div.news, article.news, li.news'));
+	return cards;
+};
+const waitForMutation = (root, ms) => new Promise((resolve) => {
+	const obs = new MutationObserver(() => { obs.disconnect(); clearTimeout(timer); resolve(true); });
+	obs.observe(root, {childList: true, subtree: true});
+	const timer = setTimeout(() => { obs.disconnect(); resolve(false); }, Math.max(0, ms));
+});
+const remaining = () => timeoutMs - (performance.now() - t0);
+const hasSubtle = !!(window.crypto && window.crypto.subtle && window.TextEncoder);
+const sha256 = async (str) => {
+	const buf = await window.crypto.subtle.digest('SHA-256', new TextEncoder().encode(str));
+	return Array.from(new Uint8Array(buf)).map((b) => b.toString(16).padStart(2, '0')).join('');
+};
+
+const extract = (card) => {
+	let title = '', content = '';
+	for (const xp of TITLE_XPATHS) { title = text(first(xp, card)); if (title) break; }
+	for (const xp of CONTENT_XPATHS) { content = text(first(xp, card)); if (content) break; }
+	let ts = text(first(TS_XPATH, card));
+	if (!ts && card.previousElementSibling) {
+		const left = text(card.previousElementSibling);
+		if (left.includes(':')) ts = left.split(/\s+/).find((tok) => tok.includes(':') && tok.length >= 4 && tok.length <= 8) || '';
+	}
+	const tags = snapshot(BADGE_XPATH, card).map(text).filter(Boolean);
+	if (!title && content) title = content.split('. ')[0].slice(0, 120);
+	if (!title && !content) {
+		const lines = (card.innerText || '').replace(/\r/g, '\n').split('\n').map((l) => l.trim()).filter((l) => l && !TIME_LINE.test(l));
+		if (lines.length) { title = lines[0].slice(0, 120); content = lines.slice(1).join(' ').slice(0, 500); }
+	}
+	return {title: title, content: content, timestamp: ts, tags: tags};
+};
+
+(async () => {
+	try {
+		let main = getMain();
+		while (!main && remaining() > 0) { await waitForMutation(document.documentElement, remaining()); main = getMain(); }
+		if (!main) return done({items: [], cards: 0, reached_seen: false, hashed: hasSubtle, elapsed_ms: performance.now() - t0, debug_html: []});
+		let cards = getCards(main);
+		while (!cards.length && remaining() > 0) { await waitForMutation(main, remaining()); cards = getCards(main); }
+
+		const items = [];
+		let reachedSeen = false;
+		for (let i = 0; items.length < maxItems && remaining() > 0; i++) {
+			if (i >= cards.length) {
+				// Need more cards: scroll the last one into view and wait for lazy-load to append
+				const last = cards[cards.length - 1];
+				if (last) last.scrollIntoView({block: 'end'}); else window.scrollBy(0, 700);
+				const growDeadline = performance.now() + Math.min(growMs, remaining());
+				while (i >= cards.length && performance.now() < growDeadline) {
+					await waitForMutation(main, growDeadline - performance.now());
+					cards = getCards(main);
+				}
+				if (i >= cards.length) break;
+			}
+			const item = extract(cards[i]);
+			if (!item.title && !item.content) continue;
+			item.item_hash = hasSubtle ? await sha256(item.title.trim().toLowerCase() + '|' + item.timestamp) : null;
+			if (item.item_hash && seen.has(item.item_hash)) { reachedSeen = true; break; }
+			items.push(item);
+		}
+		window.scrollTo(0, 0);
+		const debugHtml = (!items.length && !reachedSeen) ? cards.slice(0, 2).map((c) => c.outerHTML) : [];
+		done({items: items, cards: cards.length, reached_seen: reachedSeen, hashed: hasSubtle, elapsed_ms: performance.now() - t0, debug_html: debugHtml});
+	} catch (e) {
+		done({error: String(e), items: [], cards: 0, reached_seen: false, hashed: false, elapsed_ms: performance.now() - t0, debug_html: []});
+	}
+})();
+"""
+
+
+def _extract_cards(driver: webdriver.Chrome, max_items: int = 50, seen_hashes=None, timeout_ms: int = 8000, grow_ms: int = 600) -> dict:
+	"""Run the single-script extraction and re-check hashes/seen on the Python side."""
+	seen = set(seen_hashes or [])
 	try:
-		main = driver.find_element(By.XPATH, "//main")
-		# Selector más robusto: combinamos XPATH y CSS y normalizamos el OR
-		cards = main.find_elements(By.XPATH, 
-			".//div[((contains(@class,'flash') and contains(@class,'item')) or contains(@class,'news')) and not(ancestor::*[contains(@class,'chat') or contains(@id,'chat')])]")
-		if len(cards) == 0:
-			# Fallback CSS
-			cards = main.find_elements(By.CSS_SELECTOR, "div.flash.item, div.news, article.news, li.news")
-		# Scroll incremental hasta reunir ~max_items
-		steps = 0
-		while len(cards) < max_items and steps < 20:
-			try:
-				driver.execute_script("window.scrollBy(0, 700);")
-			except Exception:
-				break
-			time.sleep(0.25)
-			try:
-				main = driver.find_element(By.XPATH, "//main")
-				cards = main.find_elements(By.XPATH, 
-					".//div[((contains(@class,'flash') and contains(@class,'item')) or contains(@class,'news')) and not(ancestor::*[contains(@class,'chat') or contains(@id,'chat')])]")
-			except Exception:
-				pass
-			steps += 1
-		print(f"[dbg] tarjetas detectadas: {len(cards)} (objetivo {max_items})")
-		# Si no se extrae nada más adelante, guardaremos outerHTML de las primeras
-		debug_cards = cards[:2]
-		last_seen_time = ""
-		# Fecha simple (local)
-		site_today = datetime.now().date()
-		for card in cards:
-			try:
-				timestamp_el = None
-				title_el = None
-				content_el = None
-				badge_els = []
-				# Common patterns observed
-				title_el = next((el for el in card.find_elements(By.XPATH, ".//div[contains(@class,'flash-title')][normalize-space()]")), None) or \
-					   next((el for el in card.find_elements(By.XPATH, ".//*[self::h1 or self::h2 or self::h3 or contains(@class,'title') or contains(@class,'headline')][normalize-space()]")), None)
-				content_el = next((el for el in card.find_elements(By.XPATH, ".//div[contains(@class,'flash-content')][normalize-space()]")), None) or \
-						   next((el for el in card.find_elements(By.XPATH, ".//*[contains(@class,'content') or contains(@class,'body') or contains(@class,'desc') or self::p][normalize-space()]")), None)
-				# Hora (best effort)
-				timestamp_el = next((el for el in card.find_elements(By.XPATH, ".//span[normalize-space()][1]")), None)
-				title_text = title_el.text.strip() if title_el else ''
-				content_text = content_el.text.strip() if content_el else ''
-				ts_text = timestamp_el.text.strip() if timestamp_el else ''
-				if not ts_text:
-					try:
-						parent = card.find_element(By.XPATH, "..")
-						children = parent.find_elements(By.XPATH, "./*")
-						idx = children.index(card)
-						if idx > 0:
-							left_text = children[idx-1].text.strip()
-							if ":" in left_text:
-								parts = left_text.split()
-								for token in parts:
-									if token.count(":") >= 1 and 4 <= len(token) <= 8:
-										ts_text = token
-										break
-					except Exception:
-						pass
-				# Collect small badges/labels if any
-				try:
-					badge_els = card.find_elements(By.XPATH, ".//*[contains(@class,'badge') or contains(@class,'tag') or contains(@class,'label')][normalize-space()]")
-					badges = [b.text.strip() for b in badge_els if b.text and b.text.strip()]
-				except Exception:
-					badges = []
-				if not title_text and content_text:
-					title_text = content_text.split(". ")[0][:120]
-				# Fallback fuerte
-				if not title_text and not content_text:
-					try:
-						raw_txt = card.get_attribute('innerText') or card.text or ''
-						raw_txt = raw_txt.replace('\r','\n')
-						lines = [ln.strip() for ln in raw_txt.split('\n') if ln and ln.strip()]
-						import re
-						filtered = []
-						for ln in lines:
-							if re.match(r"^\d{2}:\d{2}(?::\d{2})?$", ln):
-								continue
-							filtered.append(ln)
-						if filtered:
-							title_text = filtered[0][:120]
-							content_text = ' '.join(filtered[1:])[:500]
-					except Exception:
-						pass
-				if title_text or content_text:
-					news_items.append({
-						"title": title_text,
-						"content": content_text,
-						"timestamp": ts_text,
-						"tags": badges
-					})
-			except Exception:
-				continue
-	except Exception:
-		pass
-	# Si a pesar de detectar tarjetas no logramos noticias, volcar outerHTML de muestra
-	try:
-		if not news_items:
+		driver.set_script_timeout(timeout_ms / 1000 + 5)
+		result = driver.execute_async_script(_EXTRACT_CARDS_JS, max_items, list(seen), timeout_ms, grow_ms) or {}
+	except Exception as e:
+		result = {"error": str(e)}
+	if result.get('error'):
+		print(f"[dbg] error en extracción: {result['error']}")
+
+	# Python hash is authoritative (and covers browsers without crypto.subtle)
+	items = []
+	batch_hashes = set()
+	for it in result.get('items') or []:
+		it['item_hash'] = compute_item_hash(it.get('title'), it.get('timestamp'))
+		if it['item_hash'] in seen:
+			result['reached_seen'] = True
+			break
+		# A card prepended by the live feed mid-extraction can be read twice
+		if it['item_hash'] in batch_hashes:
+			continue
+		batch_hashes.add(it['item_hash'])
+		items.append(it)
+	result['items'] = items[:max_items]
+
+	if not items and result.get('debug_html'):
+		# Si a pesar de detectar tarjetas no logramos noticias, volcar outerHTML de muestra
+		try:
 			os.makedirs(EXPORTS_DIR, exist_ok=True)
-			for idx, c in enumerate(debug_cards, 1):
-				try:
-					outer = c.get_attribute('outerHTML') or ''
-					with open(os.path.join(EXPORTS_DIR, f"debug_card_{idx}.html"), 'w', encoding='utf-8') as f:
-						f.write(outer)
-				except Exception:
-					pass
-	except Exception:
-		pass
-	# Respetar orden DOM y limitar a max_items
-	return news_items[:max_items]
+			for idx, outer in enumerate(result['debug_html'], 1):
+				with open(os.path.join(EXPORTS_DIR, f"debug_card_{idx}.html"), 'w', encoding='utf-8') as f:
+					f.write(outer or '')
+		except Exception:
+			pass
+	return result
+
+
+def extract_visible_news(driver: webdriver.Chrome, max_items: int = 50, seen_hashes=None) -> list:
+	"""Cards in DOM order (newest first) up to max_items, stopping at the first already-seen hash."""
+	result = _extract_cards(driver, max_items=max_items, seen_hashes=seen_hashes)
+	print(f"[dbg] tarjetas detectadas: {result.get('cards', 0)} (objetivo {max_items}), "
+		  f"nuevas: {len(result['items'])}, {result.get('elapsed_ms', 0):.0f} ms en el navegador")
+	return result['items']
+
+
+def _get_seen_hashes() -> list:
+	global _seen_hashes
+	if _seen_hashes is None:
+		try:
+			with open(SEEN_HASHES_PATH, 'r', encoding='utf-8') as f:
+				_seen_hashes = list(json.load(f))[:SEEN_HASHES_MAX]
+		except Exception:
+			_seen_hashes = []
+	return _seen_hashes
+
+
+def remember_items(items: list) -> None:
+	"""Mark items as seen (after they were saved) so the next scrape only returns newer cards."""
+	global _seen_hashes
+	new_hashes = [it['item_hash'] for it in items if it.get('item_hash')]
+	if not new_hashes:
+		return
+	_seen_hashes = list(dict.fromkeys(new_hashes + _get_seen_hashes()))[:SEEN_HASHES_MAX]
+	try:
+		os.makedirs(EXPORTS_DIR, exist_ok=True)
+		with open(SEEN_HASHES_PATH, 'w', encoding='utf-8') as f:
+			json.dump(_seen_hashes, f)
+	except Exception as e:
+		print(f"No se pudo guardar el índice de tarjetas vistas: {e}")
 
 
 def scrape_once(driver: webdriver.Chrome) -> list:
+	"""Incremental scrape of the live feed: only cards newer than the last saved ones."""
+	start = time.perf_counter()
 	# Always refresh feed to get latest items (cache-busting) y re-aplicar filtro
 	_refresh_feed(driver)
 	initialize_page(driver)  # Reaplica "Important Only" tras reload
-	_go_to_top_and_render(driver)
-	# Precargado fuerte para disparar lazy-load cerca del tope
-	_visible_human_scroll(driver, total_steps=16, step_px=800, pause_s=0.28)
-	_go_to_top_and_render(driver)
-	items = extract_visible_news(driver, max_items=50)
-	print(f"Encontradas {len(items)} noticias visibles.")
-	# Retry once if nothing found: reinitialize page and scroll again
-	if len(items) == 0:
+	result = _extract_cards(driver, max_items=50, seen_hashes=_get_seen_hashes())
+	items = result['items']
+	print(f"Encontradas {len(items)} noticias nuevas ({result.get('cards', 0)} tarjetas visibles) en {time.perf_counter() - start:.2f}s.")
+	# Retry once if no cards at all (feed vacío o no renderizado): recargar y extraer de nuevo
+	if not result.get('cards'):
 		try:
 			print("Nada encontrado. Reintentando: recargando página...")
+			_refresh_feed(driver)
 			initialize_page(driver)
-			_go_to_top_and_render(driver)
-			_visible_human_scroll(driver, total_steps=16, step_px=800, pause_s=0.28)
-			_go_to_top_and_render(driver)
-			items = extract_visible_news(driver, max_items=50)
-			print(f"Segundo intento: {len(items)} noticias visibles.")
+			result = _extract_cards(driver, max_items=50, seen_hashes=_get_seen_hashes())
+			items = result['items']
+			print(f"Segundo intento: {len(items)} noticias nuevas.")
 		except Exception:
 			pass
 	for i, it in enumerate(items[:15], 1):
@@ -394,8 +457,12 @@ def main() -> None:
 				break
 			print("Iniciando nuevo scrape...", flush=True)
 			items = scrape_once(driver)
+			if not items:
+				print("Sin noticias nuevas desde el último scrape.")
+				continue
 			md_path = save_markdown(items)
 			if md_path:
+				remember_items(items)
 				print("Ejecutando ingesta al grafo (evita duplicados)...")
 				ingest_markdown_if_available()
 		except KeyboardInterrupt:
@@ -7,7 +7,7 @@ import os
 import sys
 import hashlib
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 
 # Agregar Quantex al path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,6 +17,9 @@ if PROJECT_ROOT not in sys.path:
 try:
     from quantex.core.knowledge_graph.ingestion_engine import KnowledgeGraphIngestionEngine
     from quantex.core import database_manager as db
+    from quantex.core.node_dedup import (
+        document_exists_by_url, document_exists_by_hash, existing_document_urls, existing_document_hashes
+    )
     from quantex.core.ai_services import ai_services
     
     # Inicializar servicios de AI
@@ -33,6 +36,8 @@ except Exception as e:
     print("Verifica que las variables de entorno estén configuradas")
     sys.exit(1)
 
+from seen_index import SeenIndex
+
 class MktNewsQuantexIntegration:
     """
     Integración de MktNewsScraper con el motor unificado de Quantex
@@ -41,6 +46,7 @@ class MktNewsQuantexIntegration:
     def __init__(self):
         self.ingestion_engine = KnowledgeGraphIngestionEngine()
         self.db = db
+        self.seen_index = SeenIndex()
     
     def check_duplicate_by_url(self, original_url: str) -> bool:
         """Verifica si ya existe un documento con la misma URL"""
@@ -48,13 +54,7 @@ class MktNewsQuantexIntegration:
             return False
         
         try:
-            result = self.db.supabase.table('nodes') \
-                .select('id', count='exact') \
-                .eq('type', 'Documento') \
-                .eq('properties->>original_url', original_url.strip()) \
-                .execute()
-            
-            return (result.count or 0) > 0
+            return document_exists_by_url(original_url, self.db.supabase)
         except Exception as e:
             print(f"⚠️ Error verificando duplicado por URL: {e}")
             return False
@@ -65,23 +65,85 @@ class MktNewsQuantexIntegration:
             return False
         
         try:
-            result = self.db.supabase.table('nodes') \
-                .select('id', count='exact') \
-                .eq('type', 'Documento') \
-                .eq('properties->>hash', item_hash) \
-                .execute()
-            
-            return (result.count or 0) > 0
+            return document_exists_by_hash(item_hash, self.db.supabase)
         except Exception as e:
             print(f"⚠️ Error verificando duplicado por hash: {e}")
             return False
     
-    def process_news_item(self, news_item: Dict[str, Any]) -> Dict[str, Any]:
+    def screen_duplicates(self, news_items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+        """
+        Separa los items nuevos de los duplicados en bloque, en vez de 2 consultas count por item:
+          1. Duplicados dentro del mismo lote (misma URL o hash).
+          2. Índice local de items ya vistos (sin red).
+          3. Consultas in_() por URLs y por hashes para el resto (columnas dedup indexadas).
+        
+        Returns:
+            (items_nuevos, [(item_duplicado, motivo), ...])
+        """
+        new_items = []
+        duplicates = []
+        batch_keys = set()
+        candidates = []
+        
+        index_hits = self.seen_index.contains_many(
+            key for item in news_items for key in self._item_keys(item)
+        )
+        
+        for item in news_items:
+            url_key, hash_key = self._item_keys(item)
+            if url_key and url_key in index_hits:
+                duplicates.append((item, "Duplicate by URL"))
+            elif hash_key and hash_key in index_hits:
+                duplicates.append((item, "Duplicate by hash"))
+            elif url_key and url_key in batch_keys:
+                duplicates.append((item, "Duplicate by URL"))
+            elif hash_key and hash_key in batch_keys:
+                duplicates.append((item, "Duplicate by hash"))
+            else:
+                candidates.append(item)
+            batch_keys.update(k for k in (url_key, hash_key) if k)
+        
+        urls = list(dict.fromkeys(item.get('url', '').strip() for item in candidates if item.get('url', '').strip()))
+        hashes = list(dict.fromkeys(item.get('item_hash', '') for item in candidates if item.get('item_hash')))
+        
+        try:
+            existing_urls = existing_document_urls(urls, self.db.supabase)
+            existing_hashes = existing_document_hashes(hashes, self.db.supabase)
+        except Exception as e:
+            print(f"⚠️ Error en verificación masiva de duplicados: {e}. Verificando 1 a 1...")
+            existing_urls = {url for url in urls if self.check_duplicate_by_url(url)}
+            existing_hashes = {h for h in hashes if self.check_duplicate_by_hash(h)}
+        
+        for item in candidates:
+            if item.get('url', '').strip() in existing_urls:
+                duplicates.append((item, "Duplicate by URL"))
+            elif item.get('item_hash', '') in existing_hashes:
+                duplicates.append((item, "Duplicate by hash"))
+            else:
+                new_items.append(item)
+        
+        # Lo que ya está en la DB no necesita volver a consultarse en el próximo scrape
+        self.seen_index.add_many(
+            [SeenIndex.url_key(url) for url in existing_urls] + [SeenIndex.hash_key(h) for h in existing_hashes]
+        )
+        
+        print(f"🔎 Cribado de duplicados: {len(new_items)} nuevos, {len(duplicates)} duplicados "
+              f"({len(news_items) - len(candidates)} resueltos sin consultar la DB)")
+        return new_items, duplicates
+    
+    @staticmethod
+    def _item_keys(news_item: Dict[str, Any]) -> Tuple[str, str]:
+        url = news_item.get('url', '').strip()
+        item_hash = news_item.get('item_hash', '')
+        return (SeenIndex.url_key(url) if url else '', SeenIndex.hash_key(item_hash) if item_hash else '')
+    
+    def process_news_item(self, news_item: Dict[str, Any], screened: bool = False) -> Dict[str, Any]:
         """
         Procesa un item de noticia usando el motor unificado de Quantex
         
         Args:
             news_item: Dict con 'title', 'content', 'time', 'url', 'item_hash'
+            screened: True si el item ya pasó por screen_duplicates (omite la verificación individual)
         
         Returns:
             Dict con resultado de la ingesta
@@ -90,13 +152,12 @@ class MktNewsQuantexIntegration:
             print(f"  -> 📰 Procesando: {news_item.get('title', 'Sin título')[:50]}...")
             
             # Verificar duplicados
-            if self.check_duplicate_by_url(news_item.get('url', '')):
-                print(f"    -> ⚠️ Duplicado por URL detectado, saltando...")
-                return {"success": False, "reason": "Duplicate by URL"}
-            
-            if self.check_duplicate_by_hash(news_item.get('item_hash', '')):
-                print(f"    -> ⚠️ Duplicado por hash detectado, saltando...")
-                return {"success": False, "reason": "Duplicate by hash"}
+            if not screened:
+                _, duplicates = self.screen_duplicates([news_item])
+                if duplicates:
+                    reason = duplicates[0][1]
+                    print(f"    -> ⚠️ {'Duplicado por URL' if reason == 'Duplicate by URL' else 'Duplicado por hash'} detectado, saltando...")
+                    return {"success": False, "reason": reason}
             
             # Preparar contenido combinado
             content = self._prepare_content(news_item)
@@ -116,6 +177,7 @@ class MktNewsQuantexIntegration:
             result = self.ingestion_engine.ingest_document(content, source_context)
             
             if result.get("success"):
+                self.seen_index.add_many(self._item_keys(news_item))
                 print(f"    -> ✅ {result.get('nodes_created', 0)} nodo(s) creado(s) con conexiones semánticas.")
             else:
                 print(f"    -> ❌ Error en ingesta: {result.get('reason', 'Desconocido')}")
@@ -166,10 +228,14 @@ class MktNewsQuantexIntegration:
             "errors": []
         }
         
-        for i, item in enumerate(news_items, 1):
-            print(f"📰 [{i}/{len(news_items)}] Procesando item...")
+        # Cribado en bloque: solo los items realmente nuevos llegan al motor de ingesta
+        new_items, duplicates = self.screen_duplicates(news_items)
+        results["duplicates"] = len(duplicates)
+        
+        for i, item in enumerate(new_items, 1):
+            print(f"📰 [{i}/{len(new_items)}] Procesando item...")
             
-            result = self.process_news_item(item)
+            result = self.process_news_item(item, screened=True)
             
             if result.get("success"):
                 results["successful"] += 1
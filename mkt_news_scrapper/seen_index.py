@@ -0,0 +1,84 @@
+"""
+MktNewsScraper - Índice local de items ya vistos
+Guarda en SQLite las URLs y hashes de noticias que ya están en el grafo, para
+descartar los duplicados del scrape anterior sin ninguna consulta a Supabase.
+
+El índice es solo una pista positiva: si un item no está aquí se consulta la DB;
+si está, se da por duplicado. Ruta configurable con QUANTEX_MKTNEWS_SEEN_INDEX
+(vacío desactiva el índice).
+"""
+
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Iterable, Set
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_SEEN_INDEX_PATH = os.environ.get(
+    "QUANTEX_MKTNEWS_SEEN_INDEX", os.path.join(PROJECT_ROOT, '.cache', 'mktnews_seen.sqlite')
+)
+
+# SQLite limita el número de parámetros por sentencia
+_SQLITE_CHUNK_SIZE = 500
+
+
+class SeenIndex:
+    """Conjunto persistente de claves ('url:<url>' / 'hash:<hash>') ya ingeridas."""
+
+    def __init__(self, path: str = DEFAULT_SEEN_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if path:
+            try:
+                if path != ':memory:':
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._conn = sqlite3.connect(path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, seen_at TEXT NOT NULL)")
+                self._conn.commit()
+            except Exception as e:
+                print(f"⚠️ [SeenIndex] Índice local no disponible ({e}). Se consultará solo la DB.")
+                self._conn = None
+
+    @staticmethod
+    def url_key(url: str) -> str:
+        return f"url:{url.strip()}"
+
+    @staticmethod
+    def hash_key(item_hash: str) -> str:
+        return f"hash:{item_hash}"
+
+    def contains_many(self, keys: Iterable[str]) -> Set[str]:
+        """Devuelve el subconjunto de 'keys' presente en el índice."""
+        keys = list(dict.fromkeys(k for k in keys if k))
+        if not self._conn or not keys:
+            return set()
+        found = set()
+        with self._lock:
+            for start in range(0, len(keys), _SQLITE_CHUNK_SIZE):
+                chunk = keys[start:start + _SQLITE_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(f"SELECT key FROM seen WHERE key IN ({placeholders})", chunk).fetchall()
+                found.update(row[0] for row in rows)
+        return found
+
+    def add_many(self, keys: Iterable[str]):
+        keys = list(dict.fromkeys(k for k in keys if k))
+        if not self._conn or not keys:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            with self._lock:
+                self._conn.executemany("INSERT OR IGNORE INTO seen (key, seen_at) VALUES (?, ?)", [(k, now) for k in keys])
+                self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ [SeenIndex] No se pudo actualizar el índice local: {e}")
+
+    def __len__(self) -> int:
+        if not self._conn:
+            return 0
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
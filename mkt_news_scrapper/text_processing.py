@@ -1,19 +1,11 @@
 import math
 from datetime import datetime, timezone
 
-import hashlib
+from item_hash import compute_item_hash as _compute_item_hash
 from llm_destiller import distill_and_classify_text
 from graph_client import insert_document_node, upsert_entity_nodes, insert_edges_menciona, node_exists_by_hash
 
 
-def _compute_item_hash(title: str, time_text: str | None, precomputed: str | None = None) -> str:
-	# Prefer precomputed stable hash if provided by source
-	if precomputed:
-		return precomputed
-	key = (title or '').strip().lower() + '|' + (time_text or '')
-	return hashlib.sha256(key.encode('utf-8')).hexdigest()
-
-
 def process_and_store_knowledge(raw_text: str, source_context: dict):
 	"""Replicates Quantex assembly line: LLM destillation -> nodes -> entities/edges."""
 	atomic_nodes = distill_and_classify_text(raw_text)
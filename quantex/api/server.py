@@ -13,6 +13,7 @@ if PROJECT_ROOT not in sys.path:
 # --- 2. INICIALIZACIÓN CRÍTICA DE SERVICIOS ---
 # Primero, importamos los módulos base que gestionan el estado global.
 from quantex.core import database_manager as db
+from quantex.core.supabase_pool import get_pool_stats
 from quantex.core.ai_services import ai_services
 from quantex.core.tool_registry import registry 
 from quantex.core.dossier import Dossier
@@ -235,7 +236,7 @@ def create_app():
     def _health():
         print("[SENTINEL] /health ping")
         request_logger.info("/health ping")
-        return jsonify({"ok": True})
+        return jsonify({"ok": True, "supabase_pool": get_pool_stats()})
 
     print("🚀 QUANTEX: Iniciando y configurando sistema...")
 
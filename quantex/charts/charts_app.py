@@ -16,6 +16,7 @@ if project_root not in sys.path:
 
 from quantex.core.database_manager import supabase
 from quantex.core.data_fetcher import get_data_series
+from quantex.core.record_serializer import dataframe_to_tradingview_points
 # Config inline
 load_dotenv()
 
@@ -266,12 +267,7 @@ def get_series_data(ticker):
                 return jsonify({'success': False, 'error': f'No se encontraron datos para {ticker}'}), 404
         
         # Convertir a formato TradingView
-        data = []
-        for timestamp, row in df.iterrows():
-            data.append({
-                'time': timestamp.strftime('%Y-%m-%d'),
-                'value': float(row['close']) if 'close' in row else float(row['value'])
-            })
+        data = dataframe_to_tradingview_points(df)
         
         # Obtener metadatos
         metadata = {
@@ -319,12 +315,7 @@ def get_batch_data():
                 df = get_data_series(ticker, days=days)
                 
                 if df is not None and not df.empty:
-                    data = []
-                    for timestamp, row in df.iterrows():
-                        data.append({
-                            'time': timestamp.strftime('%Y-%m-%d'),
-                            'value': float(row['close']) if 'close' in row else float(row['value'])
-                        })
+                    data = dataframe_to_tradingview_points(df)
                     
                     results[ticker] = {
                         'data': data,
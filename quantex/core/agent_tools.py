@@ -488,11 +488,8 @@ def process_and_store_knowledge_DEPRECATED(raw_text: str, source_context: dict):
             # 3. Crear Nodos de 'Entidad' y sus 'Ejes' de conexión (sin cambios)
             entities = node_obj.get("key_entities", [])
             if entities:
-                entity_nodes_to_upsert = [{"type": "Entidad", "label": entity} for entity in entities]
-                db.supabase.table('nodes').upsert(entity_nodes_to_upsert, on_conflict='label,type').execute()
-                
-                entity_nodes_in_db = db.supabase.table('nodes').select('id, label').eq('type', 'Entidad').in_('label', entities).execute().data
-                entity_map = {node['label']: node['id'] for node in entity_nodes_in_db}
+                from quantex.core.entity_cache import upsert_entities
+                entity_map = upsert_entities(entities, db.supabase)
 
                 edges_to_insert = []
                 for entity_name in entities:
@@ -87,12 +87,12 @@ def _execute_supabase_query_table(params: Dict[str, Any]) -> Dict[str, Any]:
         if not table_name:
             return {"ok": False, "error": "table_name es requerido"}
         
-        # Importar cliente Supabase
-        from supabase import create_client, Client
+        # Cliente Supabase compartido (sin reconstruir cliente ni sesión HTTP por llamada)
+        from quantex.core.supabase_pool import get_supabase_client
         
         # Usar SDKConfig para configuración centralizada
         config = SDKConfig.get_supabase_config()
-        supabase: Client = create_client(config['url'], config['key'])
+        supabase = get_supabase_client(config['url'], config['key'])
         
         print(f"Ejecutando query en tabla '{table_name}' con columnas '{columns}'")
         if filters:
@@ -162,12 +162,12 @@ def _execute_supabase_find_person(params: Dict[str, Any]) -> Dict[str, Any]:
         if not is_general_search and not search_term:
             return {"ok": False, "error": "search_term requerido para búsquedas específicas"}
         
-        # Importar cliente Supabase
-        from supabase import create_client, Client
+        # Cliente Supabase compartido (sin reconstruir cliente ni sesión HTTP por llamada)
+        from quantex.core.supabase_pool import get_supabase_client
         
         # Usar SDKConfig para configuración centralizada
         config = SDKConfig.get_supabase_config()
-        supabase: Client = create_client(config['url'], config['key'])
+        supabase = get_supabase_client(config['url'], config['key'])
         
         # Determinar tipo de búsqueda
         if is_general_search:
@@ -218,22 +218,11 @@ def _execute_supabase_find_person(params: Dict[str, Any]) -> Dict[str, Any]:
         if response.data and len(response.data) > 0:
             # Si es búsqueda general, retornar múltiples resultados
             if is_general_search:
+                # Empresas de todo el lote en una sola consulta (con caché compartido)
+                empresas = _lookup_empresas(supabase, [p.get('rut_empresa') for p in response.data])
                 persons = []
                 for person_data in response.data:
-                    # Buscar información de empresa para cada persona
-                    empresa_info = None
-                    if person_data.get('rut_empresa'):
-                        try:
-                            empresa_response = supabase.table('empresas').select('razon_social, rut_empresa, sitio_web').eq('rut_empresa', person_data['rut_empresa']).execute()
-                            if empresa_response.data:
-                                empresa_data = empresa_response.data[0]
-                                empresa_info = {
-                                    "razon_social": empresa_data.get('razon_social'),
-                                    "rut_empresa": empresa_data.get('rut_empresa'),
-                                    "sitio_web": empresa_data.get('sitio_web')
-                                }
-                        except Exception as e:
-                            print(f"Error buscando empresa: {e}")
+                    empresa_info = _format_empresa_info(empresas.get(person_data.get('rut_empresa')))
                     
                     persons.append({
                         "id": person_data.get("id"),
@@ -260,19 +249,8 @@ def _execute_supabase_find_person(params: Dict[str, Any]) -> Dict[str, Any]:
                 person_data = response.data[0]
             
             # Buscar información de empresa si existe rut_empresa
-            empresa_info = None
-            if person_data.get('rut_empresa'):
-                try:
-                    empresa_response = supabase.table('empresas').select('razon_social, rut_empresa, sitio_web').eq('rut_empresa', person_data['rut_empresa']).execute()
-                    if empresa_response.data:
-                        empresa_data = empresa_response.data[0]
-                        empresa_info = {
-                            "razon_social": empresa_data.get('razon_social'),
-                            "rut_empresa": empresa_data.get('rut_empresa'),
-                            "sitio_web": empresa_data.get('sitio_web')
-                        }
-                except Exception as e:
-                    print(f"Error buscando empresa: {e}")
+            empresas = _lookup_empresas(supabase, [person_data.get('rut_empresa')])
+            empresa_info = _format_empresa_info(empresas.get(person_data.get('rut_empresa')))
             
             return {
                 "ok": True,
@@ -302,6 +280,26 @@ def _execute_supabase_find_person(params: Dict[str, Any]) -> Dict[str, Any]:
         return {"ok": False, "error": f"Error buscando en Supabase: {str(e)}"}
 
 
+def _lookup_empresas(supabase, ruts: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resuelve empresas por rut_empresa en lote; un fallo no rompe la búsqueda de personas."""
+    try:
+        from quantex.core.empresa_cache import get_empresas_by_rut
+        return get_empresas_by_rut(ruts, supabase=supabase)
+    except Exception as e:
+        print(f"Error buscando empresa: {e}")
+        return {}
+
+
+def _format_empresa_info(empresa_data: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    if not empresa_data:
+        return None
+    return {
+        "razon_social": empresa_data.get('razon_social'),
+        "rut_empresa": empresa_data.get('rut_empresa'),
+        "sitio_web": empresa_data.get('sitio_web')
+    }
+
+
 def _execute_llm_compose_email(params: Dict[str, Any]) -> Dict[str, Any]:
     """Ejecuta redacción de email usando LLM."""
     try:
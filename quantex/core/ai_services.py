@@ -2,6 +2,7 @@
 import os
 from pinecone import Pinecone
 from sentence_transformers import SentenceTransformer
+from quantex.core.embedding_cache import CachedEmbeddingModel, DEFAULT_CACHE_PATH
 
 class AIServiceManager:
     """
@@ -40,8 +41,12 @@ class AIServiceManager:
 
         print("    -> 🧠 Cargando modelo de embeddings (all-MiniLM-L6-v2)...")
         try:
-            # Usamos un modelo eficiente y popular para embeddings semánticos
-            self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            # Usamos un modelo eficiente y popular para embeddings semánticos,
+            # envuelto en un caché (memoria + disco) por hash de texto.
+            # QUANTEX_EMBEDDING_CACHE_PATH="" desactiva el nivel en disco.
+            model_name = 'all-MiniLM-L6-v2'
+            cache_path = os.environ.get("QUANTEX_EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH) or None
+            self.embedding_model = CachedEmbeddingModel(SentenceTransformer(model_name), model_name, cache_path=cache_path)
             
             print("    -> 🌲 Conectando con Pinecone...")
             pinecone_api_key = os.environ.get("PINECONE_API_KEY")
@@ -3,13 +3,15 @@
 import os
 import sys
 import json
+import warnings
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any, Tuple, Set
 import numpy as np
 from collections import defaultdict, Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 from sklearn.cluster import DBSCAN
+from sklearn.exceptions import EfficiencyWarning
 import networkx as nx
 
 # --- Configuración de Rutas ---
@@ -20,6 +22,13 @@ if PROJECT_ROOT not in sys.path:
 from quantex.core import database_manager as db
 from quantex.core.ai_services import ai_services
 from quantex.core import llm_manager
+from quantex.core.autoconocimiento.graph_snapshot import get_graph_snapshot
+
+# Correlaciones semánticas: vecinos guardados por nodo y tamaño máximo (en celdas) de cada
+# bloque de similitudes; la memoria queda acotada por estos dos valores, no por N².
+TOP_K_NEIGHBORS = 32
+MIN_NEIGHBOR_SIMILARITY = 0.3
+SIMILARITY_BLOCK_ELEMENTS = 4_000_000
 
 class CorrelationDetector:
     """
@@ -39,24 +48,9 @@ class CorrelationDetector:
         try:
             print(f"🔍 [Correlaciones] Detectando correlaciones semánticas (mínimo {min_nodes} nodos)")
             
-            # Obtener todos los nodos con paginación
-            nodes = []
-            page_size = 1000
-            offset = 0
-            
-            while True:
-                response = self.db.supabase.table('nodes').select('*').range(offset, offset + page_size - 1).execute()
-                
-                if not response.data:
-                    break
-                    
-                nodes.extend(response.data)
-                print(f"  -> Obtenidos {len(response.data)} nodos (offset: {offset})")
-                
-                if len(response.data) < page_size:
-                    break
-                    
-                offset += page_size
+            # Nodos desde el snapshot local; el contenido se carga perezosamente y queda cacheado
+            snapshot = get_graph_snapshot()
+            nodes = snapshot.get_nodes()
             
             if not nodes or len(nodes) < min_nodes:
                 return {"error": f"No hay suficientes nodos para análisis (mínimo {min_nodes})"}
@@ -66,9 +60,10 @@ class CorrelationDetector:
             node_ids = []
             node_labels = []
             
+            contents = snapshot.get_contents(node.get('id') for node in nodes)
             for node in nodes:
-                content = node.get('content', '')
-                label = node.get('label', '')
+                content = contents.get(node.get('id')) or ''
+                label = node.get('label', '') or ''
                 
                 if content and len(content.strip()) > 10:  # Solo nodos con contenido sustancial
                     # Combinar label y content para análisis
@@ -92,14 +87,14 @@ class CorrelationDetector:
             
             tfidf_matrix = vectorizer.fit_transform(node_texts)
             
-            # Calcular similitudes coseno
-            similarity_matrix = cosine_similarity(tfidf_matrix)
+            # Vecinos top-k por nodo (similitud coseno en bloques, sin matriz N×N)
+            neighbors, similarities = self._topk_neighbors(tfidf_matrix)
             
             # Encontrar pares altamente correlacionados
-            correlations = self._find_high_correlations(similarity_matrix, node_ids, node_labels, threshold=0.3)
+            correlations = self._find_high_correlations(neighbors, similarities, node_ids, node_labels, threshold=0.3)
             
             # Detectar clusters semánticos
-            clusters = self._detect_semantic_clusters(similarity_matrix, node_ids, node_labels)
+            clusters = self._detect_semantic_clusters(neighbors, similarities, node_ids, node_labels)
             
             # Análisis de palabras clave más importantes
             feature_names = vectorizer.get_feature_names_out()
@@ -124,16 +119,14 @@ class CorrelationDetector:
         try:
             print("🔗 [Correlaciones] Detectando correlaciones estructurales")
             
-            # Obtener nodos y conexiones
-            nodes_response = self.db.supabase.table('nodes').select('*').execute()
-            edges_response = self.db.supabase.table('edges').select('*').execute()
+            # Obtener nodos y conexiones desde el snapshot local
+            snapshot = get_graph_snapshot()
+            nodes = snapshot.get_nodes()
+            edges = snapshot.get_edges(sync=False)
             
-            if not nodes_response.data or not edges_response.data:
+            if not nodes or not edges:
                 return {"error": "No hay suficientes datos estructurales para análisis"}
             
-            nodes = nodes_response.data
-            edges = edges_response.data
-            
             # Construir grafo de red
             G = nx.Graph()
             
@@ -184,14 +177,12 @@ class CorrelationDetector:
             # Calcular fecha límite
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=months * 30)
             
-            # Obtener nodos recientes
-            nodes_response = self.db.supabase.table('nodes').select('*').gte('created_at', cutoff_date.isoformat()).execute()
+            # Obtener nodos recientes desde el snapshot local
+            nodes = get_graph_snapshot().get_nodes(since=cutoff_date)
             
-            if not nodes_response.data:
+            if not nodes:
                 return {"error": "No hay datos temporales suficientes para análisis"}
             
-            nodes = nodes_response.data
-            
             # Agrupar nodos por períodos temporales
             temporal_groups = defaultdict(list)
             
@@ -289,42 +280,104 @@ Responde en español y enfócate en insights accionables sobre correlaciones.
             print(f"❌ [Correlaciones] Error generando insights: {e}")
             return f"Error generando insights de correlaciones: {str(e)}"
     
-    def _find_high_correlations(self, similarity_matrix: np.ndarray, node_ids: List[str], node_labels: List[str], threshold: float = 0.3) -> List[Dict]:
-        """Encuentra pares de nodos con alta correlación semántica"""
-        correlations = []
+    def _topk_neighbors(self, tfidf_matrix, k: int = TOP_K_NEIGHBORS, min_similarity: float = MIN_NEIGHBOR_SIMILARITY,
+                        block_elements: int = SIMILARITY_BLOCK_ELEMENTS) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Los k vecinos más similares (coseno > min_similarity) de cada nodo, sin construir
+        la matriz N×N. Las filas de TF-IDF ya vienen normalizadas (L2), así que coseno = X·Xᵀ;
+        se calcula como producto disperso por bloques de filas (block_elements / N filas),
+        descartando las similitudes bajo el umbral antes de ordenar. La memoria queda
+        acotada a O(block_elements + N·k) sea cual sea N.
         
-        for i in range(len(similarity_matrix)):
-            for j in range(i + 1, len(similarity_matrix)):
-                similarity = similarity_matrix[i][j]
-                if similarity > threshold:
-                    correlations.append({
-                        "node1_id": node_ids[i],
-                        "node1_label": node_labels[i],
-                        "node2_id": node_ids[j],
-                        "node2_label": node_labels[j],
-                        "similarity_score": round(similarity, 3)
-                    })
+        Returns:
+            (neighbors, similarities): arrays (N, k) ordenados de mayor a menor similitud;
+            los huecos (menos de k vecinos sobre el umbral) tienen índice -1 y similitud 0.
+        """
+        X = tfidf_matrix.astype(np.float32).tocsr()
+        XT = X.T.tocsr()
+        n = X.shape[0]
+        block_rows = max(1, block_elements // max(n, 1))
+        
+        neighbors = np.full((n, k), -1, dtype=np.int32)
+        similarities = np.zeros((n, k), dtype=np.float32)
+        for start in range(0, n, block_rows):
+            block = (X[start:start + block_rows] @ XT).tocoo()
+            keep = (block.data > min_similarity) & (block.row + start != block.col)  # sin el propio nodo
+            rows, cols, sims = block.row[keep], block.col[keep], block.data[keep]
+            
+            # Ordenar por (fila, similitud descendente) y quedarse con los k primeros de cada fila
+            order = np.lexsort((-sims, rows))
+            rows, cols, sims = rows[order], cols[order], sims[order]
+            row_starts = np.searchsorted(rows, rows, side='left')
+            rank = np.arange(len(rows)) - row_starts
+            top = rank < k
+            neighbors[rows[top] + start, rank[top]] = cols[top]
+            similarities[rows[top] + start, rank[top]] = sims[top]
         
-        # Ordenar por similitud descendente
-        correlations.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return correlations[:20]  # Top 20 correlaciones
+        return neighbors, similarities
     
-    def _detect_semantic_clusters(self, similarity_matrix: np.ndarray, node_ids: List[str], node_labels: List[str]) -> List[Dict]:
-        """Detecta clusters semánticos usando DBSCAN"""
+    def _find_high_correlations(self, neighbors: np.ndarray, similarities: np.ndarray, node_ids: List[str],
+                                node_labels: List[str], threshold: float = 0.3, limit: int = 20) -> List[Dict]:
+        """
+        Encuentra pares de nodos con alta correlación semántica a partir de los vecinos top-k.
+        Con k >= limit el top 'limit' global es exacto: un par fuera del top-k de ambos
+        nodos tiene al menos k pares más similares por delante.
+        """
+        rows = np.repeat(np.arange(len(neighbors), dtype=np.int64), neighbors.shape[1])
+        cols = neighbors.ravel().astype(np.int64)
+        sims = similarities.ravel()
+        
+        mask = (sims > threshold) & (cols >= 0)
+        # Cada par aparece desde ambos extremos: normalizar a (i < j) y deduplicar
+        i = np.minimum(rows[mask], cols[mask])
+        j = np.maximum(rows[mask], cols[mask])
+        pairs, first = np.unique(i * len(neighbors) + j, return_index=True)
+        pair_sims = sims[mask][first]
+        
+        top = np.argsort(-pair_sims, kind='stable')[:limit]
+        correlations = []
+        for pair, similarity in zip(pairs[top], pair_sims[top]):
+            a, b = divmod(int(pair), len(neighbors))
+            correlations.append({
+                "node1_id": node_ids[a],
+                "node1_label": node_labels[a],
+                "node2_id": node_ids[b],
+                "node2_label": node_labels[b],
+                "similarity_score": round(float(similarity), 3)
+            })
+        
+        return correlations  # Top 20 correlaciones, ordenadas por similitud descendente
+    
+    def _detect_semantic_clusters(self, neighbors: np.ndarray, similarities: np.ndarray, node_ids: List[str],
+                                  node_labels: List[str], eps: float = 0.3, min_samples: int = 3) -> List[Dict]:
+        """
+        Detecta clusters semánticos con DBSCAN sobre el grafo disperso de vecinos:
+        solo se guardan las distancias (1 - similitud) <= eps de los vecinos top-k.
+        """
         try:
-            # Usar DBSCAN para clustering
-            clustering = DBSCAN(eps=0.3, min_samples=3, metric='precomputed')
+            n = len(neighbors)
+            rows = np.repeat(np.arange(n), neighbors.shape[1])
+            cols = neighbors.ravel()
+            distances = 1.0 - similarities.ravel().astype(np.float64)
             
-            # Convertir similitud a distancia
-            distance_matrix = 1 - similarity_matrix
+            keep = (distances <= eps) & (cols >= 0)
+            # Distancia mínima > 0: en un grafo disperso un cero no se almacena y se perdería el vecino
+            distances = np.maximum(distances[keep], 1e-9)
+            graph = sparse.coo_matrix((distances, (rows[keep], cols[keep])), shape=(n, n)).tocsr()
+            graph = graph.maximum(graph.T)  # simétrico, como la matriz densa original
             
-            cluster_labels = clustering.fit_predict(distance_matrix)
+            # Usar DBSCAN para clustering
+            clustering = DBSCAN(eps=eps, min_samples=min_samples, metric='precomputed')
+            with warnings.catch_warnings():
+                # DBSCAN agrega la diagonal al grafo y luego avisa que no está ordenado: es inocuo
+                warnings.simplefilter('ignore', EfficiencyWarning)
+                cluster_labels = clustering.fit_predict(graph)
             
             # Agrupar nodos por cluster
             clusters = defaultdict(list)
             for i, label in enumerate(cluster_labels):
                 if label != -1:  # Ignorar outliers
-                    clusters[label].append({
+                    clusters[int(label)].append({
                         "node_id": node_ids[i],
                         "node_label": node_labels[i]
                     })
@@ -344,10 +397,10 @@ Responde en español y enfócate en insights accionables sobre correlaciones.
             print(f"⚠️ Error en clustering semántico: {e}")
             return []
     
-    def _extract_important_features(self, tfidf_matrix: np.ndarray, feature_names: List[str]) -> List[Dict]:
+    def _extract_important_features(self, tfidf_matrix, feature_names: List[str]) -> List[Dict]:
         """Extrae las características más importantes del análisis TF-IDF"""
-        # Calcular importancia promedio de cada característica
-        feature_importance = np.mean(tfidf_matrix.toarray(), axis=0)
+        # Calcular importancia promedio de cada característica (sobre la matriz dispersa, sin densificarla)
+        feature_importance = np.asarray(tfidf_matrix.mean(axis=0)).ravel()
         
         # Crear lista de características con su importancia
         features = []
@@ -355,7 +408,7 @@ Responde en español y enfócate en insights accionables sobre correlaciones.
             if importance > 0.01:  # Solo características con importancia significativa
                 features.append({
                     "feature": feature_names[i],
-                    "importance": round(importance, 4)
+                    "importance": round(float(importance), 4)
                 })
         
         # Ordenar por importancia descendente
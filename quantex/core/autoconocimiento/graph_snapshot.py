@@ -0,0 +1,348 @@
+# quantex/core/autoconocimiento/graph_snapshot.py
+
+"""
+Snapshot local e incremental del grafo de conocimiento (nodes / edges).
+
+Los analizadores de autoconocimiento (TemporalAnalyzer, CorrelationDetector,
+PredictiveInsightsEngine) antes paginaban toda la tabla 'nodes' con select('*')
+—contenido incluido— y toda 'edges' en cada request. Aquí se mantiene una copia
+en SQLite que:
+
+  - Sincroniza solo las filas con created_at/updated_at >= la última marca de agua.
+  - Guarda solo columnas livianas (id, type, label, created_at); el 'content'
+    se descarga de forma perezosa (get_contents) y queda cacheado hasta que la
+    fila cambie.
+  - Expone la adyacencia como arrays compactos (CSR de NumPy), recalculados solo
+    cuando cambian las conexiones.
+  - Cada GRAPH_SNAPSHOT_FULL_RESYNC_HOURS compara solo los ids contra Supabase
+    para eliminar las filas borradas.
+
+Así la latencia de los reportes depende del delta desde la última sync, no del
+tamaño del grafo.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from quantex.core import database_manager as db
+
+DEFAULT_SNAPSHOT_PATH = os.environ.get(
+    "QUANTEX_GRAPH_SNAPSHOT_PATH", os.path.join(PROJECT_ROOT, '.cache', 'graph_snapshot.sqlite')
+)
+# Requests dentro de esta ventana reutilizan la última sync sin tocar la red
+GRAPH_SNAPSHOT_MIN_SYNC_SECONDS = int(os.environ.get("QUANTEX_GRAPH_SNAPSHOT_MIN_SYNC_SECONDS", "60"))
+GRAPH_SNAPSHOT_FULL_RESYNC_HOURS = float(os.environ.get("QUANTEX_GRAPH_SNAPSHOT_FULL_RESYNC_HOURS", "24"))
+PAGE_SIZE = 1000
+CONTENT_CHUNK_SIZE = 200
+
+NODE_COLUMNS = ('id', 'type', 'label', 'created_at')
+
+
+class GraphSnapshot:
+    """Copia incremental del grafo en SQLite, compartida por los analizadores."""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, min_sync_seconds: int = GRAPH_SNAPSHOT_MIN_SYNC_SECONDS):
+        self.path = path
+        self.min_sync_seconds = min_sync_seconds
+        self._lock = threading.RLock()
+        self._last_sync = 0.0
+        self._columns: Dict[str, set] = {}
+        self._edge_index = None        # (edges_version, node_ids, src, dst)
+        self._edges_version = 0
+        self.stats = {'syncs': 0, 'nodes_synced': 0, 'edges_synced': 0, 'contents_fetched': 0, 'rows_deleted': 0}
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS nodes (
+                id TEXT PRIMARY KEY, type TEXT, label TEXT, created_at TEXT, updated_at TEXT,
+                content TEXT, content_loaded INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS nodes_created_at ON nodes (created_at);
+            CREATE TABLE IF NOT EXISTS edges (
+                key TEXT PRIMARY KEY, source_id TEXT, target_id TEXT,
+                relationship_type TEXT, created_at TEXT
+            );
+            CREATE INDEX IF NOT EXISTS edges_source_id ON edges (source_id);
+            CREATE INDEX IF NOT EXISTS edges_target_id ON edges (target_id);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+        """)
+        self._conn.commit()
+
+    # --- Metadatos (marcas de agua) ---
+
+    def _get_meta(self, name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, name: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    # --- Lectura desde Supabase ---
+
+    def _table_columns(self, table: str, candidates: Iterable[str]) -> set:
+        """Columnas opcionales que existen en la tabla (se prueba una vez cada una)."""
+        known = self._columns.setdefault(table, set())
+        for column in candidates:
+            if column in known or f"!{column}" in known:
+                continue
+            try:
+                db.supabase.table(table).select(column).limit(1).execute()
+                known.add(column)
+            except Exception:
+                known.add(f"!{column}")
+        return {c for c in known if not c.startswith('!')}
+
+    def _fetch_rows(self, table: str, select: str, watermark: Optional[str], watermark_columns: List[str],
+                    order_column: str = 'id') -> List[Dict]:
+        """Filas de 'table' cambiadas desde la marca de agua (todas si no hay), paginadas por order_column."""
+        rows, offset = [], 0
+        while True:
+            query = db.supabase.table(table).select(select)
+            if watermark and watermark_columns:
+                if len(watermark_columns) == 1:
+                    query = query.gte(watermark_columns[0], watermark)
+                else:
+                    query = query.or_(",".join(f'{c}.gte."{watermark}"' for c in watermark_columns))
+            response = query.order(order_column).range(offset, offset + PAGE_SIZE - 1).execute()
+            data = response.data or []
+            rows.extend(data)
+            if len(data) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    @staticmethod
+    def _max_timestamp(rows: List[Dict], columns: List[str], current: Optional[str]) -> Optional[str]:
+        # Los timestamptz de PostgREST vienen todos en UTC (+00:00): el orden de strings es cronológico
+        values = [row[c] for row in rows for c in columns if row.get(c)]
+        if current:
+            values.append(current)
+        return max(values) if values else None
+
+    @staticmethod
+    def _edge_key(row: Dict) -> str:
+        if row.get('id') is not None:
+            return str(row['id'])
+        return f"{row.get('source_id')}|{row.get('target_id')}|{row.get('relationship_type')}"
+
+    # --- Sincronización ---
+
+    def sync(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Trae solo el delta desde la última sync. Si la última fue hace menos de
+        min_sync_seconds no hace nada (salvo force=True).
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_sync < self.min_sync_seconds:
+                return {'skipped': True}
+
+            started = time.perf_counter()
+            node_cols = self._table_columns('nodes', ['updated_at'])
+            edge_cols = self._table_columns('edges', ['id', 'created_at', 'updated_at'])
+
+            # Nodos
+            node_watermark_cols = ['created_at'] + (['updated_at'] if 'updated_at' in node_cols else [])
+            node_watermark = self._get_meta('nodes_watermark')
+            node_rows = self._fetch_rows('nodes', ", ".join(NODE_COLUMNS + tuple(c for c in node_watermark_cols if c != 'created_at')),
+                                         node_watermark, node_watermark_cols)
+            # La marca de agua es inclusiva (>=): las filas del borde vuelven a llegar y no deben
+            # contar como cambio. Un updated_at distinto invalida el contenido cacheado.
+            changes_before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT INTO nodes (id, type, label, created_at, updated_at, content, content_loaded)
+                VALUES (?, ?, ?, ?, ?, NULL, 0)
+                ON CONFLICT(id) DO UPDATE SET type = excluded.type, label = excluded.label,
+                    created_at = excluded.created_at, updated_at = excluded.updated_at,
+                    content = NULL, content_loaded = 0
+                WHERE (nodes.type, nodes.label, nodes.created_at, nodes.updated_at)
+                    IS NOT (excluded.type, excluded.label, excluded.created_at, excluded.updated_at)
+            """, [(r['id'], r.get('type'), r.get('label'), r.get('created_at'), r.get('updated_at')) for r in node_rows])
+            nodes_changed = self._conn.total_changes - changes_before
+            new_node_watermark = self._max_timestamp(node_rows, node_watermark_cols, node_watermark)
+            if new_node_watermark:
+                self._set_meta('nodes_watermark', new_node_watermark)
+
+            # Conexiones (sin created_at no hay incremental posible: se traen completas, solo columnas livianas)
+            edge_watermark_cols = [c for c in ('created_at', 'updated_at') if c in edge_cols]
+            edge_select = ", ".join([c for c in ('id',) if c in edge_cols] + ['source_id', 'target_id', 'relationship_type'] + edge_watermark_cols)
+            edge_watermark = self._get_meta('edges_watermark') if edge_watermark_cols else None
+            edge_rows = self._fetch_rows('edges', edge_select, edge_watermark, edge_watermark_cols,
+                                         order_column='id' if 'id' in edge_cols else 'source_id')
+            if not edge_watermark_cols:
+                self._conn.execute("DELETE FROM edges")
+            changes_before = self._conn.total_changes
+            self._conn.executemany("""
+                INSERT INTO edges (key, source_id, target_id, relationship_type, created_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET source_id = excluded.source_id, target_id = excluded.target_id,
+                    relationship_type = excluded.relationship_type, created_at = excluded.created_at
+                WHERE (edges.source_id, edges.target_id, edges.relationship_type)
+                    IS NOT (excluded.source_id, excluded.target_id, excluded.relationship_type)
+            """, [(self._edge_key(r), r.get('source_id'), r.get('target_id'), r.get('relationship_type'), r.get('created_at'))
+                  for r in edge_rows])
+            edges_changed = self._conn.total_changes - changes_before
+            new_edge_watermark = self._max_timestamp(edge_rows, edge_watermark_cols, edge_watermark)
+            if new_edge_watermark:
+                self._set_meta('edges_watermark', new_edge_watermark)
+
+            deleted = self._maybe_reconcile_deletions(edge_cols)
+            self._conn.commit()
+
+            if edges_changed or deleted or not edge_watermark_cols:
+                self._edges_version += 1
+            self._last_sync = time.monotonic()
+            self.stats['syncs'] += 1
+            self.stats['nodes_synced'] += nodes_changed
+            self.stats['edges_synced'] += edges_changed
+            elapsed = time.perf_counter() - started
+            print(f"  -> 🗂️ [GraphSnapshot] Sync: {nodes_changed} nodo(s) y {edges_changed} conexión(es) nuevas/cambiadas en {elapsed:.2f}s")
+            return {'skipped': False, 'nodes': nodes_changed, 'edges': edges_changed, 'deleted': deleted, 'seconds': elapsed}
+
+    def _maybe_reconcile_deletions(self, edge_cols: set) -> int:
+        """Cada GRAPH_SNAPSHOT_FULL_RESYNC_HOURS compara solo ids y borra las filas eliminadas en Supabase."""
+        last = self._get_meta('last_reconcile')
+        now = datetime.now(timezone.utc)
+        if last and (now - datetime.fromisoformat(last)).total_seconds() < GRAPH_SNAPSHOT_FULL_RESYNC_HOURS * 3600:
+            return 0
+
+        deleted = 0
+        remote_nodes = {r['id'] for r in self._fetch_rows('nodes', 'id', None, [])}
+        local_nodes = [row[0] for row in self._conn.execute("SELECT id FROM nodes")]
+        stale_nodes = [(node_id,) for node_id in local_nodes if node_id not in remote_nodes]
+        self._conn.executemany("DELETE FROM nodes WHERE id = ?", stale_nodes)
+        deleted += len(stale_nodes)
+
+        if 'id' in edge_cols:
+            remote_edges = {str(r['id']) for r in self._fetch_rows('edges', 'id', None, [])}
+            local_edges = [row[0] for row in self._conn.execute("SELECT key FROM edges")]
+            stale_edges = [(key,) for key in local_edges if key not in remote_edges]
+            self._conn.executemany("DELETE FROM edges WHERE key = ?", stale_edges)
+            deleted += len(stale_edges)
+
+        self._set_meta('last_reconcile', now.isoformat())
+        self.stats['rows_deleted'] += deleted
+        if deleted:
+            print(f"  -> 🧹 [GraphSnapshot] {deleted} fila(s) eliminadas en Supabase quitadas del snapshot")
+        return deleted
+
+    # --- Consultas para los analizadores ---
+
+    def get_nodes(self, since: Optional[datetime] = None, sync: bool = True) -> List[Dict[str, Any]]:
+        """Nodos (id, type, label, created_at), opcionalmente solo los creados desde 'since'."""
+        if sync:
+            self.sync()
+        with self._lock:
+            if since is not None:
+                cursor = self._conn.execute(
+                    "SELECT id, type, label, created_at FROM nodes WHERE created_at >= ?", (since.astimezone(timezone.utc).isoformat(),)
+                )
+            else:
+                cursor = self._conn.execute("SELECT id, type, label, created_at FROM nodes")
+            return [dict(zip(NODE_COLUMNS, row)) for row in cursor]
+
+    def get_edges(self, sync: bool = True) -> List[Dict[str, Any]]:
+        """Conexiones (source_id, target_id, relationship_type, created_at)."""
+        if sync:
+            self.sync()
+        with self._lock:
+            cursor = self._conn.execute("SELECT source_id, target_id, relationship_type, created_at FROM edges")
+            return [dict(zip(('source_id', 'target_id', 'relationship_type', 'created_at'), row)) for row in cursor]
+
+    def get_contents(self, node_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        {id: content} para los nodos pedidos. Solo se descargan los que aún no
+        tienen el contenido cacheado (o cuya fila cambió desde entonces).
+        """
+        node_ids = list(dict.fromkeys(node_ids))
+        contents, missing = {}, []
+        with self._lock:
+            for i in range(0, len(node_ids), 900):  # límite de parámetros de SQLite
+                chunk = node_ids[i:i + 900]
+                placeholders = ",".join("?" * len(chunk))
+                for node_id, content, loaded in self._conn.execute(
+                    f"SELECT id, content, content_loaded FROM nodes WHERE id IN ({placeholders})", chunk
+                ):
+                    if loaded:
+                        contents[node_id] = content
+                    else:
+                        missing.append(node_id)
+
+        for i in range(0, len(missing), CONTENT_CHUNK_SIZE):
+            chunk = missing[i:i + CONTENT_CHUNK_SIZE]
+            response = db.supabase.table('nodes').select('id, content').in_('id', chunk).execute()
+            fetched = {row['id']: row.get('content') for row in (response.data or [])}
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE nodes SET content = ?, content_loaded = 1 WHERE id = ?",
+                    [(fetched.get(node_id), node_id) for node_id in chunk]
+                )
+                self._conn.commit()
+            contents.update({node_id: fetched.get(node_id) for node_id in chunk})
+            self.stats['contents_fetched'] += len(chunk)
+        return contents
+
+    def edge_index(self, sync: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Conexiones como arrays compactos: (node_ids, src, dst), donde src/dst son
+        índices int32 sobre node_ids (solo nodos que aparecen en alguna conexión).
+        Se recalcula solo si las conexiones cambiaron desde la última llamada.
+        """
+        if sync:
+            self.sync()
+        with self._lock:
+            if self._edge_index is not None and self._edge_index[0] == self._edges_version:
+                return self._edge_index[1:]
+            pairs = self._conn.execute(
+                "SELECT source_id, target_id FROM edges WHERE source_id IS NOT NULL AND target_id IS NOT NULL"
+            ).fetchall()
+            endpoints = np.array(pairs, dtype=object).reshape(-1, 2)
+            node_ids, inverse = np.unique(endpoints.ravel().astype(str), return_inverse=True)
+            inverse = inverse.astype(np.int32).reshape(-1, 2)
+            self._edge_index = (self._edges_version, node_ids, inverse[:, 0], inverse[:, 1])
+            return self._edge_index[1:]
+
+    def adjacency(self, sync: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Adyacencia no dirigida en formato CSR: (node_ids, indptr, indices).
+        Los vecinos de node_ids[i] son node_ids[indices[indptr[i]:indptr[i + 1]]].
+        """
+        node_ids, src, dst = self.edge_index(sync=sync)
+        rows = np.concatenate([src, dst])
+        cols = np.concatenate([dst, src])
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(node_ids)), out=indptr[1:])
+        return node_ids, indptr, cols[order].astype(np.int32)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = self._conn.execute("SELECT COUNT(*), SUM(content_loaded) FROM nodes").fetchone()
+            edges = self._conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+            return {**self.stats, 'nodes': nodes[0], 'contents_cached': nodes[1] or 0, 'edges': edges,
+                    'nodes_watermark': self._get_meta('nodes_watermark'),
+                    'edges_watermark': self._get_meta('edges_watermark')}
+
+
+_snapshot_lock = threading.Lock()
+_snapshot: Optional[GraphSnapshot] = None
+
+
+def get_graph_snapshot() -> GraphSnapshot:
+    """Snapshot compartido por todo el proceso (endpoints de Flask incluidos)."""
+    global _snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = GraphSnapshot()
+        return _snapshot
@@ -0,0 +1,217 @@
+# quantex/core/autoconocimiento/graph_stats.py
+
+"""
+Fachada de agregados del grafo de conocimiento (conteos por día/tipo/tema,
+distribución de grados, huérfanos, hubs y totales).
+
+Dos implementaciones con la misma interfaz:
+  - SupabaseGraphStats: funciones SQL vía supabase.rpc
+    (supabase/migrations/20261017110000_graph_stats_rpcs.sql). El servidor
+    devuelve kilobytes de agregados en vez de todas las filas.
+  - SqliteGraphStats: las mismas consultas sobre el snapshot local
+    (graph_snapshot.py); sirve para pruebas sin conexión.
+
+get_graph_stats() entrega la fachada por defecto (QUANTEX_GRAPH_STATS_BACKEND =
+'supabase' | 'sqlite'); si una RPC falla (p. ej. la migración aún no se aplicó)
+se usa el snapshot local para esa llamada.
+"""
+
+import os
+import sys
+import re
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+GRAPH_STATS_BACKEND = os.environ.get("QUANTEX_GRAPH_STATS_BACKEND", "supabase").lower()
+TOPIC_MIN_LENGTH = 4
+# Tamaño de página de las RPC: el límite max-rows de PostgREST también aplica a ellas
+RPC_PAGE_SIZE = 1000
+
+
+def _iso(since: Optional[datetime]) -> Optional[str]:
+    return since.astimezone(timezone.utc).isoformat() if since is not None else None
+
+
+class SupabaseGraphStats:
+    """Agregados calculados en Postgres (supabase.rpc)."""
+
+    def __init__(self, supabase=None):
+        if supabase is None:
+            from quantex.core import database_manager as db
+            supabase = db.supabase
+        self.supabase = supabase
+
+    def _rpc(self, name: str, params: Optional[Dict[str, Any]] = None, paged: bool = True) -> List[Dict[str, Any]]:
+        """
+        Ejecuta la RPC y junta todas sus filas, en páginas de RPC_PAGE_SIZE con .range()
+        (las funciones paginadas ordenan por una clave única; ver
+        20261017140000_graph_stats_rpcs_order.sql).
+        """
+        if not paged:
+            return self.supabase.rpc(name, params or {}).execute().data or []
+        rows = []
+        offset = 0
+        while True:
+            page = self.supabase.rpc(name, params or {}) \
+                .range(offset, offset + RPC_PAGE_SIZE - 1) \
+                .execute().data or []
+            rows.extend(page)
+            if len(page) < RPC_PAGE_SIZE:
+                return rows
+            offset += RPC_PAGE_SIZE
+
+    def node_buckets(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        rows = self._rpc('graph_node_buckets', {'since': _iso(since)})
+        return [{'day': r['bucket_day'], 'type': r['node_type'], 'count': int(r['node_count'])} for r in rows]
+
+    def topic_counts(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        rows = self._rpc('graph_topic_counts', {'since': _iso(since), 'min_length': TOPIC_MIN_LENGTH})
+        return [{'month': r['bucket_month'], 'topic': r['topic'], 'count': int(r['topic_count'])} for r in rows]
+
+    def degree_distribution(self) -> List[Dict[str, int]]:
+        rows = self._rpc('graph_degree_distribution')
+        return [{'degree': int(r['degree']), 'count': int(r['node_count'])} for r in rows]
+
+    def orphan_nodes(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._rpc('graph_orphan_nodes', {'limit_count': limit})
+        return [{'id': r['id'], 'label': r['label'], 'type': r['node_type']} for r in rows]
+
+    def hub_nodes(self, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self._rpc('graph_hub_nodes', {'limit_count': limit})
+        return [{'id': r['id'], 'label': r['label'], 'type': r['node_type'], 'degree': int(r['degree'])} for r in rows]
+
+    def summary(self) -> Dict[str, int]:
+        rows = self._rpc('graph_summary', paged=False)
+        row = rows[0] if rows else {}
+        return {key: int(row.get(key) or 0) for key in ('total_nodes', 'total_edges', 'connected_nodes')}
+
+
+class SqliteGraphStats:
+    """Los mismos agregados sobre las tablas nodes / edges del snapshot local."""
+
+    _DEGREES = """
+        SELECT node_id, COUNT(*) AS degree FROM (
+            SELECT source_id AS node_id FROM edges WHERE source_id IS NOT NULL
+            UNION ALL
+            SELECT target_id FROM edges WHERE target_id IS NOT NULL
+        ) GROUP BY node_id
+    """
+    _WORD = re.compile(r'\s+')
+
+    def __init__(self, snapshot=None, sync: bool = True):
+        if snapshot is None:
+            from quantex.core.autoconocimiento.graph_snapshot import get_graph_snapshot
+            snapshot = get_graph_snapshot()
+        self.snapshot = snapshot
+        self.sync = sync
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        if self.sync:
+            self.snapshot.sync()
+        with self.snapshot._lock:
+            return self.snapshot._conn.execute(sql, params).fetchall()
+
+    def node_buckets(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        rows = self._query("""
+            SELECT date(created_at), COALESCE(type, 'Desconocido'), COUNT(*) FROM nodes
+            WHERE ? IS NULL OR created_at IS NULL OR created_at >= ?
+            GROUP BY 1, 2
+        """, (_iso(since), _iso(since)))
+        return [{'day': day, 'type': node_type, 'count': count} for day, node_type, count in rows]
+
+    def topic_counts(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        # SQLite no separa palabras en SQL: se cuentan en Python sobre las etiquetas locales
+        rows = self._query("""
+            SELECT COALESCE(strftime('%Y-%m', created_at), strftime('%Y-%m', 'now')), label FROM nodes
+            WHERE label IS NOT NULL AND (? IS NULL OR created_at IS NULL OR created_at >= ?)
+        """, (_iso(since), _iso(since)))
+        counts = Counter()
+        for month, label in rows:
+            for word in self._WORD.split(label.lower()):
+                if len(word) >= TOPIC_MIN_LENGTH and word.isalpha():
+                    counts[(month, word)] += 1
+        return [{'month': month, 'topic': topic, 'count': count} for (month, topic), count in counts.items()]
+
+    def degree_distribution(self) -> List[Dict[str, int]]:
+        rows = self._query(f"""
+            SELECT COALESCE(d.degree, 0), COUNT(*) FROM nodes n
+            LEFT JOIN ({self._DEGREES}) d ON d.node_id = n.id
+            GROUP BY 1 ORDER BY 1
+        """)
+        return [{'degree': degree, 'count': count} for degree, count in rows]
+
+    def orphan_nodes(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        rows = self._query("""
+            SELECT n.id, n.label, n.type FROM nodes n
+            WHERE NOT EXISTS (SELECT 1 FROM edges e WHERE e.source_id = n.id)
+              AND NOT EXISTS (SELECT 1 FROM edges e WHERE e.target_id = n.id)
+            ORDER BY n.created_at IS NULL, n.created_at DESC, n.id
+            LIMIT ?
+        """, (-1 if limit is None else limit,))
+        return [{'id': node_id, 'label': label, 'type': node_type} for node_id, label, node_type in rows]
+
+    def hub_nodes(self, limit: int = 10) -> List[Dict[str, Any]]:
+        rows = self._query(f"""
+            SELECT n.id, n.label, n.type, d.degree FROM ({self._DEGREES}) d
+            JOIN nodes n ON n.id = d.node_id
+            ORDER BY d.degree DESC, n.id
+            LIMIT ?
+        """, (limit,))
+        return [{'id': node_id, 'label': label, 'type': node_type, 'degree': degree}
+                for node_id, label, node_type, degree in rows]
+
+    def summary(self) -> Dict[str, int]:
+        row = self._query(f"""
+            SELECT (SELECT COUNT(*) FROM nodes), (SELECT COUNT(*) FROM edges), (SELECT COUNT(*) FROM ({self._DEGREES}))
+        """)[0]
+        return dict(zip(('total_nodes', 'total_edges', 'connected_nodes'), row))
+
+
+class GraphStats:
+    """
+    Fachada con respaldo: cada método intenta el backend principal y, si falla,
+    responde con el snapshot local (SqliteGraphStats).
+    """
+
+    METHODS = ('node_buckets', 'topic_counts', 'degree_distribution', 'orphan_nodes', 'hub_nodes', 'summary')
+
+    def __init__(self, primary, fallback_factory=SqliteGraphStats):
+        self.primary = primary
+        self._fallback_factory = fallback_factory
+        self._fallback = None
+
+    def __getattr__(self, name):
+        if name not in self.METHODS:
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            try:
+                return getattr(self.primary, name)(*args, **kwargs)
+            except Exception as e:
+                if self._fallback_factory is None or isinstance(self.primary, SqliteGraphStats):
+                    raise
+                print(f"  -> ⚠️ [GraphStats] RPC '{name}' no disponible ({e}). Usando snapshot local.")
+                if self._fallback is None:
+                    self._fallback = self._fallback_factory()
+                return getattr(self._fallback, name)(*args, **kwargs)
+        return call
+
+
+_stats_lock = threading.Lock()
+_stats: Optional[GraphStats] = None
+
+
+def get_graph_stats() -> GraphStats:
+    """Fachada compartida según QUANTEX_GRAPH_STATS_BACKEND ('supabase' por defecto, o 'sqlite')."""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            primary = SqliteGraphStats() if GRAPH_STATS_BACKEND == 'sqlite' else SupabaseGraphStats()
+            _stats = GraphStats(primary)
+        return _stats
@@ -16,6 +16,7 @@ if PROJECT_ROOT not in sys.path:
 from quantex.core import database_manager as db
 from quantex.core.ai_services import ai_services
 from quantex.core import llm_manager
+from quantex.core.autoconocimiento.graph_snapshot import get_graph_snapshot
 
 class PredictiveInsightsEngine:
     """
@@ -38,24 +39,8 @@ class PredictiveInsightsEngine:
             # Calcular fecha límite
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=months * 30)
             
-            # Obtener todos los nodos recientes con paginación
-            nodes = []
-            page_size = 1000
-            offset = 0
-            
-            while True:
-                response = self.db.supabase.table('nodes').select('*').gte('created_at', cutoff_date.isoformat()).range(offset, offset + page_size - 1).execute()
-                
-                if not response.data:
-                    break
-                    
-                nodes.extend(response.data)
-                print(f"  -> Obtenidos {len(response.data)} nodos recientes (offset: {offset})")
-                
-                if len(response.data) < page_size:
-                    break
-                    
-                offset += page_size
+            # Nodos recientes desde el snapshot local (solo se descarga el delta desde la última sync)
+            nodes = get_graph_snapshot().get_nodes(since=cutoff_date)
             
             if not nodes:
                 return {"error": "No hay datos suficientes para análisis temporal"}
@@ -116,51 +101,26 @@ class PredictiveInsightsEngine:
         try:
             print("🔗 [Insights Predictivos] Analizando patrones de conexiones")
             
-            # Obtener todas las conexiones con paginación
-            edges = []
-            page_size = 1000
-            offset = 0
-            
-            while True:
-                response = self.db.supabase.table('edges').select('*').range(offset, offset + page_size - 1).execute()
-                
-                if not response.data:
-                    break
-                    
-                edges.extend(response.data)
-                print(f"  -> Obtenidas {len(response.data)} conexiones (offset: {offset})")
-                
-                if len(response.data) < page_size:
-                    break
-                    
-                offset += page_size
+            # Adyacencia compacta (CSR) desde el snapshot local
+            node_ids, indptr, indices = get_graph_snapshot().adjacency()
+            total_edges = len(indices) // 2
             
-            if not edges:
+            if total_edges == 0:
                 return {"error": "No hay conexiones para analizar"}
             
-            # Construir grafo de conexiones
-            connection_graph = defaultdict(list)
-            node_degrees = defaultdict(int)
-            
-            for edge in edges:
-                source = edge.get('source_id')
-                target = edge.get('target_id')
-                if source and target:
-                    connection_graph[source].append(target)
-                    connection_graph[target].append(source)
-                    node_degrees[source] += 1
-                    node_degrees[target] += 1
+            # Grado de cada nodo (un self-loop cuenta 2, como antes)
+            node_degrees = np.diff(indptr)
             
             # Identificar hubs (nodos con muchas conexiones)
-            hubs = sorted(node_degrees.items(), key=lambda x: x[1], reverse=True)[:10]
+            top = np.argsort(-node_degrees, kind='stable')[:10]
+            hubs = [(node_ids[i], int(node_degrees[i])) for i in top]
             
             # Calcular métricas de red
-            total_nodes = len(connection_graph)
-            total_edges = len(edges)
-            avg_degree = sum(node_degrees.values()) / total_nodes if total_nodes > 0 else 0
+            total_nodes = len(node_ids)
+            avg_degree = float(node_degrees.sum()) / total_nodes if total_nodes > 0 else 0
             
             # Identificar clusters usando análisis de componentes conectados
-            clusters = self._find_connected_components(connection_graph)
+            clusters = self._find_connected_components(indptr, indices)
             
             return {
                 "total_nodes": total_nodes,
@@ -253,24 +213,24 @@ Responde en español y enfócate en insights accionables.
         
         return round(growth_rate, 2)
     
-    def _find_connected_components(self, graph: Dict[str, List[str]]) -> List[List[str]]:
-        """Encuentra componentes conectados en el grafo"""
-        visited = set()
+    def _find_connected_components(self, indptr: np.ndarray, indices: np.ndarray) -> List[np.ndarray]:
+        """Encuentra componentes conectados sobre la adyacencia CSR (BFS iterativo, sin recursión)"""
+        labels = np.full(len(indptr) - 1, -1, dtype=np.int64)
         components = []
         
-        def dfs(node, component):
-            visited.add(node)
-            component.append(node)
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor, component)
-        
-        for node in graph:
-            if node not in visited:
-                component = []
-                dfs(node, component)
-                if component:
-                    components.append(component)
+        for start in range(len(labels)):
+            if labels[start] != -1:
+                continue
+            labels[start] = len(components)
+            frontier = np.array([start])
+            members = [frontier]
+            while frontier.size:
+                neighbors = np.concatenate([indices[indptr[n]:indptr[n + 1]] for n in frontier])
+                neighbors = np.unique(neighbors[labels[neighbors] == -1])
+                labels[neighbors] = len(components)
+                members.append(neighbors)
+                frontier = neighbors
+            components.append(np.concatenate(members))
         
         return components
 
@@ -7,6 +7,7 @@ import re
 import json
 import logging
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Tuple
 # Imports eliminados: numpy, cosine_similarity - IA detecta duplicados semánticos
 
@@ -20,6 +21,7 @@ if PROJECT_ROOT not in sys.path:
 
 # --- Importaciones de Quantex (Centralizadas) ---
 from quantex.core import database_manager as db
+from quantex.core.node_dedup import document_exists_by_url, existing_document_urls
 from quantex.core.web_tools import get_firecrawl_scrape
 from quantex.core.ai_services import ai_services
 from quantex.core import agent_tools
@@ -27,6 +29,11 @@ from quantex.core.knowledge_graph.ingestion_engine import KnowledgeGraphIngestio
 from quantex.core.config_loader import get_config_loader
 from quantex.core.llm_manager import generate_completion
 
+# --- Parámetros de procesamiento de feeds ---
+SCRAPE_MAX_WORKERS = 4        # Scrapeos simultáneos por feed (Firecrawl)
+SCRAPE_ATTEMPTS = 3
+SCRAPE_BACKOFF_SECONDS = 1.0  # Espera tras el primer fallo; se duplica en cada reintento
+
 # --- Clases de Screening Inteligente ---
 
 class NewsScreeningAgent:
@@ -283,16 +290,8 @@ def does_url_exist_in_db(url: str) -> bool:
         if not url:
             return False
             
-        # Query que funciona para verificar URL individual
-        response = db.supabase.table('nodes') \
-            .select('id') \
-            .eq('type', 'Documento') \
-            .eq('properties->>original_url', url) \
-            .limit(1) \
-            .execute()
-        
-        exists = len(response.data) > 0
-        return exists
+        # Columna indexada dedup_url (o properties->>original_url si la migración no está aplicada)
+        return document_exists_by_url(url, db.supabase)
         
     except Exception as e:
         print(f"      ⚠️ Error verificando URL individual: {e}")
@@ -300,156 +299,163 @@ def does_url_exist_in_db(url: str) -> bool:
 
 def get_existing_urls_batch(urls: List[str]) -> set:
     """
-    (Versión Optimizada - Consulta Masiva Alternativa)
-    Obtiene todas las URLs existentes en una sola consulta, filtrando en Python
+    (Versión Optimizada - Consulta Masiva por lotes)
+    Devuelve el subconjunto de 'urls' que ya existe como Documento en la DB.
+    Consulta solo esas URLs con in_() por bloques (node_dedup, columna indexada), en vez de
+    traer todas las URLs de la tabla nodes (que además quedaba truncada en 1000 filas).
     """
+    unique_urls = list(dict.fromkeys(u for u in urls if u))
+    if not unique_urls:
+        return set()
+
     try:
-        if not urls:
-            return set()
-            
-        # Query que SÍ funciona (con filtro NOT NULL)
-        response = db.supabase.table('nodes') \
-            .select('properties->>original_url') \
-            .eq('type', 'Documento') \
-            .not_.is_('properties->>original_url', 'null') \
-            .execute()
-        
-        # Crear set de todas las URLs existentes
-        all_existing_urls = set()
-        for row in response.data:
-            if row.get('original_url'):
-                all_existing_urls.add(row['original_url'])
-        
-        print(f"      -> 🔍 URLs encontradas en DB: {len(all_existing_urls)}")
-        
-        # Filtrar solo las que están en el feed actual
-        existing_urls = {url for url in all_existing_urls if url in urls}
-        
-        print(f"      -> 📊 Consulta masiva: {len(existing_urls)} URLs encontradas en DB de {len(urls)} del feed")
-        
-        # Debug: mostrar URLs duplicadas
-        if existing_urls:
-            print(f"      -> 🔍 URLs duplicadas encontradas:")
-            for i, url in enumerate(list(existing_urls)[:3]):
-                print(f"         {i+1}. {url[:80]}...")
-        print(f"      -> 📋 Total documentos en DB: {len(all_existing_urls)}")
-        
-        return existing_urls
-        
+        existing_urls = existing_document_urls(unique_urls, db.supabase)
     except Exception as e:
         print(f"      ⚠️ Error en consulta masiva de URLs: {e}")
-        return set()
+        # Fallback: verificación 1 a 1
+        existing_urls = {url for url in unique_urls if does_url_exist_in_db(url)}
 
-def process_rss_feed(target: dict, ingestion_engine: KnowledgeGraphIngestionEngine):
+    print(f"      -> 📊 Consulta masiva: {len(existing_urls)} URLs ya existentes en DB de {len(unique_urls)} candidatas")
+    return existing_urls
+
+def group_targets_by_feed(targets: List[dict]) -> Dict[str, List[dict]]:
     """
-    (Versión 16.0 - Optimizado)
-    Procesa un feed con eliminación de duplicados en lote para máxima eficiencia.
+    Agrupa los targets por source_url (conservando el orden del YAML), para
+    descargar y parsear cada feed una sola vez aunque lo usen varios targets.
     """
+    groups: Dict[str, List[dict]] = {}
+    for target in targets:
+        rss_url = target.get('source_url')
+        if not rss_url:
+            print(f"  -> ⚠️ Target '{target.get('target_name', 'Desconocido')}' sin source_url, se omite.")
+            continue
+        groups.setdefault(rss_url, []).append(target)
+    return groups
+
+def ingest_article(target: dict, entry_link: str, full_content_md: str,
+                   ingestion_engine: KnowledgeGraphIngestionEngine) -> bool:
+    """Ingesta una noticia ya scrapeada con el contexto de su target."""
     target_name = target.get('target_name', 'Desconocido')
-    rss_url = target.get('source_url')
-    
-    print(f"\n--- 📰 Procesando Feed: {target_name} ---")
-    if not rss_url: return
 
-    # Obtener keywords del target
-    filter_keywords = target.get('filter_keywords', [])
-    commodity = target.get('commodity', 'copper')
-    
+    # OMITIR screening IA con contenido completo (política actual)
+    screening_result = {
+        "relevant": True,
+        "confidence": 1.0,
+        "novelty_score": 0.0,
+        "impact_level": "unclassified"
+    }
+    print(f"      ✅ Aprobado ({target_name}): {screening_result['impact_level']} impact")
+
+    try:
+        source_context = {
+            "source": target.get('publisher', target_name),
+            "topic": target.get('target_name'),
+            "source_type": "Noticia Continua",
+            "original_url": entry_link,
+            "screening_score": screening_result['confidence'],
+            "novelty_score": screening_result['novelty_score'],
+            "impact_level": screening_result['impact_level'],
+            "feed_similarity": 0.0,  # Eliminado: IA detecta duplicados
+            "historical_similarity": 0.0  # Simplificado: solo URL exacta
+        }
+
+        # Usar el nuevo motor de ingesta centralizado
+        result = ingestion_engine.ingest_document(full_content_md, source_context)
+        if result.get("success"):
+            print(f"      -> ✅ {result.get('nodes_created', 0)} nodo(s) creado(s) con conexiones semánticas.")
+            return True
+        print(f"      -> ❌ Error en ingesta: {result.get('reason', 'Desconocido')}")
+    except Exception as e:
+        print(f"      -> ❌ Error en el procesamiento profundo de la noticia '{entry_link}': {e}")
+    return False
+
+def process_feed_group(rss_url: str, targets: List[dict], ingestion_engine: KnowledgeGraphIngestionEngine,
+                       max_workers: int = SCRAPE_MAX_WORKERS):
+    """
+    (Versión 17.0 - Feed compartido)
+    Procesa un feed una sola vez para todos los targets que lo usan:
+    1. Descarga y parsea el feed una vez.
+    2. Pasa cada noticia por el prefiltro de cada target (la primera que la acepta se la queda).
+    3. Descarta las URLs ya existentes con una sola consulta masiva.
+    4. Scrapea las sobrevivientes en paralelo (pool acotado) e ingesta a medida que terminan.
+    """
+    target_names = ", ".join(t.get('target_name', 'Desconocido') for t in targets)
+    print(f"\n--- 📰 Procesando Feed: {target_names} ---")
+    if not rss_url or not targets: return
+
     try:
-        # 1. Cargar RSS feed completo
+        # 1. Cargar RSS feed completo (una vez por URL)
         feed = feedparser.parse(rss_url)
         if not feed.entries:
             print("  -> No se encontraron noticias en este feed.")
             return
 
-        print(f"  📰 Feed cargado: {len(feed.entries)} noticias encontradas")
-        
-        # 2. Crear agente de screening
-        screening_agent = NewsScreeningAgent(commodity, filter_keywords)
-        
-        # 3. Contadores para estadísticas
-        new_articles_processed = 0
-        skipped_prefilter = 0
-        skipped_screening = 0
-        skipped_existing = 0
+        print(f"  📰 Feed cargado: {len(feed.entries)} noticias encontradas ({len(targets)} target(s))")
 
-        # 4. Procesar cada noticia individualmente (método 1 a 1 que funciona)
+        # 2. Prefiltro de cada target sobre cada noticia
+        candidates: Dict[str, Tuple[dict, Any]] = {}  # url -> (target, entry)
+        skipped_prefilter = 0
         for entry in feed.entries:
             entry_link = entry.get('link')
+            if not entry_link or entry_link in candidates:
+                continue
             title = entry.get('title', '')
             summary = entry.get('summary', '')
+            for target in targets:
+                if enhanced_prefilter(title, summary, target.get('filter_keywords', []), target.get('filter_config')):
+                    candidates[entry_link] = (target, entry)
+                    break
+            else:
+                skipped_prefilter += 1
 
-            # 4.1 Verificar si URL ya existe en DB (método 1 a 1)
-            if entry_link:
-                if does_url_exist_in_db(entry_link):
-                    skipped_existing += 1
-                    continue
+        # 3. Verificar duplicados contra la DB en una sola consulta
+        existing_urls = get_existing_urls_batch(list(candidates))
+        skipped_existing = len(existing_urls)
+        pending = [(url, target, entry) for url, (target, entry) in candidates.items() if url not in existing_urls]
 
-            # 4.2 Prefiltro mejorado con keywords
-            filter_config = target.get('filter_config')
-            if not enhanced_prefilter(title, summary, target.get('filter_keywords', []), filter_config):
-                skipped_prefilter += 1
-                continue
-            
-            # Solo mostrar noticias que pasan el prefiltro
-            print(f"    📰 Procesando: '{title[:60]}...'")
-            
-            # 4.3 Proceder con scrape (antes del screening)
-            full_content_md = scrape_article_with_retries(entry_link)
-            if not full_content_md:
-                print(f"      ⏭️  Sin contenido tras scrapeo")
-                continue
-            
-            # 4.4 OMITIR screening IA con contenido completo (política actual)
+        for url, target, entry in pending:
+            print(f"    📰 Procesando ({target.get('target_name')}): '{entry.get('title', '')[:60]}...'")
+        if pending:
             print("      ⚠️ Screening IA omitido por política: se procederá a ingesta tras prefiltro.")
-            screening_result = {
-                "relevant": True,
-                "confidence": 1.0,
-                "novelty_score": 0.0,
-                "impact_level": "unclassified"
-            }
-            
-            # 4.6 Proceder con ingesta
-            print(f"      ✅ Aprobado: {screening_result['impact_level']} impact")
-            new_articles_processed += 1
-            
-            try:
-                source_context = {
-                    "source": target.get('publisher', target_name),
-                    "topic": target.get('target_name'),
-                    "source_type": "Noticia Continua",
-                    "original_url": entry_link,
-                    "screening_score": screening_result['confidence'],
-                    "novelty_score": screening_result['novelty_score'],
-                    "impact_level": screening_result['impact_level'],
-                    "feed_similarity": 0.0,  # Eliminado: IA detecta duplicados
-                    "historical_similarity": 0.0  # Simplificado: solo URL exacta
-                }
-                
-                # Usar el nuevo motor de ingesta centralizado
-                result = ingestion_engine.ingest_document(full_content_md, source_context)
-                if result.get("success"):
-                    print(f"      -> ✅ {result.get('nodes_created', 0)} nodo(s) creado(s) con conexiones semánticas.")
-                else:
-                    print(f"      -> ❌ Error en ingesta: {result.get('reason', 'Desconocido')}")
-
-            except Exception as e:
-                print(f"      -> ❌ Error en el procesamiento profundo de la noticia '{entry_link}': {e}")
-        
+
+        # 4. Scrapeo concurrente; la ingesta se hace en este hilo a medida que llegan los resultados
+        new_articles_processed = 0
+        skipped_no_content = 0
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending) or 1))) as executor:
+            futures = {executor.submit(scrape_article_with_retries, url): (url, target) for url, target, _ in pending}
+            for future in as_completed(futures):
+                url, target = futures[future]
+                try:
+                    full_content_md = future.result()
+                except Exception as e:
+                    print(f"      -> ❌ Error scrapeando '{url}': {e}")
+                    full_content_md = ""
+                if not full_content_md:
+                    print(f"      ⏭️  Sin contenido tras scrapeo: {url}")
+                    skipped_no_content += 1
+                    continue
+                new_articles_processed += 1
+                ingest_article(target, url, full_content_md, ingestion_engine)
+
         # 5. Mostrar resumen de procesamiento
-        print(f"\n  📊 Resumen: {new_articles_processed} procesadas, {skipped_existing} duplicadas, {skipped_prefilter} prefiltradas, {skipped_screening} rechazadas")
-        
+        print(f"\n  📊 Resumen: {new_articles_processed} procesadas, {skipped_existing} duplicadas, "
+              f"{skipped_prefilter} prefiltradas, {skipped_no_content} sin contenido")
+
         if new_articles_processed == 0:
             print("  ✅ No se encontraron noticias nuevas para procesar.")
         else:
             print(f"  ✅ Se procesaron {new_articles_processed} noticias nuevas de este feed.")
 
     except Exception as e:
-        print(f"  -> ❌ Error fatal al procesar el feed '{target_name}': {e}")
+        print(f"  -> ❌ Error fatal al procesar el feed '{target_names}': {e}")
+
+def process_rss_feed(target: dict, ingestion_engine: KnowledgeGraphIngestionEngine):
+    """Procesa un único target (compatibilidad): equivale a un grupo de un solo target."""
+    process_feed_group(target.get('source_url'), [target], ingestion_engine)
 
 
 def run_automated_monitoring():
-    print("\n--- Vigilancia Automatica de RSS (Version 16.0 - Optimizado) ---")
+    print("\n--- Vigilancia Automatica de RSS (Version 17.0 - Feeds compartidos) ---")
     
     # Inicializar el nuevo motor de ingesta centralizado
     print("Inicializando Motor de Ingesta Centralizado...")
@@ -466,10 +472,11 @@ def run_automated_monitoring():
             print("-> No se encontraron objetivos RSS activos para procesar.")
             return
         
-        print(f"-> Se encontraron {len(targets)} fuentes RSS activas.")
+        feed_groups = group_targets_by_feed(targets)
+        print(f"-> Se encontraron {len(targets)} fuentes RSS activas en {len(feed_groups)} feed(s) distintos.")
         
-        for target in targets:
-            process_rss_feed(target, ingestion_engine)
+        for rss_url, feed_targets in feed_groups.items():
+            process_feed_group(rss_url, feed_targets, ingestion_engine)
             # Timestamps eliminados del YAML para simplificar el sistema
             
     except Exception as e:
@@ -491,20 +498,24 @@ def clean_scraped_markdown(markdown_text: str) -> str:
     print("      -> ✅ Limpieza completada.")
     return text.strip()
 
-def scrape_article_with_retries(url: str) -> str:
+def scrape_article_with_retries(url: str, attempts: int = SCRAPE_ATTEMPTS) -> str:
+    """
+    Scrapeo con reintentos y backoff exponencial (SCRAPE_BACKOFF_SECONDS, 2x, ...).
+    Es seguro llamarlo desde varios hilos del pool de process_feed_group.
+    """
     print(f"      -> 🔥 Realizando scrapeo profundo de: {url}")
-    for i in range(3):
+    for i in range(attempts):
         try:
-            print(f"        -> Intento {i + 1} de 3...")
             scraped_data = get_firecrawl_scrape(url) 
             if scraped_data and isinstance(scraped_data, dict):
                 markdown_content = scraped_data.get('markdown', '')
                 if markdown_content:
                     return clean_scraped_markdown(markdown_content)
         except Exception as e:
-            print(f"      -> ❌ Fallo en el intento {i + 1}: {e}")
-            if i < 2: time.sleep(5)
-    print("      -> ❌ Se han agotado todos los intentos de scrapeo.")
+            print(f"      -> ❌ Fallo en el intento {i + 1} de {attempts} ({url}): {e}")
+        if i < attempts - 1:
+            time.sleep(SCRAPE_BACKOFF_SECONDS * (2 ** i))
+    print(f"      -> ❌ Se han agotado todos los intentos de scrapeo: {url}")
     return ""
 
 # --- CÓDIGO DE ARRANQUE ---
@@ -18,6 +18,7 @@ if PROJECT_ROOT not in sys.path:
 from quantex.core import database_manager as db
 from quantex.core.ai_services import ai_services
 from quantex.core import llm_manager
+from quantex.core.autoconocimiento.graph_stats import get_graph_stats
 
 class TemporalAnalyzer:
     """
@@ -40,62 +41,22 @@ class TemporalAnalyzer:
             # Calcular fecha límite
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=months * 30)
             
-            # Obtener TODOS los nodos con paginación para evitar límite de 1000
-            all_nodes = []
-            page_size = 1000
-            offset = 0
+            # Agregados por día/tipo y por mes/tema calculados en el servidor (graph_stats)
+            # Filtrar por fecha solo si es necesario (menos de 2 años); los nodos sin fecha siempre se incluyen
+            since = cutoff_date if months < 24 else None
+            stats = get_graph_stats()
+            buckets = stats.node_buckets(since=since)
             
-            while True:
-                response = self.db.supabase.table('nodes').select('*').range(offset, offset + page_size - 1).execute()
-                
-                if not response.data:
-                    break
-                    
-                all_nodes.extend(response.data)
-                print(f"  -> Obtenidos {len(response.data)} nodos (offset: {offset})")
-                
-                if len(response.data) < page_size:
-                    break
-                    
-                offset += page_size
-            
-            if not all_nodes:
+            if not buckets:
                 return {"error": "No hay nodos en la base de datos"}
             
-            print(f"  -> Total nodos en BD: {len(all_nodes)}")
-            
-            # Filtrar por fecha solo si es necesario
-            if months < 24:  # Solo filtrar si es menos de 2 años
-                # Filtrar los nodos obtenidos por fecha en memoria
-                filtered_nodes = []
-                for node in all_nodes:
-                    created_at = node.get('created_at')
-                    if created_at:
-                        try:
-                            if 'Z' in created_at:
-                                date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                            else:
-                                date = datetime.fromisoformat(created_at)
-                            
-                            if date >= cutoff_date:
-                                filtered_nodes.append(node)
-                        except:
-                            # Si hay error en fecha, incluir el nodo
-                            filtered_nodes.append(node)
-                    else:
-                        # Si no hay fecha, incluir el nodo
-                        filtered_nodes.append(node)
-                
-                nodes = filtered_nodes
-                print(f"  -> Nodos en rango temporal ({months} meses): {len(nodes)}")
+            total_nodes = sum(bucket['count'] for bucket in buckets)
+            if since is not None:
+                print(f"  -> Nodos en rango temporal ({months} meses): {total_nodes}")
             else:
-                nodes = all_nodes
                 print(f"  -> Analizando todos los nodos (sin filtro temporal)")
             
-            if not nodes:
-                return {"error": "No hay datos suficientes para análisis temporal"}
-            
-            # Procesar fechas y agrupar por períodos
+            # Agrupar por día, semana y mes a partir de los conteos diarios
             daily_counts = defaultdict(int)
             weekly_counts = defaultdict(int)
             monthly_counts = defaultdict(int)
@@ -105,45 +66,29 @@ class TemporalAnalyzer:
             
             nodes_with_dates = 0
             nodes_without_dates = 0
+            today = datetime.now(timezone.utc).date()
             
-            for node in nodes:
-                created_at = node.get('created_at')
-                if not created_at:
-                    nodes_without_dates += 1
-                    # Si no hay fecha, usar fecha actual como fallback
-                    date = datetime.now(timezone.utc)
+            for bucket in buckets:
+                count = bucket['count']
+                if bucket['day']:
+                    nodes_with_dates += count
+                    date = datetime.strptime(str(bucket['day'])[:10], '%Y-%m-%d').date()
                 else:
-                    nodes_with_dates += 1
-                    try:
-                        if 'Z' in created_at:
-                            date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                        else:
-                            date = datetime.fromisoformat(created_at)
-                    except Exception as e:
-                        print(f"⚠️ Error procesando fecha {created_at}: {e}")
-                        # Usar fecha actual como fallback
-                        date = datetime.now(timezone.utc)
+                    nodes_without_dates += count
+                    # Si no hay fecha, usar fecha actual como fallback
+                    date = today
                 
-                # Agrupar por día, semana y mes
-                day_key = date.strftime('%Y-%m-%d')
-                week_key = date.strftime('%Y-W%U')
                 month_key = date.strftime('%Y-%m')
-                
-                daily_counts[day_key] += 1
-                weekly_counts[week_key] += 1
-                monthly_counts[month_key] += 1
+                daily_counts[date.strftime('%Y-%m-%d')] += count
+                weekly_counts[date.strftime('%Y-W%U')] += count
+                monthly_counts[month_key] += count
                 
                 # Agrupar por tipo de nodo
-                node_type = node.get('type', 'Desconocido')
-                node_types_by_time[month_key][node_type] += 1
-                
-                # Extraer temas de las etiquetas
-                label = node.get('label', '')
-                if label:
-                    words = label.lower().split()
-                    for word in words:
-                        if len(word) > 3 and word.isalpha():
-                            topics_by_time[month_key][word] += 1
+                node_types_by_time[month_key][bucket['type']] += count
+            
+            # Temas de las etiquetas por mes
+            for row in stats.topic_counts(since=since):
+                topics_by_time[row['month']][row['topic']] += row['count']
             
             print(f"  -> Nodos con fechas: {nodes_with_dates}")
             print(f"  -> Nodos sin fechas: {nodes_without_dates}")
@@ -158,7 +103,7 @@ class TemporalAnalyzer:
             emerging_topics = self._identify_emerging_topics(topics_by_time)
             
             return {
-                "total_nodes": len(nodes),
+                "total_nodes": total_nodes,
                 "time_period_months": months,
                 "daily_counts": dict(daily_counts),
                 "weekly_counts": dict(weekly_counts),
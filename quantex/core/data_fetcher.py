@@ -1,87 +1,131 @@
 # quantex/core/data_fetcher.py
 
+import os
+import time
+import threading
 import pandas as pd
 from datetime import datetime, timedelta
 from .database_manager import supabase
 
-# En: quantex/core/data_fetcher.py
+# --- Caché de series a nivel de proceso ---
+# Varias verticales (mesa redonda, comité técnico, charts, fair value) piden la misma
+# serie muchas veces en pocos minutos. Guardamos:
+#   1. Un índice identificador -> (tabla, definición) para no repetir el sondeo de 3 tablas.
+#   2. El DataFrame más amplio pedido por identificador; las ventanas más cortas se sirven
+#      recortándolo.
+SERIES_CACHE_TTL_SECONDS = int(os.environ.get("QUANTEX_SERIES_CACHE_TTL", "300"))
+IDENTIFIER_INDEX_TTL_SECONDS = int(os.environ.get("QUANTEX_SERIES_INDEX_TTL", "3600"))
 
-def get_data_series(identifier: str, days: int) -> pd.DataFrame | None:
+_cache_lock = threading.Lock()
+_identifier_index = {}   # identifier.lower() -> {'kind', 'definition', 'resolved_at'}
+_series_cache = {}       # identifier.lower() -> {'frame', 'start_date', 'fetched_at'}
+_cache_stats = {'hits': 0, 'misses': 0, 'index_hits': 0, 'index_misses': 0}
+
+
+def get_series_cache_stats() -> dict:
+    """Contadores de hits/misses del caché de series y del índice de identificadores."""
+    with _cache_lock:
+        return {**_cache_stats, 'cached_series': len(_series_cache), 'indexed_identifiers': len(_identifier_index)}
+
+
+def clear_series_cache(identifier: str | None = None):
+    """Invalida el caché completo o solo el de un identificador (p. ej. tras una sincronización)."""
+    with _cache_lock:
+        if identifier is None:
+            _series_cache.clear()
+            _identifier_index.clear()
+        else:
+            _series_cache.pop(identifier.lower(), None)
+            _identifier_index.pop(identifier.lower(), None)
+
+
+def _resolve_identifier(identifier: str) -> tuple[str, dict] | None:
+    """
+    Sondea instrument_definitions, fixed_income_definitions y series_definitions
+    (en ese orden) y memoriza en qué tabla vive el identificador.
+    """
+    key = identifier.lower()
+    with _cache_lock:
+        entry = _identifier_index.get(key)
+        if entry and time.monotonic() - entry['resolved_at'] < IDENTIFIER_INDEX_TTL_SECONDS:
+            _cache_stats['index_hits'] += 1
+            return entry['kind'], entry['definition']
+        _cache_stats['index_misses'] += 1
+
+    for kind, table in (('ohlcv', 'instrument_definitions'), ('fixed_income', 'fixed_income_definitions'), ('series', 'series_definitions')):
+        print(f"   -> 🔍 [DEBUG] Buscando en {table} para '{identifier}'...")
+        def_res = supabase.table(table).select('id, ticker').ilike('ticker', identifier).maybe_single().execute()
+        if def_res and def_res.data:
+            print(f"   -> ✅ [DEBUG] Encontrado en {table}: ID={def_res.data['id']}, ticker={def_res.data['ticker']}")
+            with _cache_lock:
+                _identifier_index[key] = {'kind': kind, 'definition': def_res.data, 'resolved_at': time.monotonic()}
+            return kind, def_res.data
+        print(f"   -> ❌ [DEBUG] No se encontró '{identifier}' en {table}")
+    return None
+
+
+def _fetch_series_frame(kind: str, definition: dict, identifier: str, start_date_str: str) -> pd.DataFrame | None:
+    """Descarga la serie ya resuelta desde su tabla de datos y la normaliza (índice tz-naive)."""
+    if kind == 'ohlcv':
+        response = supabase.table('market_data_ohlcv').select('*').ilike('ticker', identifier).gte('timestamp', start_date_str).order('timestamp', desc=False).execute()
+        date_col, renames, columns = 'timestamp', {'timestamp': 'date'}, ['open', 'high', 'low', 'close', 'volume']
+    elif kind == 'fixed_income':
+        response = supabase.table('fixed_income_trades').select('trade_date, average_yield').eq('instrument_id', definition['id']).gte('trade_date', start_date_str).order('trade_date', desc=False).execute()
+        date_col, renames, columns = 'trade_date', {'trade_date': 'date', 'average_yield': 'close'}, ['close']
+    else:
+        response = supabase.table('time_series_data').select('timestamp, value').eq('series_id', definition['id']).gte('timestamp', start_date_str).order('timestamp', desc=False).execute()
+        date_col, renames, columns = 'timestamp', {'timestamp': 'date', 'value': 'close'}, ['close']
+
+    print(f"   -> 🔍 [DEBUG] Datos encontrados ({kind}): {len(response.data) if response.data else 0} registros")
+    if not response.data:
+        print(f"   -> ⚠️ [DEBUG] No hay datos para '{identifier}' (definición {definition['id']})")
+        return None
+    df = pd.DataFrame(response.data)
+    df.rename(columns=renames, inplace=True)
+    df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None) # <-- LÍNEA CLAVE AÑADIDA
+    df.set_index('date', inplace=True)
+    print(f"   -> ✅ [DEBUG] DataFrame creado exitosamente con {len(df)} filas")
+    return df[columns]
+
+
+def get_data_series(identifier: str, days: int, use_cache: bool = True) -> pd.DataFrame | None:
     """
     Busca un identificador y devuelve sus datos históricos, asegurando que el
     índice de fecha no tenga información de zona horaria (tz-naive).
-    (Versión con Estandarización de Zona Horaria)
+    (Versión con Estandarización de Zona Horaria y caché por proceso)
+
+    Si ya hay en caché una ventana igual o más amplia para el identificador (y no
+    expiró su TTL), se devuelve una copia recortada sin tocar Supabase.
     """
     print(f"-> 🔎 [Buscador Universal] Solicitando datos para '{identifier}' de los últimos {days} días...")
-    
+
     end_date = datetime.now()
     start_date_str = (end_date - timedelta(days=days)).strftime('%Y-%m-%d')
+    start_ts = pd.Timestamp(start_date_str)
+    key = identifier.lower()
 
-    # 1. Buscar en instrument_definitions
-    print(f"   -> 🔍 [DEBUG] Buscando en instrument_definitions para '{identifier}'...")
-    inst_def_res = supabase.table('instrument_definitions').select('id, ticker').ilike('ticker', identifier).maybe_single().execute()
-    print(f"   -> 🔍 [DEBUG] Resultado de búsqueda en instrument_definitions: {inst_def_res.data if inst_def_res else 'None'}")
-    
-    if inst_def_res and inst_def_res.data:
-        print(f"   -> ✅ [DEBUG] Instrumento encontrado en instrument_definitions: ID={inst_def_res.data['id']}, ticker={inst_def_res.data['ticker']}")
-        # ... (lógica de búsqueda no cambia)
-        response = supabase.table('market_data_ohlcv').select('*').ilike('ticker', identifier).gte('timestamp', start_date_str).order('timestamp', desc=False).execute()
-        print(f"   -> 🔍 [DEBUG] Datos encontrados en market_data_ohlcv: {len(response.data) if response.data else 0} registros")
-        if not response.data: 
-            print(f"   -> ⚠️ [DEBUG] No hay datos en market_data_ohlcv para el ticker {identifier}")
-            return None
-        df = pd.DataFrame(response.data)
-        df.rename(columns={'timestamp': 'date'}, inplace=True)
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None) # <-- LÍNEA CLAVE AÑADIDA
-        df.set_index('date', inplace=True)
-        print(f"   -> ✅ [DEBUG] DataFrame creado exitosamente con {len(df)} filas")
-        return df[['open', 'high', 'low', 'close', 'volume']]
-    else:
-        print(f"   -> ❌ [DEBUG] No se encontró '{identifier}' en instrument_definitions")
-
-    # 2. Buscar en fixed_income_definitions
-    print(f"   -> 🔍 [DEBUG] Buscando en fixed_income_definitions para '{identifier}'...")
-    fi_def_res = supabase.table('fixed_income_definitions').select('id, ticker').ilike('ticker', identifier).maybe_single().execute()
-    print(f"   -> 🔍 [DEBUG] Resultado de búsqueda en fixed_income_definitions: {fi_def_res.data if fi_def_res else 'None'}")
-    
-    if fi_def_res and fi_def_res.data:
-        print(f"   -> ✅ [DEBUG] Fixed income encontrado en fixed_income_definitions: ID={fi_def_res.data['id']}, ticker={fi_def_res.data['ticker']}")
-        # ... (lógica de búsqueda no cambia)
-        response = supabase.table('fixed_income_trades').select('trade_date, average_yield').eq('instrument_id', fi_def_res.data['id']).gte('trade_date', start_date_str).order('trade_date', desc=False).execute()
-        print(f"   -> 🔍 [DEBUG] Datos encontrados en fixed_income_trades: {len(response.data) if response.data else 0} registros")
-        if not response.data: 
-            print(f"   -> ⚠️ [DEBUG] No hay datos en fixed_income_trades para el instrument_id {fi_def_res.data['id']}")
-            return None
-        df = pd.DataFrame(response.data)
-        df.rename(columns={'trade_date': 'date', 'average_yield': 'close'}, inplace=True)
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None) # <-- LÍNEA CLAVE AÑADIDA
-        df.set_index('date', inplace=True)
-        print(f"   -> ✅ [DEBUG] DataFrame creado exitosamente con {len(df)} filas")
-        return df[['close']]
-    else:
-        print(f"   -> ❌ [DEBUG] No se encontró '{identifier}' en fixed_income_definitions")
-
-    # 3. Buscar en series_definitions
-    print(f"   -> 🔍 [DEBUG] Buscando en series_definitions para '{identifier}'...")
-    series_def_res = supabase.table('series_definitions').select('id, ticker').ilike('ticker', identifier).maybe_single().execute()
-    print(f"   -> 🔍 [DEBUG] Resultado de búsqueda en series_definitions: {series_def_res.data if series_def_res else 'None'}")
-    
-    if series_def_res and series_def_res.data:
-        print(f"   -> ✅ [DEBUG] Serie encontrada en series_definitions: ID={series_def_res.data['id']}, ticker={series_def_res.data['ticker']}")
-        # ... (lógica de búsqueda no cambia)
-        response = supabase.table('time_series_data').select('timestamp, value').eq('series_id', series_def_res.data['id']).gte('timestamp', start_date_str).order('timestamp', desc=False).execute()
-        print(f"   -> 🔍 [DEBUG] Datos encontrados en time_series_data: {len(response.data) if response.data else 0} registros")
-        if not response.data: 
-            print(f"   -> ⚠️ [DEBUG] No hay datos en time_series_data para la serie {series_def_res.data['id']}")
-            return None
-        df = pd.DataFrame(response.data)
-        df.rename(columns={'timestamp': 'date', 'value': 'close'}, inplace=True)
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None) # <-- LÍNEA CLAVE AÑADIDA
-        df.set_index('date', inplace=True)
-        print(f"   -> ✅ [DEBUG] DataFrame creado exitosamente con {len(df)} filas")
-        return df[['close']]
-    else:
-        print(f"   -> ❌ [DEBUG] No se encontró '{identifier}' en series_definitions")
+    if use_cache:
+        with _cache_lock:
+            cached = _series_cache.get(key)
+            if cached and time.monotonic() - cached['fetched_at'] < SERIES_CACHE_TTL_SECONDS and cached['start_date'] <= start_ts:
+                _cache_stats['hits'] += 1
+                frame = cached['frame']
+                print(f"   -> ⚡ [Caché] Serie '{identifier}' servida desde memoria")
+                # Copia: los consumidores pueden mutar el DataFrame devuelto
+                return frame[frame.index >= start_ts].copy()
+            _cache_stats['misses'] += 1
+
+    resolved = _resolve_identifier(identifier)
+    if not resolved:
+        print(f"   -> ❌ [Error] No se encontró el identificador '{identifier}' en ninguna tabla de definiciones.")
+        return None
+
+    kind, definition = resolved
+    df = _fetch_series_frame(kind, definition, identifier, start_date_str)
+    if df is None:
+        return None
 
-    print(f"   -> ❌ [Error] No se encontró el identificador '{identifier}' en ninguna tabla de definiciones.")
-    return None
\ No newline at end of file
+    if use_cache:
+        with _cache_lock:
+            _series_cache[key] = {'frame': df, 'start_date': start_ts, 'fetched_at': time.monotonic()}
+    return df.copy()
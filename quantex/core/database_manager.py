@@ -1,7 +1,7 @@
 # quantex/core/database_manager.py
 
 import os
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 from datetime import datetime, timezone, timedelta
 import json
@@ -9,7 +9,9 @@ import uuid
 import pytz
 import numpy as np
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from quantex.core.ai_services import ai_services
+from quantex.core.supabase_pool import get_supabase_client
 
 # --- Conexión a Supabase ---p
 try:
@@ -18,7 +20,7 @@ try:
     
     supabase_url = os.environ.get("SUPABASE_URL")
     supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = get_supabase_client(supabase_url, supabase_key)
     print(f"Cliente de Supabase inicializado en database_manager.")
 except Exception as e:
     print(f"ERROR al inicializar el cliente de Supabase: {e}")
@@ -307,6 +309,27 @@ def upload_file_to_storage(bucket_name: str, destination_path: str, file_body: b
         print(f"❌ Error al subir el archivo '{destination_path}' a Supabase Storage: {e}")
         return None
     
+
+# Pool pequeño para subidas a Storage fuera del camino crítico (gráficos del comité, etc.)
+_storage_upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="storage_upload")
+
+def get_storage_public_url(bucket_name: str, destination_path: str) -> str | None:
+    """Devuelve la URL pública (determinística) de un objeto de Storage sin subir nada."""
+    if not supabase:
+        return None
+    try:
+        return supabase.storage.from_(bucket_name).get_public_url(destination_path)
+    except Exception as e:
+        print(f"❌ Error al construir la URL pública de '{destination_path}': {e}")
+        return None
+
+def upload_file_to_storage_in_background(bucket_name: str, destination_path: str, file_body: bytes):
+    """
+    Agenda la subida en segundo plano y devuelve inmediatamente (public_url, future).
+    El future resuelve al mismo valor que upload_file_to_storage (URL o None).
+    """
+    future = _storage_upload_executor.submit(upload_file_to_storage, bucket_name, destination_path, file_body)
+    return get_storage_public_url(bucket_name, destination_path), future
    
 def get_conversation_history(session_id: str, limit: int = 3) -> list:
     """
@@ -0,0 +1,145 @@
+# quantex/core/embedding_cache.py
+import os
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+DEFAULT_CACHE_PATH = os.path.join(PROJECT_ROOT, '.cache', 'embeddings.sqlite')
+
+# Argumentos de encode() que no alteran el vector resultante y, por lo tanto,
+# son compatibles con el caché. Cualquier otro argumento se delega sin cachear.
+_CACHE_SAFE_KWARGS = {'batch_size', 'show_progress_bar'}
+
+
+class CachedEmbeddingModel:
+    """
+    Envoltura de caché para un modelo de embeddings (SentenceTransformer).
+
+    Cada texto se identifica por sha256(model_name + texto). Hay dos niveles:
+      1. LRU en memoria (vectores float32 ya materializados).
+      2. SQLite en disco (blobs float32), persistente entre ejecuciones.
+    Solo los textos que fallan en ambos niveles llegan al modelo, en un único
+    batch. encode() devuelve siempre ndarrays, igual que SentenceTransformer.
+    """
+
+    def __init__(self, model, model_name: str, cache_path: str | None = DEFAULT_CACHE_PATH, max_memory_items: int = 20000):
+        self.model = model
+        self.model_name = model_name
+        self.max_memory_items = max_memory_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        if cache_path:
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+            except Exception as e:
+                print(f"    -> ⚠️ [EmbeddingCache] Caché en disco no disponible ({e}). Solo se usará memoria.")
+                self._conn = None
+
+    def __getattr__(self, name):
+        # Delegar cualquier otro atributo (get_sentence_embedding_dimension, etc.) al modelo real
+        return getattr(self.model, name)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode('utf-8')).hexdigest()
+
+    def _memory_get(self, key: str):
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: np.ndarray):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _disk_get_many(self, keys: list) -> dict:
+        if not self._conn or not keys:
+            return {}
+        found = {}
+        # SQLite limita el número de parámetros por sentencia
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            for key, dim, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        return found
+
+    def _disk_put_many(self, items: list):
+        if not self._conn or not items:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)",
+            [(key, int(vector.shape[0]), vector.tobytes()) for key, vector in items]
+        )
+        self._conn.commit()
+
+    def encode(self, inputs, **kwargs):
+        """Misma firma que SentenceTransformer.encode, con caché por texto."""
+        if set(kwargs) - _CACHE_SAFE_KWARGS:
+            return self.model.encode(inputs, **kwargs)
+
+        single = isinstance(inputs, str)
+        texts = [inputs] if single else list(inputs)
+        if not texts:
+            return self.model.encode(texts, **kwargs)
+
+        keys = [self._key(text) for text in texts]
+        vectors = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory_get(key)
+                if vector is not None:
+                    vectors[key] = vector
+            self.stats['memory_hits'] += len(vectors)
+
+            pending = [key for key in dict.fromkeys(keys) if key not in vectors]
+            try:
+                from_disk = self._disk_get_many(pending)
+            except Exception as e:
+                print(f"    -> ⚠️ [EmbeddingCache] Error leyendo caché en disco: {e}")
+                from_disk = {}
+            for key, vector in from_disk.items():
+                self._memory_put(key, vector)
+                vectors[key] = vector
+            self.stats['disk_hits'] += len(from_disk)
+
+        # Textos nuevos: un solo batch al modelo, fuera del lock
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key not in vectors and key not in missing:
+                missing[key] = text
+        if missing:
+            encoded = np.asarray(self.model.encode(list(missing.values()), **kwargs), dtype=np.float32)
+            new_items = list(zip(missing.keys(), encoded))
+            with self._lock:
+                self.stats['misses'] += len(new_items)
+                for key, vector in new_items:
+                    self._memory_put(key, vector)
+                    vectors[key] = vector
+                try:
+                    self._disk_put_many(new_items)
+                except Exception as e:
+                    print(f"    -> ⚠️ [EmbeddingCache] Error escribiendo caché en disco: {e}")
+
+        if single:
+            return vectors[keys[0]].copy()
+        return np.stack([vectors[key] for key in keys])
@@ -0,0 +1,68 @@
+# quantex/core/empresa_cache.py
+
+"""
+Resolución de empresas por rut_empresa con un caché en proceso.
+
+Lo comparten el agente modular (supabase.find_person) y EmailCampaignManager:
+en vez de una consulta a 'empresas' por cada persona (N+1), se piden todas las
+empresas de un lote con un solo in_('rut_empresa', ...) y se recuerdan durante
+EMPRESA_CACHE_TTL_SECONDS (también los RUTs sin empresa, para no repetirlos).
+"""
+
+import os
+import time
+import threading
+
+EMPRESA_CACHE_TTL_SECONDS = int(os.environ.get("QUANTEX_EMPRESA_CACHE_TTL", "600"))
+EMPRESA_COLUMNS = 'rut_empresa, razon_social, sitio_web, region'
+IN_CHUNK_SIZE = 500
+
+_cache_lock = threading.Lock()
+_empresa_cache = {}   # rut_empresa -> {'empresa': dict | None, 'fetched_at': float}
+_cache_stats = {'hits': 0, 'misses': 0, 'queries': 0}
+
+
+def get_empresas_by_rut(ruts, supabase=None) -> dict:
+    """
+    Devuelve {rut_empresa: fila de empresas} para los RUTs dados (los que no
+    existen en la tabla no aparecen). Solo consulta los RUTs que no están en caché.
+    """
+    if supabase is None:
+        from quantex.core.supabase_pool import get_supabase_client
+        supabase = get_supabase_client()
+
+    unique_ruts = list(dict.fromkeys(r for r in ruts if r))
+    found, missing = {}, []
+    now = time.monotonic()
+    with _cache_lock:
+        for rut in unique_ruts:
+            entry = _empresa_cache.get(rut)
+            if entry and now - entry['fetched_at'] < EMPRESA_CACHE_TTL_SECONDS:
+                _cache_stats['hits'] += 1
+                if entry['empresa'] is not None:
+                    found[rut] = entry['empresa']
+            else:
+                _cache_stats['misses'] += 1
+                missing.append(rut)
+
+    for i in range(0, len(missing), IN_CHUNK_SIZE):
+        chunk = missing[i:i + IN_CHUNK_SIZE]
+        response = supabase.table('empresas').select(EMPRESA_COLUMNS).in_('rut_empresa', chunk).execute()
+        rows = {row['rut_empresa']: row for row in (response.data or [])}
+        fetched_at = time.monotonic()
+        with _cache_lock:
+            _cache_stats['queries'] += 1
+            for rut in chunk:
+                _empresa_cache[rut] = {'empresa': rows.get(rut), 'fetched_at': fetched_at}
+        found.update(rows)
+    return found
+
+
+def get_empresa_cache_stats() -> dict:
+    with _cache_lock:
+        return {**_cache_stats, 'cached_ruts': len(_empresa_cache)}
+
+
+def clear_empresa_cache():
+    with _cache_lock:
+        _empresa_cache.clear()
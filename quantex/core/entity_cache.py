@@ -0,0 +1,131 @@
+# quantex/core/entity_cache.py
+"""
+Resolución masiva de nodos 'Entidad' (label -> id) con un caché LRU en proceso.
+
+Entidades frecuentes ("Fed", "cobre", "China") aparecen en casi todas las noticias;
+en vez de un upsert + select por etiqueta en cada ingesta, upsert_entities() responde
+desde el caché y solo hace UN upsert (que devuelve los ids) para las etiquetas nuevas.
+El caché se precarga con los 'Entidad' existentes la primera vez que se usa y es
+seguro entre hilos (workers de ingesta concurrentes).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+ENTITY_CACHE_MAX_SIZE = int(os.environ.get("QUANTEX_ENTITY_CACHE_SIZE", "50000"))
+ENTITY_CACHE_WARM = os.environ.get("QUANTEX_ENTITY_CACHE_WARM", "1").lower() not in ["0", "false", "no"]
+WARM_PAGE_SIZE = 1000
+UPSERT_CHUNK_SIZE = 500
+
+_cache_lock = threading.Lock()
+_warm_lock = threading.Lock()
+_entity_ids = OrderedDict()   # label -> id (orden LRU: el más reciente al final)
+_cache_stats = {'hits': 0, 'misses': 0, 'queries': 0, 'warmed': 0}
+_is_warm = False
+
+
+def _get_client(supabase):
+    if supabase is not None:
+        return supabase
+    from quantex.core.supabase_pool import get_supabase_client
+    return get_supabase_client()
+
+
+def _remember(rows: Dict[str, str]):
+    """Guarda label -> id en el caché (llamar con _cache_lock tomado)."""
+    for label, entity_id in rows.items():
+        _entity_ids[label] = entity_id
+        _entity_ids.move_to_end(label)
+    while len(_entity_ids) > ENTITY_CACHE_MAX_SIZE:
+        _entity_ids.popitem(last=False)
+
+
+def warm_entity_cache(supabase=None, force: bool = False) -> int:
+    """
+    Precarga el caché con los nodos 'Entidad' existentes (lectura paginada).
+    Solo se ejecuta una vez por proceso salvo force=True. Devuelve cuántas se cargaron.
+    """
+    global _is_warm
+    with _warm_lock:
+        if _is_warm and not force:
+            return 0
+        client = _get_client(supabase)
+        loaded, offset = 0, 0
+        try:
+            while True:
+                response = client.table('nodes').select('id, label').eq('type', 'Entidad') \
+                    .order('id').range(offset, offset + WARM_PAGE_SIZE - 1).execute()
+                data = response.data or []
+                with _cache_lock:
+                    _remember({row['label']: row['id'] for row in data if row.get('label')})
+                loaded += len(data)
+                if len(data) < WARM_PAGE_SIZE:
+                    break
+                offset += WARM_PAGE_SIZE
+        except Exception as e:
+            print(f"    -> ⚠️ [EntityCache] Error precargando entidades: {e}")
+        with _cache_lock:
+            _cache_stats['warmed'] = loaded
+        _is_warm = True
+        print(f"    -> 🏷️ [EntityCache] {loaded} entidades precargadas.")
+        return loaded
+
+
+def upsert_entities(labels: Iterable[str], supabase=None) -> Dict[str, str]:
+    """
+    Devuelve {label: id} para las etiquetas dadas, creando los 'Entidad' que falten.
+    Los aciertos de caché no tocan la base; los fallos se resuelven con un upsert
+    (on_conflict label,type) que devuelve los ids, en bloques de UPSERT_CHUNK_SIZE.
+    """
+    unique_labels = list(dict.fromkeys(label for label in labels if label))
+    if not unique_labels:
+        return {}
+    if ENTITY_CACHE_WARM and not _is_warm:
+        warm_entity_cache(supabase)
+
+    found, missing = {}, []
+    with _cache_lock:
+        for label in unique_labels:
+            entity_id = _entity_ids.get(label)
+            if entity_id is not None:
+                _entity_ids.move_to_end(label)
+                found[label] = entity_id
+            else:
+                missing.append(label)
+        _cache_stats['hits'] += len(found)
+        _cache_stats['misses'] += len(missing)
+
+    if missing:
+        client = _get_client(supabase)
+        for i in range(0, len(missing), UPSERT_CHUNK_SIZE):
+            chunk = missing[i:i + UPSERT_CHUNK_SIZE]
+            response = client.table('nodes').upsert(
+                [{"type": "Entidad", "label": label} for label in chunk], on_conflict='label,type'
+            ).execute()
+            rows = {row['label']: row['id'] for row in (response.data or []) if row.get('label') in chunk}
+            with _cache_lock:
+                _cache_stats['queries'] += 1
+                _remember(rows)
+            found.update(rows)
+    return found
+
+
+def forget_entities(labels: Iterable[str]):
+    """Saca etiquetas del caché (p. ej. si se borran o fusionan nodos 'Entidad')."""
+    with _cache_lock:
+        for label in labels:
+            _entity_ids.pop(label, None)
+
+
+def get_entity_cache_stats() -> dict:
+    with _cache_lock:
+        return {**_cache_stats, 'cached_labels': len(_entity_ids), 'max_size': ENTITY_CACHE_MAX_SIZE}
+
+
+def clear_entity_cache():
+    global _is_warm
+    with _cache_lock:
+        _entity_ids.clear()
+        _is_warm = False
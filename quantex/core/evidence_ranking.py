@@ -0,0 +1,111 @@
+# quantex/core/evidence_ranking.py
+"""
+Ranking de evidencia por similitud coseno, en lote.
+
+rank_evidence() codifica todas las consultas (temas del plan, conclusión) en una
+sola llamada a encode(), las compara contra la matriz normalizada del pool de
+evidencia con un único producto matricial y elige el top-k con argpartition.
+La matriz de cada pool se guarda en un LRU en proceso (clave = hash del contenido),
+así las preguntas de seguimiento sobre el mismo informe no vuelven a codificarla.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Sequence
+
+import numpy as np
+
+EVIDENCE_CACHE_MAX_POOLS = int(os.environ.get("QUANTEX_EVIDENCE_CACHE_SIZE", "32"))
+
+_cache_lock = threading.Lock()
+_evidence_matrices = OrderedDict()   # hash del pool -> matriz (n, d) float32 normalizada
+_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _get_model(model):
+    if model is not None:
+        return model
+    from quantex.core.ai_services import ai_services
+    return ai_services.embedding_model
+
+
+def _normalize(vectors) -> np.ndarray:
+    """Filas de norma 1 (las filas cero quedan en cero: similitud 0)."""
+    matrix = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+def _pool_key(evidence_pool: Sequence[str], model) -> str:
+    digest = hashlib.sha256(str(getattr(model, 'model_name', type(model).__name__)).encode('utf-8'))
+    for text in evidence_pool:
+        digest.update(b'\x00' + str(text).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get_evidence_matrix(evidence_pool: Sequence[str], model=None) -> np.ndarray:
+    """Matriz normalizada del pool, codificada una sola vez por contenido de dossier."""
+    model = _get_model(model)
+    key = _pool_key(evidence_pool, model)
+    with _cache_lock:
+        matrix = _evidence_matrices.get(key)
+        if matrix is not None:
+            _evidence_matrices.move_to_end(key)
+            _cache_stats['hits'] += 1
+            return matrix
+
+    matrix = _normalize(model.encode(list(evidence_pool)))
+    with _cache_lock:
+        _cache_stats['misses'] += 1
+        _evidence_matrices[key] = matrix
+        while len(_evidence_matrices) > EVIDENCE_CACHE_MAX_POOLS:
+            _evidence_matrices.popitem(last=False)
+    return matrix
+
+
+def top_k_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+    """
+    Índices de los k valores más altos por fila, de mayor a menor.
+    Empates: gana el índice menor (igual que sorted(..., reverse=True) sobre el pool).
+    """
+    n = similarities.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty((similarities.shape[0], 0), dtype=np.int64)
+    if k == n:
+        return np.lexsort((np.broadcast_to(np.arange(n), similarities.shape), -similarities), axis=1)
+    # Valor k-ésimo por fila; entran todos los empatados con él para que el corte sea estable
+    kth_values = -np.partition(-similarities, k - 1, axis=1)[:, k - 1]
+    rows = []
+    for row, kth in zip(similarities, kth_values):
+        candidates = np.flatnonzero(row >= kth)
+        # Orden por similitud descendente y luego por índice ascendente
+        order = np.lexsort((candidates, -row[candidates]))[:k]
+        rows.append(candidates[order])
+    return np.array(rows, dtype=np.int64).reshape(len(rows), k)
+
+
+def rank_evidence(queries: Sequence[str], evidence_pool: Sequence[str], top_k: int, model=None) -> List[List[str]]:
+    """
+    Para cada consulta, las top_k evidencias más similares del pool (similitud coseno).
+    """
+    if not queries or not evidence_pool:
+        return [[] for _ in queries]
+    model = _get_model(model)
+    evidence_matrix = get_evidence_matrix(evidence_pool, model)
+    query_matrix = _normalize(model.encode(list(queries)))
+    similarities = query_matrix @ evidence_matrix.T
+    return [[evidence_pool[i] for i in row] for row in top_k_indices(similarities, top_k)]
+
+
+def get_evidence_cache_stats() -> dict:
+    with _cache_lock:
+        return {**_cache_stats, 'pools': len(_evidence_matrices)}
+
+
+def clear_evidence_cache():
+    with _cache_lock:
+        _evidence_matrices.clear()
+        _cache_stats.update(hits=0, misses=0)
@@ -1,13 +1,13 @@
 # quantex/core/interactive_tools.py
 import traceback
 from flask import jsonify
-from scipy.spatial.distance import cosine
 import json
 
 # Importamos los módulos centrales de Quantex
 from quantex.core import database_manager as db
 from quantex.core.ai_services import ai_services
 from quantex.core.agent_tools import get_file_content
+from quantex.core.evidence_ranking import rank_evidence
 from quantex.core import llm_manager
 from quantex.core.llm_manager import MODEL_CONFIG
 
@@ -90,16 +90,12 @@ def _execute_research_plan(plan: list, dossier_content: dict) -> str:
     if not evidence_pool:
         return "No se encontró evidencia cualitativa ni razonamientos en el dossier."
 
-    # 3. Vectorizar y ejecutar plan
-    evidence_vectors = ai_services.embedding_model.encode(evidence_pool)
+    # 3. Vectorizar y ejecutar plan: todos los temas en un solo encode y un solo producto matricial
+    # (la matriz del pool queda en caché para las preguntas siguientes sobre el mismo informe)
+    top_evidence_by_topic = rank_evidence(plan, evidence_pool, top_k=2, model=ai_services.embedding_model)
     mini_dossier = ""
-    for i, topic_to_research in enumerate(plan):
+    for topic_to_research, top_evidence_for_topic in zip(plan, top_evidence_by_topic):
         print(f"    -> Buscando evidencia para: '{topic_to_research[:60]}...'")
-        topic_vector = ai_services.embedding_model.encode(topic_to_research)
-        
-        similarities = [1 - cosine(topic_vector, ev_vec) for ev_vec in evidence_vectors]
-        ranked_evidence = sorted(zip(evidence_pool, similarities), key=lambda item: item[1], reverse=True)
-        top_evidence_for_topic = [item[0] for item in ranked_evidence[:2]]
         
         mini_dossier += f"\n--- Evidencia y Razonamientos sobre '{topic_to_research}' ---\n"
         mini_dossier += "\n- ".join(top_evidence_for_topic)
@@ -222,12 +218,7 @@ def get_evidence_for_conclusion(parameters: dict) -> dict:
              return jsonify({"error": "No se encontró contexto cualitativo en el dossier de origen."})
 
         print(f"  -> Buscando evidencia para: '{conclusion_text[:50]}...'")
-        conclusion_vector = ai_services.embedding_model.encode(conclusion_text)
-        evidence_vectors = ai_services.embedding_model.encode(evidence_pool)
-
-        similarities = [1 - cosine(conclusion_vector, ev_vec) for ev_vec in evidence_vectors]
-        ranked_evidence = sorted(zip(evidence_pool, similarities), key=lambda item: item[1], reverse=True)
-        top_evidence = [item[0] for item in ranked_evidence[:3]]
+        top_evidence = rank_evidence([conclusion_text], evidence_pool, top_k=3, model=ai_services.embedding_model)[0]
 
         print("  -> ✅ Evidencia encontrada y clasificada.")
 
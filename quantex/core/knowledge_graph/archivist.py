@@ -4,7 +4,7 @@ Crea conexiones semánticas automáticas entre nodos del grafo de conocimiento
 """
 
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from quantex.core import llm_manager
 from quantex.core import database_manager as db
 from quantex.core.ai_services import ai_services
@@ -21,13 +21,15 @@ class IntelligentArchivist:
         self.db = db
         # ai_services es un módulo, no una instancia
     
-    def analyze_semantic_connections(self, new_node_id: str, new_node_content: str) -> Dict[str, Any]:
+    def analyze_semantic_connections(self, new_node_id: str, new_node_content: str,
+                                     query_vector: Optional[List[float]] = None) -> Dict[str, Any]:
         """
         Analiza y crea conexiones semánticas para un nuevo nodo
         
         Args:
             new_node_id: ID del nodo nuevo
             new_node_content: Contenido del nodo nuevo
+            query_vector: Embedding ya calculado del contenido (evita re-codificarlo)
             
         Returns:
             Dict con estadísticas de conexiones creadas
@@ -40,7 +42,7 @@ class IntelligentArchivist:
         
         try:
             # ETAPA 1: Búsqueda semántica
-            relevant_node_ids = self._find_semantically_similar_nodes(new_node_content)
+            relevant_node_ids = self._find_semantically_similar_nodes(new_node_content, query_vector)
             
             if not relevant_node_ids:
                 print("    -> No se encontraron nodos semánticamente similares para conectar.")
@@ -66,11 +68,11 @@ class IntelligentArchivist:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
     
-    def _find_semantically_similar_nodes(self, content: str) -> List[str]:
+    def _find_semantically_similar_nodes(self, content: str, query_vector: Optional[List[float]] = None) -> List[str]:
         """Encuentra nodos semánticamente similares usando Pinecone"""
         try:
             # Usar ai_services directamente como módulo (igual que en ingestion_engine.py)
-            query_embedding = ai_services.embedding_model.encode(content).tolist()
+            query_embedding = query_vector if query_vector is not None else ai_services.embedding_model.encode(content).tolist()
             search_results = ai_services.pinecone_index.query(
                 vector=query_embedding, 
                 top_k=6, 
@@ -135,20 +137,19 @@ class IntelligentArchivist:
             return self._analyze_connections_individual(new_node_id, new_node_content, relevant_node_ids)
     
     def _get_existing_nodes_content(self, node_ids: List[str]) -> List[Dict[str, str]]:
-        """Obtiene el contenido de los nodos existentes"""
-        existing_nodes_data = []
-        for existing_node_id in node_ids:
-            try:
-                response = self.db.supabase.table('nodes').select('id, label').eq('id', existing_node_id).execute()
-                if response.data and len(response.data) > 0 and response.data[0].get('label'):
-                    existing_nodes_data.append({
-                        'id': existing_node_id,
-                        'content': response.data[0]['label']
-                    })
-            except Exception as e:
-                print(f"    -> ⚠️ Error obteniendo nodo {existing_node_id[:8]}: {e}")
-                continue
-        return existing_nodes_data
+        """Obtiene el contenido de los nodos existentes (una sola consulta, en el orden de node_ids)"""
+        if not node_ids:
+            return []
+        try:
+            response = self.db.supabase.table('nodes').select('id, label').in_('id', node_ids).execute()
+        except Exception as e:
+            print(f"    -> ⚠️ Error obteniendo nodos relacionados: {e}")
+            return []
+        labels = {row['id']: row.get('label') for row in (response.data or [])}
+        return [
+            {'id': node_id, 'content': labels[node_id]}
+            for node_id in node_ids if labels.get(node_id)
+        ]
     
     def _create_batch_prompt(self, new_node_content: str, existing_nodes_data: List[Dict[str, str]]) -> str:
         """Crea el prompt batch optimizado"""
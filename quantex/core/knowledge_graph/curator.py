@@ -6,6 +6,7 @@ Mantiene la calidad y limpieza del grafo de conocimiento
 from typing import List, Dict, Any
 from quantex.core import database_manager as db
 from quantex.core import llm_manager
+from quantex.core.autoconocimiento.graph_stats import get_graph_stats
 
 
 class KnowledgeGraphCurator:
@@ -37,23 +38,10 @@ class KnowledgeGraphCurator:
         """Recupera nodos que no tienen ninguna conexión entrante o saliente."""
         print("  -> 🔎 Buscando nodos 'huérfanos' sin conexiones...")
         try:
-            source_ids_res = self.db.supabase.table('edges').select('source_id').execute()
-            target_ids_res = self.db.supabase.table('edges').select('target_id').execute()
-            
-            connected_ids = set()
-            if source_ids_res.data:
-                connected_ids.update([edge['source_id'] for edge in source_ids_res.data])
-            if target_ids_res.data:
-                connected_ids.update([edge['target_id'] for edge in target_ids_res.data])
-            
-            all_nodes_res = self.db.supabase.table('nodes').select('id, label').execute()
-            if not all_nodes_res.data:
-                return []
-            
+            # Anti-join en el servidor (RPC graph_orphan_nodes): solo viajan los huérfanos
             orphan_nodes = [
-                {'id': node['id'], 'node_name': node['label']} 
-                for node in all_nodes_res.data 
-                if node['id'] not in connected_ids
+                {'id': node['id'], 'node_name': node['label']}
+                for node in get_graph_stats().orphan_nodes()
             ]
             
             print(f"    -> ✅ Se encontraron {len(orphan_nodes)} nodos huérfanos.")
@@ -67,6 +67,34 @@ class EdgeManager:
         
         return edges_created
         
+    def create_document_entity_edges_bulk(self, entity_ids_by_document: Dict[str, List[str]]) -> int:
+        """
+        Create the "menciona" edges of several documents in a single upsert.
+        
+        Args:
+            entity_ids_by_document: Dict {document_id: [entity_id, ...]}
+            
+        Returns:
+            Number of edges created
+        """
+        edges = [
+            {"source_id": document_id, "target_id": entity_id, "relationship_type": "menciona"}
+            for document_id, entity_ids in entity_ids_by_document.items()
+            for entity_id in dict.fromkeys(entity_ids)
+            if entity_id
+        ]
+        if not edges:
+            return 0
+        
+        try:
+            db.supabase.table('edges').upsert(edges).execute()
+        except Exception as e:
+            print(f"    -> ❌ Error creando edges: {e}")
+            return 0
+        
+        print(f"    -> 🔗 {len(edges)} conexiones con entidades creadas.")
+        return len(edges)
+        
     def get_node_edges(self, node_id: str) -> List[Dict[str, Any]]:
         """
         Get all edges connected to a node.
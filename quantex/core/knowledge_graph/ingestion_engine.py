@@ -7,16 +7,25 @@ Main entry point for all knowledge graph ingestion operations
 import uuid
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
+import numpy as np
+
 from quantex.core.ai_services import ai_services
 from .node_manager import NodeManager
 from .edge_manager import EdgeManager
 from .metadata_manager import MetadataManager
 from .ai_processors import AIMetadataProcessor
 from .archivist import IntelligentArchivist
+from quantex.core.entity_cache import warm_entity_cache, ENTITY_CACHE_WARM
+from quantex.core import database_manager as db
 
+# Batched ingestion (default). QUANTEX_KG_BATCHED_INGESTION=0 restores the node-by-node pipeline.
+BATCHED_INGESTION = os.environ.get("QUANTEX_KG_BATCHED_INGESTION", "1").lower() not in ["0", "false", "no"]
+ARCHIVIST_MAX_WORKERS = int(os.environ.get("QUANTEX_ARCHIVIST_MAX_WORKERS", "4"))
+PINECONE_UPSERT_BATCH_SIZE = 100
 
 class KnowledgeGraphIngestionEngine:
     """
@@ -24,12 +33,15 @@ class KnowledgeGraphIngestionEngine:
     Provides unified interface for all ingestion operations.
     """
     
-    def __init__(self):
+    def __init__(self, batched: Optional[bool] = None):
+        self.batched = BATCHED_INGESTION if batched is None else batched
         self.node_manager = NodeManager()
         self.edge_manager = EdgeManager()
         self.metadata_manager = MetadataManager()
         self.ai_processor = AIMetadataProcessor()
         self.archivist = IntelligentArchivist()
+        if ENTITY_CACHE_WARM:
+            warm_entity_cache(db.supabase)
         
     def ingest_document(self, raw_text: str, source_context: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -83,111 +95,10 @@ class KnowledgeGraphIngestionEngine:
 
             print(f"  -> 💾 Procesando y guardando {len(atomic_nodes)} nodo(s) y sus conexiones...")
             
-            created_nodes = []
-            
-            for node_obj in atomic_nodes:
-                node_content = node_obj.get("content")
-                if not node_content: 
-                    continue
-
-                # Step 2: Process metadata
-                document_metadata = self.metadata_manager.process_document_metadata(
-                    node_content, source_context, node_obj
-                )
-
-                # Step 3: Create document node in Supabase
-                document_node_id = self.node_manager.create_document_node(node_content, document_metadata)
-
-                # Step 4: Store in Pinecone (optional)
-                if index_to_pinecone and ai_services.pinecone_index is not None:
-                    print(f"  -> 🌲 [PINEONE] Indexando nodo en Pinecone...")
-                    encoded = ai_services.embedding_model.encode(node_content)
-                    # Aceptar ndarray o list
-                    try:
-                        vector = encoded.tolist() if hasattr(encoded, "tolist") else (encoded if isinstance(encoded, list) else [float(x) for x in encoded])
-                    except Exception:
-                        # Fallback defensivo a lista plana
-                        import numpy as np
-                        vector = np.array(encoded, dtype=float).flatten().tolist()
-                    
-                    # Obtener timestamp del contexto o usar timestamp actual
-                    timestamp_iso = source_context.get("timestamp") or datetime.now(timezone.utc).isoformat()
-                    created_at_iso = datetime.now(timezone.utc).isoformat()
-                    
-                    # Convertir timestamps a Unix para Pinecone
-                    try:
-                        if isinstance(timestamp_iso, str):
-                            dt = datetime.fromisoformat(timestamp_iso.replace('Z', '+00:00'))
-                            timestamp_unix = int(dt.timestamp())
-                        else:
-                            timestamp_unix = timestamp_iso
-                    except:
-                        timestamp_unix = int(datetime.now(timezone.utc).timestamp())
-                    
-                    try:
-                        dt = datetime.fromisoformat(created_at_iso.replace('Z', '+00:00'))
-                        created_at_unix = int(dt.timestamp())
-                    except:
-                        created_at_unix = int(datetime.now(timezone.utc).timestamp())
-                    
-                    metadata_for_pinecone = {
-                        "source": source_context.get("source", ""),
-                        "source_type": source_context.get("source_type", ""),
-                        "topic": source_context.get("topic", ""),
-                        "original_url": source_context.get("original_url", ""),
-                        "categories": node_obj.get("categories", []),
-                        "key_entities": node_obj.get("key_entities", []),
-                        "text_snippet": node_content[:500],
-                        "timestamp": timestamp_unix,
-                        "created_at": created_at_unix,
-                        "timestamp_iso": timestamp_iso,
-                        "created_at_iso": created_at_iso,
-                        "node_type": "Documento"
-                    }
-                    ai_services.pinecone_index.upsert(vectors=[{
-                        "id": document_node_id, "values": vector, "metadata": metadata_for_pinecone
-                    }])
-                    print(f"    -> 🌲 Nodo indexado en Pinecone.")
-                else:
-                    print("    -> ⏭️  Vectorización desactivada para este nodo (no indexado en Pinecone).")
-
-                # Step 5: Create entity nodes and connections
-                entities = node_obj.get("key_entities", [])
-                entity_ids = []
-                
-                if entities:
-                    for entity_name in entities:
-                        entity_id = self.node_manager.create_entity_node(entity_name)
-                        if entity_id:
-                            entity_ids.append(entity_id)
-
-                # Step 6: Create document-entity edges
-                if entity_ids:
-                    self.edge_manager.create_document_entity_edges(document_node_id, entity_ids)
-
-                # Step 7: Run Archivista Inteligente for semantic connections
-                if index_to_pinecone and ai_services.pinecone_index is not None:
-                    print(f"    -> 🤖 [Archivista] Analizando conexiones semánticas...")
-                    try:
-                        archivist_result = self.archivist.analyze_semantic_connections(
-                            new_node_id=document_node_id,
-                            new_node_content=node_content
-                        )
-                        if archivist_result.get("success"):
-                            print(f"    -> ✅ [Archivista] {archivist_result.get('connections_created', 0)} conexiones semánticas creadas.")
-                        else:
-                            print(f"    -> ⚠️  [Archivista] {archivist_result.get('reason', 'Error desconocido')}")
-                    except Exception as e:
-                        print(f"    -> ⚠️  [Archivista] Error en conexiones semánticas: {e}")
-
-                created_nodes.append({
-                    "node_id": document_node_id,
-                    "type": "Documento",
-                    "entities": entity_ids
-                })
-
-                # Small delay like in original
-                time.sleep(1)
+            if self.batched:
+                created_nodes = self._ingest_nodes_batched(atomic_nodes, source_context, index_to_pinecone)
+            else:
+                created_nodes = self._ingest_nodes_sequential(atomic_nodes, source_context, index_to_pinecone)
 
             return {
                 "success": True,
@@ -201,6 +112,181 @@ class KnowledgeGraphIngestionEngine:
             traceback.print_exc()
             return {"success": False, "error": str(e)}
         
+    def _ingest_nodes_batched(self, atomic_nodes: List[Dict[str, Any]], source_context: Dict[str, Any],
+                              index_to_pinecone: bool) -> List[Dict[str, Any]]:
+        """
+        Batched pipeline: one insert for all document nodes, one embedding batch,
+        one Pinecone upsert, one entity upsert, one edge upsert, and the archivist
+        running concurrently for every node.
+        """
+        nodes = [node_obj for node_obj in atomic_nodes if node_obj.get("content")]
+        if not nodes:
+            return []
+
+        # Steps 2-3: Metadata and document nodes (single insert)
+        documents = [{
+            "content": node_obj["content"],
+            "metadata": self.metadata_manager.process_document_metadata(node_obj["content"], source_context, node_obj)
+        } for node_obj in nodes]
+        document_node_ids = self.node_manager.create_document_nodes(documents)
+
+        # Step 4: Embeddings in one encode batch and a bulk Pinecone upsert
+        vectors = [None] * len(nodes)
+        vectorize = index_to_pinecone and ai_services.pinecone_index is not None
+        if vectorize:
+            print(f"  -> 🌲 [PINECONE] Indexando {len(nodes)} nodo(s) en Pinecone...")
+            encoded = np.asarray(ai_services.embedding_model.encode([node_obj["content"] for node_obj in nodes]), dtype=float)
+            vectors = encoded.reshape(len(nodes), -1).tolist()
+            pinecone_vectors = [
+                {"id": node_id, "values": vector, "metadata": self._build_pinecone_metadata(node_obj, source_context)}
+                for node_id, vector, node_obj in zip(document_node_ids, vectors, nodes)
+            ]
+            for i in range(0, len(pinecone_vectors), PINECONE_UPSERT_BATCH_SIZE):
+                ai_services.pinecone_index.upsert(vectors=pinecone_vectors[i:i + PINECONE_UPSERT_BATCH_SIZE])
+            print(f"    -> 🌲 {len(pinecone_vectors)} nodo(s) indexados en Pinecone.")
+        else:
+            print("    -> ⏭️  Vectorización desactivada para estos nodos (no indexados en Pinecone).")
+
+        # Steps 5-6: All entity labels in one upsert, all document-entity edges in one upsert
+        entity_ids_by_label = self.node_manager.create_entity_nodes(
+            [entity_name for node_obj in nodes for entity_name in node_obj.get("key_entities", [])]
+        )
+        entity_ids_by_document = {
+            node_id: [entity_ids_by_label[name] for name in node_obj.get("key_entities", []) if name in entity_ids_by_label]
+            for node_id, node_obj in zip(document_node_ids, nodes)
+        }
+        self.edge_manager.create_document_entity_edges_bulk(entity_ids_by_document)
+
+        # Step 7: Archivista for all nodes through a bounded worker pool
+        if vectorize:
+            print(f"    -> 🤖 [Archivista] Analizando conexiones semánticas de {len(nodes)} nodo(s) en paralelo...")
+            with ThreadPoolExecutor(max_workers=min(ARCHIVIST_MAX_WORKERS, len(nodes))) as executor:
+                futures = [
+                    executor.submit(self._run_archivist, node_id, node_obj["content"], vector)
+                    for node_id, node_obj, vector in zip(document_node_ids, nodes, vectors)
+                ]
+                wait(futures)
+
+        return [{
+            "node_id": node_id,
+            "type": "Documento",
+            "entities": entity_ids_by_document[node_id]
+        } for node_id in document_node_ids]
+
+    def _ingest_nodes_sequential(self, atomic_nodes: List[Dict[str, Any]], source_context: Dict[str, Any],
+                                 index_to_pinecone: bool) -> List[Dict[str, Any]]:
+        """Original node-by-node pipeline (QUANTEX_KG_BATCHED_INGESTION=0)."""
+        created_nodes = []
+        
+        for node_obj in atomic_nodes:
+            node_content = node_obj.get("content")
+            if not node_content: 
+                continue
+
+            # Step 2: Process metadata
+            document_metadata = self.metadata_manager.process_document_metadata(
+                node_content, source_context, node_obj
+            )
+
+            # Step 3: Create document node in Supabase
+            document_node_id = self.node_manager.create_document_node(node_content, document_metadata)
+
+            # Step 4: Store in Pinecone (optional)
+            vector = None
+            if index_to_pinecone and ai_services.pinecone_index is not None:
+                print(f"  -> 🌲 [PINEONE] Indexando nodo en Pinecone...")
+                vector = np.asarray(ai_services.embedding_model.encode(node_content), dtype=float).flatten().tolist()
+                ai_services.pinecone_index.upsert(vectors=[{
+                    "id": document_node_id, "values": vector,
+                    "metadata": self._build_pinecone_metadata(node_obj, source_context)
+                }])
+                print(f"    -> 🌲 Nodo indexado en Pinecone.")
+            else:
+                print("    -> ⏭️  Vectorización desactivada para este nodo (no indexado en Pinecone).")
+
+            # Step 5: Create entity nodes and connections
+            entities = node_obj.get("key_entities", [])
+            entity_ids = []
+            
+            if entities:
+                for entity_name in entities:
+                    entity_id = self.node_manager.create_entity_node(entity_name)
+                    if entity_id:
+                        entity_ids.append(entity_id)
+
+            # Step 6: Create document-entity edges
+            if entity_ids:
+                self.edge_manager.create_document_entity_edges(document_node_id, entity_ids)
+
+            # Step 7: Run Archivista Inteligente for semantic connections
+            if vector is not None:
+                self._run_archivist(document_node_id, node_content)
+
+            created_nodes.append({
+                "node_id": document_node_id,
+                "type": "Documento",
+                "entities": entity_ids
+            })
+
+            # Small delay like in original
+            time.sleep(1)
+
+        return created_nodes
+
+    def _run_archivist(self, node_id: str, node_content: str, vector: Optional[List[float]] = None):
+        """Archivista Inteligente for one node; errors are logged, never raised."""
+        print(f"    -> 🤖 [Archivista] Analizando conexiones semánticas ({node_id[:8]})...")
+        try:
+            archivist_result = self.archivist.analyze_semantic_connections(
+                new_node_id=node_id,
+                new_node_content=node_content,
+                query_vector=vector
+            )
+            if archivist_result.get("success"):
+                print(f"    -> ✅ [Archivista] {archivist_result.get('connections_created', 0)} conexiones semánticas creadas ({node_id[:8]}).")
+            else:
+                print(f"    -> ⚠️  [Archivista] {archivist_result.get('reason', 'Error desconocido')}")
+        except Exception as e:
+            print(f"    -> ⚠️  [Archivista] Error en conexiones semánticas: {e}")
+
+    @staticmethod
+    def _build_pinecone_metadata(node_obj: Dict[str, Any], source_context: Dict[str, Any]) -> Dict[str, Any]:
+        """Pinecone metadata for a document node (timestamps in Unix and ISO)."""
+        # Obtener timestamp del contexto o usar timestamp actual
+        timestamp_iso = source_context.get("timestamp") or datetime.now(timezone.utc).isoformat()
+        created_at_iso = datetime.now(timezone.utc).isoformat()
+        
+        # Convertir timestamps a Unix para Pinecone
+        try:
+            if isinstance(timestamp_iso, str):
+                dt = datetime.fromisoformat(timestamp_iso.replace('Z', '+00:00'))
+                timestamp_unix = int(dt.timestamp())
+            else:
+                timestamp_unix = timestamp_iso
+        except:
+            timestamp_unix = int(datetime.now(timezone.utc).timestamp())
+        
+        try:
+            dt = datetime.fromisoformat(created_at_iso.replace('Z', '+00:00'))
+            created_at_unix = int(dt.timestamp())
+        except:
+            created_at_unix = int(datetime.now(timezone.utc).timestamp())
+        
+        return {
+            "source": source_context.get("source", ""),
+            "source_type": source_context.get("source_type", ""),
+            "topic": source_context.get("topic", ""),
+            "original_url": source_context.get("original_url", ""),
+            "categories": node_obj.get("categories", []),
+            "key_entities": node_obj.get("key_entities", []),
+            "text_snippet": node_obj.get("content", "")[:500],
+            "timestamp": timestamp_unix,
+            "created_at": created_at_unix,
+            "timestamp_iso": timestamp_iso,
+            "created_at_iso": created_at_iso,
+            "node_type": "Documento"
+        }
+        
     def ingest_learning(self, topic: str, learnings: List[str]) -> Dict[str, Any]:
         """
         Ingest learning nodes into the knowledge graph.
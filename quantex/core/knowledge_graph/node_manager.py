@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional
 
 from quantex.core import database_manager as db
+from quantex.core.entity_cache import upsert_entities
 
 
 class NodeManager:
@@ -44,6 +45,35 @@ class NodeManager:
         print(f"    -> ✅ Nodo 'Documento' creado con ID: {document_node_id[:8]}...")
         return document_node_id
         
+    def create_document_nodes(self, documents: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create several document nodes with a single insert.
+        Same row structure as create_document_node().
+        
+        Args:
+            documents: List of {"content": str, "metadata": dict}
+            
+        Returns:
+            Node IDs in the same order as documents
+        """
+        rows = []
+        for document in documents:
+            document_node_id = str(uuid.uuid4())
+            document_title = document["metadata"].get('ai_summary', 'Documento sin título')
+            rows.append({
+                "id": document_node_id,
+                "type": "Documento",
+                "label": f"{document_title} - {document_node_id[:8]}",
+                "content": document["content"],
+                "properties": document["metadata"]
+            })
+        if not rows:
+            return []
+        
+        db.supabase.table('nodes').insert(rows).execute()
+        print(f"    -> ✅ {len(rows)} nodo(s) 'Documento' creados en un solo insert.")
+        return [row["id"] for row in rows]
+        
     def create_entity_node(self, entity_name: str) -> str:
         """
         Create an entity node in the knowledge graph.
@@ -55,16 +85,21 @@ class NodeManager:
         Returns:
             Node ID of created entity
         """
-        # Upsert entity nodes - EXACT SAME STRUCTURE as current system
-        entity_nodes_to_upsert = [{"type": "Entidad", "label": entity_name}]
-        db.supabase.table('nodes').upsert(entity_nodes_to_upsert, on_conflict='label,type').execute()
+        return self.create_entity_nodes([entity_name]).get(entity_name)
         
-        # Get the entity node ID
-        entity_nodes_in_db = db.supabase.table('nodes').select('id, label').eq('type', 'Entidad').eq('label', entity_name).execute().data
-        if entity_nodes_in_db:
-            return entity_nodes_in_db[0]['id']
+    def create_entity_nodes(self, entity_names: List[str]) -> Dict[str, str]:
+        """
+        Resolve several entity nodes to their IDs, creating the missing ones.
+        Backed by the label->id LRU cache (entity_cache): cached labels need no
+        query, the rest are created/resolved with a single upsert.
         
-        return None
+        Args:
+            entity_names: Entity labels (duplicates and empty names are ignored)
+            
+        Returns:
+            Dict {label: node_id}
+        """
+        return upsert_entities(entity_names, db.supabase)
         
     def create_learning_node(self, learning_text: str, topic: str) -> str:
         """
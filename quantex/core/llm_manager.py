@@ -3,6 +3,10 @@ import io
 import json
 import base64
 import re
+import asyncio
+import atexit
+import functools
+import threading
 import PIL
 from dotenv import load_dotenv
 import google.generativeai as genai
@@ -125,41 +129,17 @@ def generate_completion(
         client_info = CLIENTS[model_name]
         client = client_info['client']
         api_provider = client_info['name']
-
-        api_params = {
-            "model": model_name,
-            "max_tokens": model_config.get('max_tokens', 4096),
-            "temperature": model_config.get('temperature', 0.5),
-            "messages": [{"role": "user", "content": user_prompt}]
-        }
-        if system_prompt:
-            api_params["system"] = system_prompt
-        
-        # Lógica para el modo de herramientas (solo para Anthropic por ahora)
-        if tools and api_provider == "Anthropic":
-            api_params["tools"] = tools
-            api_params["tool_choice"] = {"type": "any"}
-            print(f"-> Llamando a {api_provider} ({model_name}) en MODO HERRAMIENTA...")
-        else:
-            print(f"-> Llamando a {api_provider} ({model_name}) en MODO TEXTO...")
+        api_params = _build_completion_params(model_name, model_config, system_prompt, user_prompt, tools, api_provider)
 
         try:
             # --- INTENTO DE LLAMADA A LA API ---
             if api_provider == "Anthropic":
-                response = client.messages.create(**api_params)
-                if response.stop_reason == "tool_use":
-                    tool_call = next((block for block in response.content if block.type == 'tool_use'), None)
-                    if tool_call:
-                        print(f"   -> ✅ Herramienta seleccionada por la IA: '{tool_call.name}'")
-                        return {"tool_name": tool_call.name, "tool_input": tool_call.input}
-                else:
-                    raw_text = response.content[0].text
-                    return {"raw_text": raw_text}
+                result = _parse_anthropic_completion(client.messages.create(**api_params))
+                if result:
+                    return result
             
             elif api_provider == "Google":
-                # La API de Gemini no usa 'system' prompt, lo añadimos al contenido
-                full_prompt = f"{system_prompt}\n\n{user_prompt}" if system_prompt else user_prompt
-                response = client.generate_content(full_prompt)
+                response = client.generate_content(_gemini_text_prompt(system_prompt, user_prompt))
                 return {"raw_text": response.text}
 
         except Exception as e:
@@ -171,6 +151,43 @@ def generate_completion(
     # Si salimos del bucle sin éxito, es que todos los modelos fallaron.
     return {"error": f"Fallo en la llamada a todos los modelos de IA configurados."}
 
+
+def _build_completion_params(model_name, model_config, system_prompt, user_prompt, tools, api_provider) -> dict:
+    """Parámetros de la llamada de texto/herramientas (compartidos por la ruta síncrona y la asíncrona)."""
+    api_params = {
+        "model": model_name,
+        "max_tokens": model_config.get('max_tokens', 4096),
+        "temperature": model_config.get('temperature', 0.5),
+        "messages": [{"role": "user", "content": user_prompt}]
+    }
+    if system_prompt:
+        api_params["system"] = system_prompt
+    
+    # Lógica para el modo de herramientas (solo para Anthropic por ahora)
+    if tools and api_provider == "Anthropic":
+        api_params["tools"] = tools
+        api_params["tool_choice"] = {"type": "any"}
+        print(f"-> Llamando a {api_provider} ({model_name}) en MODO HERRAMIENTA...")
+    else:
+        print(f"-> Llamando a {api_provider} ({model_name}) en MODO TEXTO...")
+    return api_params
+
+
+def _parse_anthropic_completion(response) -> dict | None:
+    """Convierte la respuesta de Anthropic al dict de generate_completion (None si no es utilizable)."""
+    if response.stop_reason == "tool_use":
+        tool_call = next((block for block in response.content if block.type == 'tool_use'), None)
+        if tool_call:
+            print(f"   -> ✅ Herramienta seleccionada por la IA: '{tool_call.name}'")
+            return {"tool_name": tool_call.name, "tool_input": tool_call.input}
+        return None
+    return {"raw_text": response.content[0].text}
+
+
+def _gemini_text_prompt(system_prompt, user_prompt) -> str:
+    # La API de Gemini no usa 'system' prompt, lo añadimos al contenido
+    return f"{system_prompt}\n\n{user_prompt}" if system_prompt else user_prompt
+
 # Esta función ya no es necesaria para el router, pero la dejamos por si 
 # otras partes del sistema la usan. La renombramos para ser más claros.
 def _legacy_extract_and_parse_json(text: str) -> dict:
@@ -227,22 +244,8 @@ def generate_structured_output(
     de alta fiabilidad de las APIs. Si es False, confía en la instrucción
     del prompt y permite mayor flexibilidad (ej. imágenes en Gemini).
     """
-    task_config = next(
-        (config for config in MODEL_CONFIG.values() if config.get('primary') == model_name),
-        MODEL_CONFIG['default']
-    )
-    models_to_try = [task_config.get('primary'), task_config.get('fallback')]
-    
-    instruction_with_schema = f"""
-{user_prompt}
-
-Tu salida DEBE ser un único objeto JSON que se valide contra el siguiente esquema.
-No incluyas texto, explicaciones o comentarios adicionales.
-
-<output_schema>
-{json.dumps(output_schema, indent=2)}
-</output_schema>
-"""
+    models_to_try = _structured_models_to_try(model_name)
+    instruction_with_schema = _build_schema_instruction(user_prompt, output_schema)
     
     for current_model in models_to_try:
         if not current_model or current_model not in CLIENTS:
@@ -256,63 +259,16 @@ No incluyas texto, explicaciones o comentarios adicionales.
 
             # --- LÓGICA MODIFICADA PARA GOOGLE GEMINI ---
             if api_provider == "Google":
-                # Se construye el prompt como una lista de partes
-                full_prompt_parts = []
-                if system_prompt:
-                    full_prompt_parts.append(system_prompt)
-                full_prompt_parts.append(instruction_with_schema)
-
-                # Se añaden las imágenes si existen
-                if images:
-                    for img in images:
-                        full_prompt_parts.append(img)
-                
-                # Se decide el modo de operación basado en el nuevo parámetro
-                if force_json_output:
-                    print("    -> ⚙️  Activando MODO JSON ESTRICTO para Gemini...")
-                    if images:
-                        print("    -> ⚠️  Advertencia: Las imágenes serán ignoradas en modo JSON estricto.")
-                        full_prompt_parts = [p for p in full_prompt_parts if not isinstance(p, PIL.Image.Image)]
-
-                    config = genai.types.GenerationConfig(response_mime_type="application/json")
+                full_prompt_parts, config = _build_gemini_structured_request(system_prompt, instruction_with_schema, images, force_json_output)
+                if config is not None:
                     response = client.generate_content(full_prompt_parts, generation_config=config)
                 else:
-                    print("    -> ✍️  Activando MODO FLEXIBLE (multimodal) para Gemini...")
-                    # En modo flexible, se envía el prompt con imágenes sin configuración especial
                     response = client.generate_content(full_prompt_parts)
-
                 json_string = response.text
 
             # --- LÓGICA PARA ANTHROPIC CLAUDE (no cambia) ---
             elif api_provider == "Anthropic":
-                # ... (la lógica existente para Claude se mantiene sin cambios) ...
-                print("    -> ⚙️  Aplicando técnica de pre-llenado JSON para Claude...")
-                
-                user_content = [{"type": "text", "text": instruction_with_schema}]
-                
-                if images:
-                    print(f"    -> 🖼️  Adjuntando {len(images)} imagen(es) para el análisis de Claude...")
-                    for img in images:
-                        buffer = io.BytesIO()
-                        img.save(buffer, format="PNG")
-                        image_data = buffer.getvalue()
-                        encoded_image_data = base64.b64encode(image_data).decode('utf-8')
-                        user_content.append({
-                            "type": "image",
-                            "source": { "type": "base64", "media_type": "image/png", "data": encoded_image_data }
-                        })
-                
-                api_params = {
-                    "model": current_model,
-                    "max_tokens": 4096,
-                    "messages": [
-                        {"role": "user", "content": user_content},
-                        {"role": "assistant", "content": "{"}
-                    ]
-                }
-                if system_prompt:
-                    api_params["system"] = system_prompt
-                
+                api_params = _build_anthropic_structured_params(current_model, system_prompt, instruction_with_schema, images)
                 response = client.messages.create(**api_params)
                 json_string = "{" + response.content[0].text
             
@@ -332,6 +288,334 @@ No incluyas texto, explicaciones o comentarios adicionales.
     return None
 
 
+def _structured_models_to_try(model_name: str) -> list:
+    task_config = next(
+        (config for config in MODEL_CONFIG.values() if config.get('primary') == model_name),
+        MODEL_CONFIG['default']
+    )
+    return [task_config.get('primary'), task_config.get('fallback')]
+
+
+def _build_schema_instruction(user_prompt: str, output_schema: dict) -> str:
+    return f"""
+{user_prompt}
+
+Tu salida DEBE ser un único objeto JSON que se valide contra el siguiente esquema.
+No incluyas texto, explicaciones o comentarios adicionales.
+
+<output_schema>
+{json.dumps(output_schema, indent=2)}
+</output_schema>
+"""
+
+
+def _build_gemini_structured_request(system_prompt, instruction_with_schema, images, force_json_output):
+    """Devuelve (partes del prompt, generation_config o None) para Gemini."""
+    # Se construye el prompt como una lista de partes
+    full_prompt_parts = []
+    if system_prompt:
+        full_prompt_parts.append(system_prompt)
+    full_prompt_parts.append(instruction_with_schema)
+
+    # Se añaden las imágenes si existen
+    if images:
+        for img in images:
+            full_prompt_parts.append(img)
+    
+    # Se decide el modo de operación basado en el nuevo parámetro
+    if force_json_output:
+        print("    -> ⚙️  Activando MODO JSON ESTRICTO para Gemini...")
+        if images:
+            print("    -> ⚠️  Advertencia: Las imágenes serán ignoradas en modo JSON estricto.")
+            full_prompt_parts = [p for p in full_prompt_parts if not isinstance(p, PIL.Image.Image)]
+        return full_prompt_parts, genai.types.GenerationConfig(response_mime_type="application/json")
+
+    print("    -> ✍️  Activando MODO FLEXIBLE (multimodal) para Gemini...")
+    # En modo flexible, se envía el prompt con imágenes sin configuración especial
+    return full_prompt_parts, None
+
+
+def _build_anthropic_structured_params(model_name, system_prompt, instruction_with_schema, images) -> dict:
+    """Parámetros para Claude con la técnica de pre-llenado JSON."""
+    print("    -> ⚙️  Aplicando técnica de pre-llenado JSON para Claude...")
+    
+    user_content = [{"type": "text", "text": instruction_with_schema}]
+    
+    if images:
+        print(f"    -> 🖼️  Adjuntando {len(images)} imagen(es) para el análisis de Claude...")
+        for img in images:
+            buffer = io.BytesIO()
+            img.save(buffer, format="PNG")
+            image_data = buffer.getvalue()
+            encoded_image_data = base64.b64encode(image_data).decode('utf-8')
+            user_content.append({
+                "type": "image",
+                "source": { "type": "base64", "media_type": "image/png", "data": encoded_image_data }
+            })
+    
+    api_params = {
+        "model": model_name,
+        "max_tokens": 4096,
+        "messages": [
+            {"role": "user", "content": user_content},
+            {"role": "assistant", "content": "{"}
+        ]
+    }
+    if system_prompt:
+        api_params["system"] = system_prompt
+    return api_params
+
+
+# --- CAPA ASÍNCRONA ---
+# Contrapartes async de generate_completion / generate_structured_output sobre el mismo
+# MODEL_CONFIG. Permiten superponer llamadas independientes (especialistas, resúmenes)
+# con un límite de concurrencia por modelo y, opcionalmente, un fallback "hedged":
+# si el primario no respondió tras 'hedge_after_seconds', se lanza el fallback en
+# paralelo y gana el primero que responda bien.
+#
+# - Todas las coroutines corren en un único event loop de fondo (hilo daemon) que
+#   vive lo que el proceso. Ese loop es dueño del AsyncAnthropic (un pool httpx) y
+#   de los semáforos por modelo, así que los límites de MODEL_CONCURRENCY_LIMITS
+#   valen para todo el proceso y no solo dentro de un gather.
+# - Gemini: el cliente async de google-generativeai queda atado al primer loop que lo
+#   usa, así que reutilizamos el cliente síncrono (y su canal gRPC) en un hilo.
+
+DEFAULT_MODEL_CONCURRENCY = 4
+MODEL_CONCURRENCY_LIMITS = {
+    'claude-sonnet-4-20250514': 4,
+    'claude-3-haiku-20240307': 8,
+    'claude-3-5-haiku-20241022': 8,
+    'gemini-2.5-pro': 4,
+    'gemini-2.5-flash': 8,
+    'gemini-2.0-flash': 8,
+}
+
+
+class _AsyncRuntime:
+    """Event loop de fondo con los clientes async y los semáforos por modelo."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="llm-async-runtime", daemon=True)
+        self.thread.start()
+        self.anthropic_client = None
+        if anthropic and ANTHROPIC_API_KEY:
+            self.anthropic_client = anthropic.AsyncAnthropic(api_key=ANTHROPIC_API_KEY)
+        self.semaphores = {}
+
+    def semaphore(self, model_name: str) -> asyncio.Semaphore:
+        # Solo se usa desde el loop de fondo: no necesita lock
+        if model_name not in self.semaphores:
+            limit = MODEL_CONCURRENCY_LIMITS.get(model_name, DEFAULT_MODEL_CONCURRENCY)
+            self.semaphores[model_name] = asyncio.Semaphore(limit)
+        return self.semaphores[model_name]
+
+    def in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coro):
+        """Programa la coroutine en el loop de fondo y devuelve un concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def aclose(self):
+        if self.anthropic_client is not None:
+            await self.anthropic_client.close()
+
+    def shutdown(self):
+        if not self.loop.is_running():
+            return
+        try:
+            self.submit(self.aclose()).result(timeout=5)
+        except Exception:
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+_async_runtime = None
+_async_runtime_lock = threading.Lock()
+
+
+def _get_async_runtime() -> _AsyncRuntime:
+    global _async_runtime
+    if _async_runtime is None:
+        with _async_runtime_lock:
+            if _async_runtime is None:
+                _async_runtime = _AsyncRuntime()
+                atexit.register(_async_runtime.shutdown)
+    return _async_runtime
+
+
+def _on_runtime_loop(func):
+    """
+    Las coroutines decoradas siempre se ejecutan en el loop de fondo. Si se las
+    await-ea desde otro loop (p. ej. FastAPI), se reenvían allí y se espera el
+    resultado sin bloquear el loop del llamador.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        runtime = _get_async_runtime()
+        if runtime.in_loop():
+            return await func(*args, **kwargs)
+        return await asyncio.wrap_future(runtime.submit(func(*args, **kwargs)))
+    return wrapper
+
+
+async def _run_with_fallback(models: list, attempt, hedge_after_seconds: float | None = None):
+    """
+    Ejecuta 'attempt(model)' (coroutine que devuelve el resultado o None si falla)
+    sobre los modelos en orden. Con 'hedge_after_seconds', el fallback se lanza en
+    cuanto vence el umbral, sin esperar a que el primario falle.
+    """
+    models = [m for m in models if m and m in CLIENTS]
+    if hedge_after_seconds is None or len(models) < 2:
+        for model_name in models:
+            result = await attempt(model_name)
+            if result is not None:
+                return result
+        return None
+
+    primary, fallback = models[0], models[1]
+    tasks = {asyncio.create_task(attempt(primary)): primary}
+    fallback_started = False
+    try:
+        while tasks:
+            timeout = None if fallback_started else hedge_after_seconds
+            done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"    -> ⏱️  '{primary}' sin respuesta tras {hedge_after_seconds}s. Lanzando fallback '{fallback}' en paralelo...")
+            for task in done:
+                tasks.pop(task)
+                result = task.result()
+                if result is not None:
+                    return result
+            if not fallback_started:
+                tasks[asyncio.create_task(attempt(fallback))] = fallback
+                fallback_started = True
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@_on_runtime_loop
+async def agenerate_completion(
+    task_complexity: str,
+    system_prompt: str | None = None,
+    user_prompt: str | None = None,
+    tools: list | None = None,
+    hedge_after_seconds: float | None = None,
+    **kwargs
+) -> dict:
+    """
+    Versión asíncrona de generate_completion (misma entrada y salida).
+    'hedge_after_seconds' activa el fallback hedged descrito arriba.
+    """
+    model_config = MODEL_CONFIG.get(task_complexity, MODEL_CONFIG['default'])
+    runtime = _get_async_runtime()
+
+    async def _attempt(model_name):
+        api_provider = CLIENTS[model_name]['name']
+        api_params = _build_completion_params(model_name, model_config, system_prompt, user_prompt, tools, api_provider)
+        try:
+            async with runtime.semaphore(model_name):
+                if api_provider == "Anthropic":
+                    response = await runtime.anthropic_client.messages.create(**api_params)
+                    return _parse_anthropic_completion(response)
+                if api_provider == "Google":
+                    client = CLIENTS[model_name]['client']
+                    response = await asyncio.to_thread(client.generate_content, _gemini_text_prompt(system_prompt, user_prompt))
+                    return {"raw_text": response.text}
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"    -> ⚠️  Fallo en la llamada a la API ({model_name}): {e}")
+        return None
+
+    result = await _run_with_fallback([model_config['primary'], model_config.get('fallback')], _attempt, hedge_after_seconds)
+    return result or {"error": f"Fallo en la llamada a todos los modelos de IA configurados."}
+
+
+@_on_runtime_loop
+async def agenerate_structured_output(
+    system_prompt: str,
+    user_prompt: str,
+    model_name: str,
+    output_schema: dict,
+    images: list | None = None,
+    force_json_output: bool = True,
+    hedge_after_seconds: float | None = None
+) -> dict | None:
+    """Versión asíncrona de generate_structured_output (misma entrada y salida)."""
+    instruction_with_schema = _build_schema_instruction(user_prompt, output_schema)
+    runtime = _get_async_runtime()
+
+    async def _attempt(current_model):
+        print(f"-> 🤖 [Motor Estructurado] Intentando con '{current_model}'...")
+        api_provider = CLIENTS[current_model]['name']
+        try:
+            async with runtime.semaphore(current_model):
+                if api_provider == "Google":
+                    client = CLIENTS[current_model]['client']
+                    parts, config = _build_gemini_structured_request(system_prompt, instruction_with_schema, images, force_json_output)
+                    if config is not None:
+                        response = await asyncio.to_thread(client.generate_content, parts, generation_config=config)
+                    else:
+                        response = await asyncio.to_thread(client.generate_content, parts)
+                    json_string = response.text
+                else:
+                    api_params = _build_anthropic_structured_params(current_model, system_prompt, instruction_with_schema, images)
+                    response = await runtime.anthropic_client.messages.create(**api_params)
+                    json_string = "{" + response.content[0].text
+            if not json_string:
+                print("    -> ❌ Error: El modelo no devolvió contenido.")
+                return None
+            return json.loads(_clean_and_extract_json(json_string))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"    -> ❌ CRÍTICO: Fallo al usar el modelo '{current_model}': {e}")
+            return None
+
+    result = await _run_with_fallback(_structured_models_to_try(model_name), _attempt, hedge_after_seconds)
+    if result is None:
+        print("    -> ❌ CRÍTICO: Todos los modelos (primario y de respaldo) han fallado.")
+    return result
+
+
+@_on_runtime_loop
+async def agather_completions(requests: list[dict]) -> list[dict]:
+    """
+    Lanza en paralelo varias llamadas independientes. Cada elemento de 'requests'
+    son los kwargs de agenerate_completion. Devuelve los resultados en el mismo orden;
+    una excepción inesperada se convierte en {"error": ...} sin afectar al resto.
+    """
+    results = await asyncio.gather(*(agenerate_completion(**request) for request in requests), return_exceptions=True)
+    return [{"error": str(r)} if isinstance(r, BaseException) else r for r in results]
+
+
+def run_async(coro):
+    """
+    Ejecuta una coroutine de esta capa desde código síncrono: la envía al loop de
+    fondo y bloquea hasta su resultado. Los clientes y semáforos se reutilizan entre
+    llamadas, también cuando se llama desde hilos distintos.
+    """
+    runtime = _get_async_runtime()
+    if runtime.in_loop():
+        coro.close()
+        raise RuntimeError("run_async no puede llamarse desde el loop de fondo; usa 'await'.")
+    return runtime.submit(coro).result()
+
+
+def gather_completions(requests: list[dict]) -> list[dict]:
+    """Atajo síncrono de agather_completions para los llamadores no-async."""
+    return run_async(agather_completions(requests))
+
+
 def extract_entities_from_text(content: str) -> list:
     """
     Usa un LLM para analizar un texto y extraer una lista de entidades clave.
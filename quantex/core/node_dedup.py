@@ -0,0 +1,102 @@
+# quantex/core/node_dedup.py
+"""
+Búsquedas de duplicados de Documentos por URL original y hash lógico.
+
+La migración 20261017120000_nodes_dedup_keys.sql agrega a 'nodes' las columnas
+generadas dedup_url (properties->>'original_url') y dedup_hash (properties->>'hash')
+con índices parciales para type = 'Documento'. Todos los caminos de deduplicación
+(source_monitor, mkt_news_scrapper) consultan a través de este módulo, que usa las
+columnas indexadas y, si la migración aún no está aplicada, cae a los filtros JSONB
+originales con los mismos resultados.
+"""
+
+import threading
+from typing import Iterable, Optional, Set
+
+# Tamaño de bloque para los filtros in_() (mantiene la URL de PostgREST acotada)
+IN_CHUNK_SIZE = 50
+
+DEDUP_COLUMNS = {'original_url': 'dedup_url', 'hash': 'dedup_hash'}
+
+_detect_lock = threading.Lock()
+_has_dedup_columns: Optional[bool] = None
+
+
+def _get_client(supabase):
+    if supabase is not None:
+        return supabase
+    from quantex.core.supabase_pool import get_supabase_client
+    return get_supabase_client()
+
+
+def _has_columns(client) -> bool:
+    """Detecta (una vez por proceso) si las columnas generadas existen."""
+    global _has_dedup_columns
+    with _detect_lock:
+        if _has_dedup_columns is None:
+            try:
+                client.table('nodes').select(','.join(DEDUP_COLUMNS.values())).limit(1).execute()
+                _has_dedup_columns = True
+            except Exception as e:
+                print(f"    -> ⚠️ [NodeDedup] Columnas dedup_* no disponibles ({e}). Usando filtros JSONB.")
+                _has_dedup_columns = False
+        return _has_dedup_columns
+
+
+def _filter_column(client, prop: str) -> str:
+    return DEDUP_COLUMNS[prop] if _has_columns(client) else f'properties->>{prop}'
+
+
+def existing_document_values(prop: str, values: Iterable[str], supabase=None) -> Set[str]:
+    """
+    Devuelve el subconjunto de 'values' que ya existe como properties->>prop
+    ('original_url' o 'hash') en algún Documento. Una consulta in_() por bloque.
+    Las excepciones se propagan para que el llamador decida su fallback.
+    """
+    unique_values = list(dict.fromkeys(v for v in values if v))
+    if not unique_values:
+        return set()
+
+    client = _get_client(supabase)
+    column = _filter_column(client, prop)
+    existing = set()
+    for i in range(0, len(unique_values), IN_CHUNK_SIZE):
+        chunk = unique_values[i:i + IN_CHUNK_SIZE]
+        response = client.table('nodes') \
+            .select(f'value:{column}') \
+            .eq('type', 'Documento') \
+            .in_(column, chunk) \
+            .execute()
+        existing.update(row['value'] for row in (response.data or []) if row.get('value'))
+    return existing
+
+
+def existing_document_urls(urls: Iterable[str], supabase=None) -> Set[str]:
+    return existing_document_values('original_url', urls, supabase)
+
+
+def existing_document_hashes(hashes: Iterable[str], supabase=None) -> Set[str]:
+    return existing_document_values('hash', hashes, supabase)
+
+
+def document_exists(prop: str, value: str, supabase=None) -> bool:
+    """Verificación individual (limit 1, sin count='exact')."""
+    if not value:
+        return False
+    client = _get_client(supabase)
+    column = _filter_column(client, prop)
+    response = client.table('nodes') \
+        .select('id') \
+        .eq('type', 'Documento') \
+        .eq(column, value) \
+        .limit(1) \
+        .execute()
+    return bool(response.data)
+
+
+def document_exists_by_url(original_url: str, supabase=None) -> bool:
+    return document_exists('original_url', (original_url or '').strip(), supabase)
+
+
+def document_exists_by_hash(item_hash: str, supabase=None) -> bool:
+    return document_exists('hash', item_hash, supabase)
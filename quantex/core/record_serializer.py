@@ -0,0 +1,131 @@
+# quantex/core/record_serializer.py
+
+"""
+Serialización columnar de DataFrames a registros para Supabase y a puntos
+{time, value} para TradingView. Todo se resuelve con operaciones vectorizadas
+sobre columnas completas (sin iterrows), lo que importa en cargas históricas
+de 10 años por ticker.
+"""
+
+import pandas as pd
+
+OHLCV_COLUMNS = {'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'}
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """yfinance devuelve columnas MultiIndex (campo, ticker) incluso para un solo ticker."""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    return df
+
+
+def dataframe_to_records(
+    df: pd.DataFrame,
+    columns: dict,
+    constants: dict | None = None,
+    index_key: str | None = None,
+    date_format: str = '%Y-%m-%d',
+    casts: dict | None = None
+) -> list[dict]:
+    """
+    Convierte un DataFrame en una lista de dicts listos para upsert.
+
+    Args:
+        df: DataFrame de origen.
+        columns: Mapeo {columna_origen: clave_destino}.
+        constants: Valores fijos añadidos a cada registro (ticker, source, etc.).
+        index_key: Si se indica, el índice (fechas) se formatea con 'date_format'
+                   y se guarda bajo esta clave.
+        casts: Tipos por clave destino, p. ej. {'volume': 'int64', 'open': 'float64'}.
+    """
+    if df is None or df.empty:
+        return []
+
+    df = _flatten_columns(df)
+    out = df[list(columns)].rename(columns=columns)
+    if casts:
+        out = out.astype(casts)
+    if index_key:
+        out.insert(0, index_key, pd.DatetimeIndex(df.index).strftime(date_format))
+    for key, value in (constants or {}).items():
+        out[key] = value
+    # Desde pandas 2.x, to_dict('records') entrega tipos nativos de Python
+    return out.to_dict('records')
+
+
+def ohlcv_to_upsert_records(df: pd.DataFrame, ticker: str, source: str) -> list[dict]:
+    """Registros para 'market_data_ohlcv' a partir de un DataFrame estilo yfinance."""
+    return dataframe_to_records(
+        df,
+        columns=OHLCV_COLUMNS,
+        constants={'ticker': ticker, 'source': source},
+        index_key='timestamp',
+        casts={'open': 'float64', 'high': 'float64', 'low': 'float64', 'close': 'float64', 'volume': 'int64'}
+    )
+
+
+def dataframe_to_tradingview_points(df: pd.DataFrame, value_column: str | None = None) -> list[dict]:
+    """
+    Puntos {time, value} para TradingView. Usa 'close' si existe y, si no, 'value'
+    (mismo criterio que usaban los endpoints del charts app).
+    """
+    if df is None or df.empty:
+        return []
+    if value_column is None:
+        value_column = 'close' if 'close' in df.columns else 'value'
+    points = pd.DataFrame({
+        'time': pd.DatetimeIndex(df.index).strftime('%Y-%m-%d'),
+        'value': df[value_column].astype('float64').to_numpy()
+    })
+    return points.to_dict('records')
+
+
+def benchmark_serialization(years: int = 10, repeats: int = 5) -> dict:
+    """
+    Micro-benchmark: iterrows (ruta anterior) vs serialización columnar sobre
+    'years' años de datos diarios OHLCV sintéticos. Devuelve tiempos en ms.
+    """
+    import time
+    import numpy as np
+
+    index = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=years * 252)
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(len(index)).cumsum()
+    df = pd.DataFrame({
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+        'Volume': rng.integers(1_000, 1_000_000, len(index))
+    }, index=index)
+
+    def _iterrows_path():
+        records = []
+        for idx, row in df.iterrows():
+            records.append({
+                "timestamp": idx.strftime('%Y-%m-%d'), "ticker": "BENCH",
+                "open": float(row['Open']), "high": float(row['High']), "low": float(row['Low']),
+                "close": float(row['Close']), "volume": int(row['Volume']), "source": "bench"
+            })
+        return records
+
+    def _best_of(fn):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+        return min(timings)
+
+    assert _iterrows_path() == ohlcv_to_upsert_records(df, 'BENCH', 'bench')
+    iterrows_ms = _best_of(_iterrows_path)
+    columnar_ms = _best_of(lambda: ohlcv_to_upsert_records(df, 'BENCH', 'bench'))
+    return {
+        'rows': len(df),
+        'iterrows_ms': round(iterrows_ms, 2),
+        'columnar_ms': round(columnar_ms, 2),
+        'speedup': round(iterrows_ms / columnar_ms, 1) if columnar_ms else None
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark_serialization()
+    print(f"📊 {result['rows']} filas | iterrows: {result['iterrows_ms']} ms | columnar: {result['columnar_ms']} ms | x{result['speedup']}")
@@ -5,6 +5,7 @@ import os
 import math
 import traceback
 import demjson3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import pytz
 import pandas as pd
@@ -19,6 +20,10 @@ from quantex.core import llm_manager
 from quantex.core.llm_manager import MODEL_CONFIG
 from quantex.core.ai_services import ai_services
 
+# Segundos de espera al modelo primario antes de lanzar el fallback en paralelo
+SPECIALIST_HEDGE_SECONDS = 90
+RESEARCH_MAX_WORKERS = 4
+
 
 # En quantex/core/report_builder.py
 
@@ -120,10 +125,16 @@ def _run_reflexive_synthesis_cycle(initial_dossier, report_definition):
         questions = first_pass_data.get("questions", [])
         perplexity_answers = {}
 
-        for i, question in enumerate(questions):
+        # Las preguntas son independientes entre sí: se investigan en paralelo
+        def _research(i, question):
             print(f"    -> ❓ Investigando pregunta {i+1}: '{question}'")
-            answer = get_perplexity_synthesis(question=question)
-            perplexity_answers[f"respuesta_pregunta_{i+1}"] = answer
+            return get_perplexity_synthesis(question=question)
+
+        if questions:
+            with ThreadPoolExecutor(max_workers=min(len(questions), RESEARCH_MAX_WORKERS)) as executor:
+                answers = list(executor.map(_research, range(len(questions)), questions))
+            for i, answer in enumerate(answers):
+                perplexity_answers[f"respuesta_pregunta_{i+1}"] = answer
         
         enriched_dossier = initial_dossier.copy()
         enriched_dossier["follow_up_analysis"] = perplexity_answers
@@ -169,12 +180,14 @@ def call_single_specialist(specialist_config: dict, evidence_dossier: dict) -> s
         source_data_str = json.dumps(evidence_dossier, indent=2, default=str)
         system_prompt = prompt_template.replace('{source_data}', source_data_str)
         
-        # Llamamos al LLM a través del manager
-        response_dict = llm_manager.generate_completion(
+        # Llamamos al LLM a través del manager. Con fallback hedged: si el modelo
+        # primario tarda más de SPECIALIST_HEDGE_SECONDS se lanza el de respaldo en paralelo.
+        response_dict = llm_manager.run_async(llm_manager.agenerate_completion(
+            task_complexity="complex", # Usamos un modelo potente para el análisis
             system_prompt=system_prompt,
             user_prompt="Genera tu respuesta en formato JSON según tus instrucciones.",
-            task_type="complex" # Usamos un modelo potente para el análisis
-        )
+            hedge_after_seconds=SPECIALIST_HEDGE_SECONDS
+        ))
         
         # Devolvemos el texto crudo de la respuesta para que la función que llama lo procese
         return response_dict.get('raw_text', '')
@@ -84,17 +84,14 @@ class SemanticSearchEngine:
             
             search_results = self.ai_services.pinecone_index.query(**query_params)
             
-            # 6. Procesar y filtrar resultados
-            results = []
-            for match in search_results.get('matches', []):
-                node_id = match.get('id')
-                score = match.get('score', 0.0)
-                
-                if not node_id:
-                    continue
-                
-                # Obtener datos del nodo desde Supabase
-                node_data = self._get_node_data(node_id)
+            # 7. Hidratar todos los nodos en una sola consulta (en lugar de una por match)
+            matches = [m for m in search_results.get('matches', []) if m.get('id')]
+            nodes_by_id = self._get_nodes_data_bulk([m['id'] for m in matches])
+            
+            # 8. Procesar y filtrar resultados respetando el orden por score
+            candidates = []
+            for match in matches:
+                node_data = nodes_by_id.get(match['id'])
                 if not node_data:
                     continue
                 
@@ -102,14 +99,22 @@ class SemanticSearchEngine:
                 if not self._passes_filters(node_data, cutoff_date, filters):
                     continue
                 
-                # Construir resultado
-                result = self._build_result(node_data, score, include_connections)
-                results.append(result)
+                candidates.append((node_data, match.get('score', 0.0)))
                 
                 # Limitar resultados
-                if len(results) >= top_k:
+                if len(candidates) >= top_k:
                     break
             
+            # 9. Conexiones de todo el conjunto en una sola consulta de edges
+            edges_by_node = None
+            if include_connections and candidates:
+                edges_by_node = self._get_edges_bulk([node['id'] for node, _ in candidates])
+            
+            results = [
+                self._build_result(node_data, score, include_connections, edges_by_node)
+                for node_data, score in candidates
+            ]
+            
             print(f"✅ [SemanticSearch] Encontrados {len(results)} nodos relevantes")
             return results
             
@@ -164,6 +169,54 @@ class SemanticSearchEngine:
             print(f"⚠️ Error obteniendo nodo {node_id}: {e}")
             return None
     
+    def _get_nodes_data_bulk(self, node_ids: List[str], chunk_size: int = 200) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtiene los datos de muchos nodos con consultas `in_` agrupadas.
+        Devuelve un diccionario {node_id: node_data}.
+        """
+        nodes_by_id: Dict[str, Dict[str, Any]] = {}
+        unique_ids = list(dict.fromkeys(node_ids))
+        for start in range(0, len(unique_ids), chunk_size):
+            chunk = unique_ids[start:start + chunk_size]
+            try:
+                response = self.db.supabase.table('nodes').select('*').in_('id', chunk).execute()
+                for node in (response.data or []):
+                    nodes_by_id[node['id']] = node
+            except Exception as e:
+                print(f"⚠️ Error obteniendo lote de {len(chunk)} nodos: {e}")
+        return nodes_by_id
+    
+    def _get_edges_bulk(self, node_ids: List[str], page_size: int = 1000) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Obtiene todas las aristas que tocan a un conjunto de nodos en una sola consulta
+        (paginada) y las agrupa por nodo. Devuelve {node_id: [edges]}.
+        """
+        edges_by_node: Dict[str, List[Dict[str, Any]]] = {node_id: [] for node_id in node_ids}
+        if not node_ids:
+            return edges_by_node
+        
+        id_list = ','.join(node_ids)
+        offset = 0
+        try:
+            while True:
+                response = self.db.supabase.table('edges').select('*').or_(
+                    f'source_id.in.({id_list}),target_id.in.({id_list})'
+                ).range(offset, offset + page_size - 1).execute()
+                batch = response.data or []
+                for edge in batch:
+                    source_id = edge.get('source_id')
+                    target_id = edge.get('target_id')
+                    if source_id in edges_by_node:
+                        edges_by_node[source_id].append(edge)
+                    if target_id in edges_by_node and target_id != source_id:
+                        edges_by_node[target_id].append(edge)
+                if len(batch) < page_size:
+                    break
+                offset += page_size
+        except Exception as e:
+            print(f"⚠️ Error obteniendo conexiones en lote: {e}")
+        return edges_by_node
+    
     def _build_pinecone_filters(self, cutoff_date: datetime, filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Construye filtros para Pinecone"""
         try:
@@ -282,10 +335,13 @@ class SemanticSearchEngine:
         self, 
         node_data: Dict[str, Any], 
         score: float, 
-        include_connections: bool
+        include_connections: bool,
+        edges_by_node: Optional[Dict[str, List[Dict[str, Any]]]] = None
     ) -> Dict[str, Any]:
         """
-        Construye el resultado final
+        Construye el resultado final.
+        Si se entrega `edges_by_node` (precargado con _get_edges_bulk) las conexiones
+        se resuelven en memoria sin consultas adicionales.
         """
         properties = node_data.get('properties', {})
         
@@ -303,6 +359,12 @@ class SemanticSearchEngine:
         
         # Incluir conexiones si se solicita
         if include_connections:
+            if edges_by_node is not None:
+                node_edges = edges_by_node.get(node_data['id'], [])
+                result['connections'] = len(node_edges)
+                result['neighbors'] = self._neighbor_ids_from_edges(node_data['id'], node_edges, limit=10)
+                return result
+            
             try:
                 edges_response = self.db.supabase.table('edges').select('*').or_(
                     f'source_id.eq.{node_data["id"]},target_id.eq.{node_data["id"]}'
@@ -318,6 +380,18 @@ class SemanticSearchEngine:
         
         return result
     
+    def _neighbor_ids_from_edges(self, node_id: str, edges: List[Dict[str, Any]], limit: int = 10) -> List[str]:
+        """
+        Obtiene IDs de nodos vecinos a partir de aristas ya cargadas
+        """
+        neighbors = set()
+        for edge in edges[:limit]:
+            if edge.get('source_id') == node_id:
+                neighbors.add(edge.get('target_id'))
+            else:
+                neighbors.add(edge.get('source_id'))
+        return list(neighbors)
+    
     def _get_neighbor_ids(self, node_id: str, limit: int = 10) -> List[str]:
         """
         Obtiene IDs de nodos vecinos
@@ -327,14 +401,7 @@ class SemanticSearchEngine:
                 f'source_id.eq.{node_id},target_id.eq.{node_id}'
             ).limit(limit).execute()
             
-            neighbors = set()
-            for edge in (response.data or []):
-                if edge.get('source_id') == node_id:
-                    neighbors.add(edge.get('target_id'))
-                else:
-                    neighbors.add(edge.get('source_id'))
-            
-            return list(neighbors)
+            return self._neighbor_ids_from_edges(node_id, response.data or [], limit=limit)
             
         except Exception:
             return []
@@ -2,7 +2,8 @@
 
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from quantex.core.supabase_pool import get_supabase_client
 from sentence_transformers import SentenceTransformer
 
 # --- INICIALIZACIÓN DE CLIENTES Y MODELOS ---
@@ -11,7 +12,7 @@ load_dotenv(dotenv_path=dotenv_path)
 
 supabase_url = os.environ.get("SUPABASE_URL")
 supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-supabase: Client = create_client(supabase_url, supabase_key)
+supabase: Client = get_supabase_client(supabase_url, supabase_key)
 
 try:
     print("[SEMANTIC_SEARCH] Cargando modelo de embeddings...")
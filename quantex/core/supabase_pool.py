@@ -0,0 +1,91 @@
+# quantex/core/supabase_pool.py
+
+"""
+Pool de clientes de Supabase compartido por todo el proceso.
+
+Crear un Client con create_client() en cada llamada implica reconstruir los
+sub-clientes (auth, postgrest, storage) y abrir una sesión HTTP nueva, con su
+handshake TLS. Aquí se crea un único Client por (url, key) y se reutiliza:
+postgrest ya mantiene una sesión httpx con keep-alive y HTTP/2, de modo que las
+conexiones quedan abiertas entre requests.
+
+Los request builders de postgrest se crean por consulta sobre la sesión httpx
+compartida, que es segura entre hilos, así que el mismo Client se puede usar
+desde los hilos de Flask o de un ThreadPoolExecutor.
+"""
+
+import os
+import threading
+from dotenv import load_dotenv
+from supabase import create_client, Client
+
+_pool_lock = threading.Lock()
+_clients = {}    # (url, key) -> Client
+_pool_stats = {'created': 0, 'reused': 0}
+
+
+def get_supabase_client(url: str | None = None, key: str | None = None) -> Client:
+    """
+    Devuelve el Client compartido para (url, key). Sin argumentos usa
+    SUPABASE_URL / SUPABASE_SERVICE_KEY del entorno (.env de la raíz del proyecto).
+    """
+    if url is None or key is None:
+        dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '.env')
+        load_dotenv(dotenv_path=dotenv_path)
+        url = url or os.environ.get("SUPABASE_URL")
+        key = key or os.environ.get("SUPABASE_SERVICE_KEY")
+
+    pool_key = (url, key)
+    with _pool_lock:
+        client = _clients.get(pool_key)
+        if client is not None:
+            _pool_stats['reused'] += 1
+            return client
+
+        client = create_client(url, key)
+        # postgrest se inicializa de forma perezosa; lo creamos aquí, bajo el lock,
+        # para que dos hilos no abran sesiones distintas.
+        client.postgrest
+        _clients[pool_key] = client
+        _pool_stats['created'] += 1
+        return client
+
+
+def _session_connection_stats(client: Client) -> dict:
+    """Conexiones abiertas de la sesión httpx de postgrest (lectura best-effort de httpcore)."""
+    stats = {'open': 0, 'idle': 0, 'http2': 0}
+    try:
+        pool = client.postgrest.session._transport._pool
+        for connection in pool.connections:
+            stats['open'] += 1
+            if connection.is_idle():
+                stats['idle'] += 1
+            if 'HTTP/2' in connection.info():
+                stats['http2'] += 1
+    except Exception:
+        pass
+    return stats
+
+
+def get_pool_stats() -> dict:
+    """Clientes creados/reutilizados y conexiones abiertas por cliente."""
+    with _pool_lock:
+        clients = list(_clients.values())
+        stats = {**_pool_stats, 'clients': len(clients)}
+    connections = [_session_connection_stats(client) for client in clients]
+    stats['connections'] = {
+        field: sum(c[field] for c in connections) for field in ('open', 'idle', 'http2')
+    }
+    return stats
+
+
+def close_pool():
+    """Cierra las sesiones HTTP de todos los clientes (p. ej. al terminar un script)."""
+    with _pool_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.postgrest.session.close()
+        except Exception as e:
+            print(f"⚠️ Error cerrando sesión de Supabase: {e}")
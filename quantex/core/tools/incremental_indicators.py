@@ -0,0 +1,300 @@
+# quantex/core/tools/incremental_indicators.py
+
+"""
+Motor de indicadores técnicos incremental y por lotes.
+
+Reproduce exactamente las columnas de calculate_all_indicators (SMA 20/50/200,
+RSI con EWM com=13, MACD 12/26/9 y Bandas de Bollinger 20x2) de dos formas:
+
+  * IndicatorState / IncrementalIndicatorEngine: estado acumulado por ticker
+    (niveles EMA, sumas de ventanas móviles) para que cada barra diaria nueva se
+    procese en O(1) sin recalcular el histórico.
+  * calculate_indicators_batch: cálculo vectorizado para muchos tickers a la vez
+    sobre un array NumPy apilado (T barras x N tickers).
+
+verify_against_pandas() compara ambos caminos contra calculate_all_indicators.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+SMA_WINDOWS = (20, 50, 200)
+BB_WINDOW = 20
+BB_STD_MULT = 2
+RSI_ALPHA = 1.0 / 14.0          # ewm(com=13)
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+WARMUP_BARS = max(SMA_WINDOWS)   # calculate_all_indicators descarta estas filas con dropna
+
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'SMA_200', 'RSI', 'MACD', 'MACD_Signal', 'MACD_Hist',
+    'BB_Middle', 'BB_Std', 'BB_Upper', 'BB_Lower'
+]
+
+
+def _ema_alpha(span: int) -> float:
+    return 2.0 / (span + 1.0)
+
+
+class _RollingWindow:
+    """Ventana móvil con suma y suma de cuadrados desplazadas (estables numéricamente)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque()
+        self.shift = None
+        self.sum = 0.0
+        self.sum_sq = 0.0
+
+    def push(self, value: float):
+        if self.shift is None:
+            self.shift = value
+        centered = value - self.shift
+        self.values.append(centered)
+        self.sum += centered
+        self.sum_sq += centered * centered
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.sum -= old
+            self.sum_sq -= old * old
+
+    def mean(self) -> float:
+        return self.shift + self.sum / self.size
+
+    def std(self) -> float:
+        # Desviación estándar muestral (ddof=1), igual que pandas rolling().std()
+        n = self.size
+        variance = (self.sum_sq - self.sum * self.sum / n) / (n - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+class IndicatorState:
+    """Estado incremental de indicadores para un ticker."""
+
+    def __init__(self):
+        self.windows = {w: _RollingWindow(w) for w in SMA_WINDOWS}
+        self.last_price = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.ema_fast = None
+        self.ema_slow = None
+        self.macd_signal = None
+        self.bars = 0
+
+    def update(self, price: float) -> dict | None:
+        """
+        Procesa una barra nueva en O(1). Devuelve el dict de indicadores de esa
+        barra, o None mientras no haya historial suficiente (mismo corte que el dropna).
+        """
+        price = float(price)
+        for window in self.windows.values():
+            window.push(price)
+
+        if self.last_price is None:
+            gain = loss = 0.0
+            self.ema_fast = self.ema_slow = price
+        else:
+            delta = price - self.last_price
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            self.avg_gain += RSI_ALPHA * (gain - self.avg_gain)
+            self.avg_loss += RSI_ALPHA * (loss - self.avg_loss)
+            self.ema_fast += _ema_alpha(MACD_FAST) * (price - self.ema_fast)
+            self.ema_slow += _ema_alpha(MACD_SLOW) * (price - self.ema_slow)
+        self.last_price = price
+        self.bars += 1
+
+        macd = self.ema_fast - self.ema_slow
+        if self.macd_signal is None:
+            self.macd_signal = macd
+        else:
+            self.macd_signal += _ema_alpha(MACD_SIGNAL) * (macd - self.macd_signal)
+
+        if self.bars < WARMUP_BARS:
+            return None
+
+        rs = self.avg_gain / (self.avg_loss if self.avg_loss != 0 else 1e-9)
+        sma_20 = self.windows[BB_WINDOW].mean()
+        bb_std = self.windows[BB_WINDOW].std()
+        return {
+            'SMA_20': sma_20,
+            'SMA_50': self.windows[50].mean(),
+            'SMA_200': self.windows[200].mean(),
+            'RSI': 100.0 - (100.0 / (1.0 + rs)),
+            'MACD': macd,
+            'MACD_Signal': self.macd_signal,
+            'MACD_Hist': macd - self.macd_signal,
+            'BB_Middle': sma_20,
+            'BB_Std': bb_std,
+            'BB_Upper': sma_20 + bb_std * BB_STD_MULT,
+            'BB_Lower': sma_20 - bb_std * BB_STD_MULT,
+        }
+
+
+class IncrementalIndicatorEngine:
+    """Mantiene un IndicatorState por ticker."""
+
+    def __init__(self):
+        self.states = {}
+        self.last_rows = {}
+
+    def seed(self, ticker: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Inicializa el estado de un ticker con su histórico. Devuelve el DataFrame
+        con indicadores (mismas filas y columnas que calculate_all_indicators).
+        """
+        price_col = _price_column(df)
+        state = IndicatorState()
+        rows, index = [], []
+        for timestamp, price in df[price_col].items():
+            row = state.update(price)
+            if row is not None:
+                rows.append(row)
+                index.append(timestamp)
+        self.states[ticker] = state
+        result = df.loc[index].copy()
+        indicators = pd.DataFrame(rows, index=result.index, columns=INDICATOR_COLUMNS)
+        for column in INDICATOR_COLUMNS:
+            result[column] = indicators[column]
+        if rows:
+            self.last_rows[ticker] = rows[-1]
+        return result
+
+    def update(self, ticker: str, price: float) -> dict | None:
+        """Agrega una barra nueva al ticker y devuelve sus indicadores (O(1))."""
+        state = self.states.setdefault(ticker, IndicatorState())
+        row = state.update(price)
+        if row is not None:
+            self.last_rows[ticker] = row
+        return row
+
+
+def _price_column(df: pd.DataFrame) -> str:
+    if 'close' in df.columns:
+        return 'close'
+    if 'value' in df.columns:
+        return 'value'
+    raise ValueError("El DataFrame debe contener una columna 'close' o 'value'.")
+
+
+def _ema_matrix(x: np.ndarray, alpha: float) -> np.ndarray:
+    """EMA con adjust=False sobre el eje 0, para todas las columnas a la vez."""
+    out = np.empty_like(x)
+    out[0] = x[0]
+    decay = 1.0 - alpha
+    for t in range(1, x.shape[0]):
+        out[t] = decay * out[t - 1] + alpha * x[t]
+    return out
+
+
+def _rolling_mean_matrix(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if x.shape[0] >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window, axis=0).mean(axis=-1)
+    return out
+
+
+def _rolling_std_matrix(x: np.ndarray, window: int) -> np.ndarray:
+    out = np.full_like(x, np.nan)
+    if x.shape[0] >= window:
+        out[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window, axis=0).std(axis=-1, ddof=1)
+    return out
+
+
+def calculate_indicators_batch(prices: np.ndarray) -> dict:
+    """
+    Indicadores para muchos tickers a la vez.
+
+    Args:
+        prices: array (T, N) de precios alineados y sin NaN (T barras, N tickers).
+
+    Returns:
+        {columna: array (T, N)}. Las primeras WARMUP_BARS - 1 filas quedan en NaN
+        en las SMA (equivalen a las filas que calculate_all_indicators descarta).
+    """
+    x = np.asarray(prices, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+
+    delta = np.zeros_like(x)
+    delta[1:] = np.diff(x, axis=0)
+    avg_gain = _ema_matrix(np.where(delta > 0, delta, 0.0), RSI_ALPHA)
+    avg_loss = _ema_matrix(np.where(delta < 0, -delta, 0.0), RSI_ALPHA)
+    rs = avg_gain / np.where(avg_loss == 0, 1e-9, avg_loss)
+
+    macd = _ema_matrix(x, _ema_alpha(MACD_FAST)) - _ema_matrix(x, _ema_alpha(MACD_SLOW))
+    macd_signal = _ema_matrix(macd, _ema_alpha(MACD_SIGNAL))
+
+    sma = {w: _rolling_mean_matrix(x, w) for w in SMA_WINDOWS}
+    bb_std = _rolling_std_matrix(x, BB_WINDOW)
+    return {
+        'SMA_20': sma[20],
+        'SMA_50': sma[50],
+        'SMA_200': sma[200],
+        'RSI': 100.0 - (100.0 / (1.0 + rs)),
+        'MACD': macd,
+        'MACD_Signal': macd_signal,
+        'MACD_Hist': macd - macd_signal,
+        'BB_Middle': sma[BB_WINDOW],
+        'BB_Std': bb_std,
+        'BB_Upper': sma[BB_WINDOW] + bb_std * BB_STD_MULT,
+        'BB_Lower': sma[BB_WINDOW] - bb_std * BB_STD_MULT,
+    }
+
+
+def calculate_all_indicators_batch(frames: dict) -> dict:
+    """
+    Versión por lotes de calculate_all_indicators para {ticker: DataFrame} con el
+    mismo índice de fechas. Devuelve {ticker: DataFrame con indicadores, ya sin warmup}.
+    """
+    tickers = list(frames)
+    if not tickers:
+        return {}
+    base_index = frames[tickers[0]].index
+    prices = np.column_stack([frames[t][_price_column(frames[t])].reindex(base_index).to_numpy(dtype=np.float64) for t in tickers])
+    indicators = calculate_indicators_batch(prices)
+    results = {}
+    for i, ticker in enumerate(tickers):
+        df = frames[ticker].copy()
+        for column in INDICATOR_COLUMNS:
+            df[column] = indicators[column][:, i]
+        results[ticker] = df.dropna()
+    return results
+
+
+def verify_against_pandas(n_bars: int = 750, n_tickers: int = 5, atol: float = 1e-6) -> dict:
+    """
+    Verifica que el motor incremental y el batch reproducen calculate_all_indicators
+    dentro de 'atol' sobre paseos aleatorios sintéticos. Lanza AssertionError si no.
+    """
+    from quantex.core.tools.technical_tools import calculate_all_indicators
+
+    rng = np.random.default_rng(42)
+    index = pd.bdate_range(end=pd.Timestamp('2025-01-31'), periods=n_bars)
+    frames = {
+        f"T{i}": pd.DataFrame({'close': 100 * (1 + i) + rng.standard_normal(n_bars).cumsum()}, index=index)
+        for i in range(n_tickers)
+    }
+
+    engine = IncrementalIndicatorEngine()
+    batch = calculate_all_indicators_batch(frames)
+    max_error = 0.0
+    for ticker, frame in frames.items():
+        expected = calculate_all_indicators(frame.copy())
+
+        # Sembrar con todo salvo la última barra y luego actualizar en O(1)
+        seeded = engine.seed(ticker, frame.iloc[:-1])
+        last_row = engine.update(ticker, frame['close'].iloc[-1])
+        incremental = pd.concat([seeded, pd.DataFrame([{**{'close': frame['close'].iloc[-1]}, **last_row}], index=frame.index[-1:])])
+
+        for candidate in (incremental, batch[ticker]):
+            assert list(candidate.index) == list(expected.index), "Las filas no coinciden con calculate_all_indicators"
+            diff = np.abs(candidate[INDICATOR_COLUMNS].to_numpy() - expected[INDICATOR_COLUMNS].to_numpy())
+            max_error = max(max_error, float(np.nanmax(diff)))
+    assert max_error <= atol, f"Error máximo {max_error} supera la tolerancia {atol}"
+    return {'tickers': n_tickers, 'bars': n_bars, 'max_abs_error': max_error}
+
+
+if __name__ == "__main__":
+    result = verify_against_pandas()
+    print(f"✅ Motor incremental y batch coinciden con calculate_all_indicators (error máx: {result['max_abs_error']:.2e})")
@@ -147,6 +147,10 @@ def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
     print(f"    -> Usando la columna '{price_col}' para los cálculos.")
     # --- FIN DE LA CORRECCIÓN ---
 
+    # Trabajar sobre una copia para no mutar el DataFrame del llamador
+    # (para actualizaciones barra a barra ver incremental_indicators.py)
+    df = df.copy()
+
     # 2. Usar la columna de precios seleccionada para todos los cálculos
     df['SMA_20'] = df[price_col].rolling(window=20).mean()
     df['SMA_50'] = df[price_col].rolling(window=50).mean()
@@ -11,6 +11,7 @@ import re
 import mplfinance as mpf
 import matplotlib.pyplot as plt
 import traceback
+import threading
 from datetime import datetime
 import matplotlib.dates as mdates
 from PIL import Image, ImageDraw
@@ -35,6 +36,11 @@ if PROJECT_ROOT not in sys.path:
 # --- Importaciones de Quantex ---
 from quantex.core import database_manager as db
 
+# pyplot (y por lo tanto mplfinance) no es thread-safe: los renders concurrentes
+# (p. ej. comité técnico con varios tickers en paralelo) se serializan aquí.
+# Solo el render queda bajo el lock; la subida a Storage ocurre fuera.
+_RENDER_LOCK = threading.Lock()
+
 def standardize_image_size(image_bytes: bytes, target_size: tuple = (1200, 600)) -> bytes:
     """
     Estandariza el tamaño de una imagen manteniendo aspect ratio
@@ -327,7 +333,8 @@ def generate_and_upload_clean_price_chart(df: pd.DataFrame, ticker: str, tech_pa
                 additional_plots.append(mpf.make_addplot(df_chart[ma_col]))
 
         buf = io.BytesIO()
-        mpf.plot(df_chart, 
+        with _RENDER_LOCK:
+            mpf.plot(df_chart, 
                  type='candle', 
                  style='charles', 
                  title=f'Acción del Precio para {ticker} ({analysis_date})', 
@@ -346,24 +353,45 @@ def generate_and_upload_clean_price_chart(df: pd.DataFrame, ticker: str, tech_pa
         print(f"    -> ❌ Error generando gráfico limpio: {e}")
         return None
 
+def _render_full_indicator_chart(df: pd.DataFrame, ticker: str) -> tuple[bytes, str]:
+    """Renderiza el gráfico completo de indicadores. Devuelve (png_bytes, file_name)."""
+    df_chart = df.copy()
+    analysis_date = df_chart.index[-1].strftime('%Y-%m-%d')
+    price_plots = [mpf.make_addplot(df_chart[['BB_Upper', 'BB_Lower']], color='gray', alpha=0.3), mpf.make_addplot(df_chart['SMA_20'], color='orange')]
+    indicator_panels = [mpf.make_addplot(df_chart['RSI'], panel=1, color='purple', ylabel='RSI'), mpf.make_addplot(df_chart['MACD'], panel=2, color='blue', ylabel='MACD'), mpf.make_addplot(df_chart['MACD_Signal'], panel=2, color='orange', linestyle='--'), mpf.make_addplot(df_chart['MACD_Hist'], type='bar', panel=2, color='gray', alpha=0.5)]
+    buf = io.BytesIO()
+    with _RENDER_LOCK:
+        mpf.plot(df_chart, type='candle', style='yahoo', title=f'Análisis de Indicadores para {ticker} ({analysis_date})', ylabel='Precio', addplot=price_plots + indicator_panels, panel_ratios=(4, 2, 2), figsize=(12, 10), savefig=dict(fname=buf, dpi=120))
+    buf.seek(0)
+    rounded_image_bytes = add_rounded_corners(buf, radius=20)
+    file_name = f"indicator_chart_{ticker.replace('.', '_')}_{analysis_date}.png"
+    return rounded_image_bytes, file_name
+
 def generate_and_upload_full_indicator_chart(df: pd.DataFrame, ticker: str, tech_params: dict) -> str | None:
     print(f"  -> 🛠️ Generando gráfico COMPLETO para el Quant ({ticker})...")
     try:
-        df_chart = df.copy()
-        analysis_date = df_chart.index[-1].strftime('%Y-%m-%d')
-        price_plots = [mpf.make_addplot(df_chart[['BB_Upper', 'BB_Lower']], color='gray', alpha=0.3), mpf.make_addplot(df_chart['SMA_20'], color='orange')]
-        indicator_panels = [mpf.make_addplot(df_chart['RSI'], panel=1, color='purple', ylabel='RSI'), mpf.make_addplot(df_chart['MACD'], panel=2, color='blue', ylabel='MACD'), mpf.make_addplot(df_chart['MACD_Signal'], panel=2, color='orange', linestyle='--'), mpf.make_addplot(df_chart['MACD_Hist'], type='bar', panel=2, color='gray', alpha=0.5)]
-        buf = io.BytesIO()
-        mpf.plot(df_chart, type='candle', style='yahoo', title=f'Análisis de Indicadores para {ticker} ({analysis_date})', ylabel='Precio', addplot=price_plots + indicator_panels, panel_ratios=(4, 2, 2), figsize=(12, 10), savefig=dict(fname=buf, dpi=120))
-        buf.seek(0)
-        rounded_image_bytes = add_rounded_corners(buf, radius=20)
-        file_name = f"indicator_chart_{ticker.replace('.', '_')}_{analysis_date}.png"
+        rounded_image_bytes, file_name = _render_full_indicator_chart(df, ticker)
         public_url = db.upload_file_to_storage("report-charts", file_name, rounded_image_bytes)
         print(f"    -> ✅ Gráfico de indicadores subido exitosamente.")
         return public_url
     except Exception as e:
         print(f"    -> ❌ Error generando gráfico de indicadores: {e}")
         return None    
+
+def generate_full_indicator_chart(df: pd.DataFrame, ticker: str, tech_params: dict) -> dict | None:
+    """
+    Igual que generate_and_upload_full_indicator_chart, pero devuelve los bytes
+    del PNG junto a la URL pública y deja la subida a Storage en segundo plano.
+    Devuelve {"url", "file_name", "image_bytes", "upload_future"} o None si falla el render.
+    """
+    print(f"  -> 🛠️ Generando gráfico COMPLETO (en memoria) para el Quant ({ticker})...")
+    try:
+        rounded_image_bytes, file_name = _render_full_indicator_chart(df, ticker)
+        public_url, upload_future = db.upload_file_to_storage_in_background("report-charts", file_name, rounded_image_bytes)
+        return {"url": public_url, "file_name": file_name, "image_bytes": rounded_image_bytes, "upload_future": upload_future}
+    except Exception as e:
+        print(f"    -> ❌ Error generando gráfico de indicadores: {e}")
+        return None
     
 def generate_candlestick_chart(ohlc_data: list, chart_def: dict) -> str | None:
     """
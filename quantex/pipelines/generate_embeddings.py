@@ -2,7 +2,8 @@
 
 import os
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
+from quantex.core.supabase_pool import get_supabase_client
 from sentence_transformers import SentenceTransformer
 
 def generate_and_store_embeddings():
@@ -18,7 +19,7 @@ def generate_and_store_embeddings():
         load_dotenv(dotenv_path=dotenv_path)
         supabase_url = os.environ.get("SUPABASE_URL")
         supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-        supabase: Client = create_client(supabase_url, supabase_key)
+        supabase: Client = get_supabase_client(supabase_url, supabase_key)
         print("✅ Conexión a Supabase exitosa.")
 
         # Cargamos un modelo de embeddings multilingüe y eficiente
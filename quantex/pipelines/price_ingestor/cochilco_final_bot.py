@@ -8,12 +8,20 @@ from selenium.common.exceptions import NoSuchElementException
 import time
 import re
 import os
+import sys
 import pandas as pd
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 from datetime import datetime, timedelta
 import pytz
 
+# --- Configuración de Rutas ---
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from quantex.core.supabase_pool import get_supabase_client
+
 # Cargar variables de entorno
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -26,7 +34,7 @@ if not all([SUPABASE_URL, SUPABASE_KEY]):
     exit(1)
 
 # Inicializar cliente Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 class FinalCochilcoBot:
     def __init__(self, headless=True):
@@ -5,10 +5,12 @@ import fitz  # PyMuPDF
 import pandas as pd
 import re
 from datetime import datetime
-from supabase import create_client, Client
+from supabase import Client
+from quantex.core.supabase_pool import get_supabase_client
 from dotenv import load_dotenv
 
 from quantex.core.database_manager import upsert_fixed_income_trades
+from quantex.core.record_serializer import dataframe_to_records
 
 # --- 1. CONEXIÓN A SUPABASE ---
 try:
@@ -17,7 +19,7 @@ try:
     
     supabase_url = os.environ.get("SUPABASE_URL")
     supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-    supabase: Client = create_client(supabase_url, supabase_key)
+    supabase: Client = get_supabase_client(supabase_url, supabase_key)
     print("✅ Conexión a Supabase inicializada exitosamente.")
 except Exception as e:
     print(f"❌ ERROR al inicializar el cliente de Supabase: {e}")
@@ -128,27 +130,31 @@ def get_instrument_map(tickers: list) -> dict:
         print(f"  -> ❌ Error al buscar instrumentos: {e}")
     return {}
 
+def _build_fixed_income_records(trades_df: pd.DataFrame, trade_date: str, instrument_map: dict, include_ticker: bool = False) -> tuple[list, list]:
+    """
+    Construye los registros de 'fixed_income_trades' en forma columnar.
+    Devuelve (registros, nemos_sin_definicion).
+    """
+    known = trades_df['Nemo'].isin(list(instrument_map.keys()))
+    known_nemos = trades_df.loc[known, 'Nemo']
+    known_df = trades_df[known].assign(
+        instrument_id=known_nemos.map({nemo: info['id'] for nemo, info in instrument_map.items()}),
+        instrument_name=known_nemos.map({nemo: info['name'] for nemo, info in instrument_map.items()}),
+        trade_date=trade_date,
+        quantity=trades_df.loc[known, 'Cantidad'].astype('int64')
+    )
+    columns = {'instrument_id': 'instrument_id', 'instrument_name': 'instrument_name'}
+    if include_ticker:
+        columns['Nemo'] = 'ticker'
+    columns.update({
+        'trade_date': 'trade_date', 'quantity': 'quantity', 'Monto_Transado': 'amount_clp',
+        'Precio_Cierre': 'closing_price_percent', 'TIR_Media': 'average_yield'
+    })
+    records = dataframe_to_records(known_df, columns=columns)
+    return records, trades_df.loc[~known, 'Nemo'].tolist()
+
 def process_and_save_data(trades_df: pd.DataFrame, trade_date: str, instrument_map: dict):
-    records_to_upsert = []
-    missing_instruments = []
-
-    for _, row in trades_df.iterrows():
-        nemo = row['Nemo']
-        instrument_info = instrument_map.get(nemo)
-
-        if instrument_info:
-            record = {
-                'instrument_id': instrument_info['id'],
-                'instrument_name': instrument_info['name'],
-                'trade_date': trade_date,
-                'quantity': int(row['Cantidad']),
-                'amount_clp': row['Monto_Transado'],
-                'closing_price_percent': row['Precio_Cierre'],
-                'average_yield': row['TIR_Media']
-            }
-            records_to_upsert.append(record)
-        else:
-            missing_instruments.append(nemo)
+    records_to_upsert, missing_instruments = _build_fixed_income_records(trades_df, trade_date, instrument_map)
     
     if missing_instruments:
         print(f"\n⚠️ ADVERTENCIA: No se procesarán los siguientes instrumentos por no estar en la BD: {len(set(missing_instruments))} tickers.")
@@ -188,18 +194,8 @@ if __name__ == '__main__':
             all_rf_tickers = set(instrument_universe_map.keys())
             missing_tickers = all_rf_tickers - tickers_traded_today
             
-            records_to_upsert = []
-
             # --- PASO 4 (A): PREPARAR REGISTROS DE BONOS QUE SÍ TRANSARON ---
-            for _, row in trades_today_df.iterrows():
-                instrument_info = instrument_universe_map.get(row['Nemo'])
-                if instrument_info:
-                    records_to_upsert.append({
-                        'instrument_id': instrument_info['id'], 'instrument_name': instrument_info['name'], 'ticker': row['Nemo'],
-                        'trade_date': trade_date, 'quantity': int(row['Cantidad']),
-                        'amount_clp': row['Monto_Transado'], 'closing_price_percent': row['Precio_Cierre'],
-                        'average_yield': row['TIR_Media']
-                    })
+            records_to_upsert, _ = _build_fixed_income_records(trades_today_df, trade_date, instrument_universe_map, include_ticker=True)
 
             # --- PASO 4 (B): BUSCAR ÚLTIMO PRECIO Y RELLENAR (LÓGICA SIMPLIFICADA) ---
             if missing_tickers:
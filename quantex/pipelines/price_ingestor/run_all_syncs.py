@@ -5,6 +5,7 @@ import sys
 import logging
 from datetime import datetime, timedelta
 import pandas as pd
+import threading
 import traceback
 
 # --- Configuración de Rutas y Conexión ---
@@ -27,18 +28,31 @@ class SyncReport:
         self.results = {}
         self.errors = {}
         self.summary = {}
+        self.stage_timings = {}
+        self.critical_path = []
+        self.critical_path_seconds = 0.0
+        # Las etapas se ejecutan en paralelo (SyncScheduler): proteger los dicts
+        self._lock = threading.Lock()
         
-    def add_result(self, source, success, details=None, error=None):
+    def add_result(self, source, success, details=None, error=None, partial=False):
         """Agrega un resultado de sincronización"""
-        self.results[source] = {
-            'success': success,
-            'details': details or {},
-            'error': error,
-            'timestamp': datetime.now()
-        }
-        
-        if not success and error:
-            self.errors[source] = error
+        with self._lock:
+            self.results[source] = {
+                'success': success,
+                'partial': partial,
+                'details': details or {},
+                'error': error,
+                'timestamp': datetime.now()
+            }
+            
+            if not success and error:
+                self.errors[source] = error
+
+    def set_stage_timings(self, timings: dict, critical_path: list, critical_path_seconds: float):
+        """Registra el tiempo de pared por etapa y el camino crítico del DAG"""
+        self.stage_timings = timings
+        self.critical_path = critical_path
+        self.critical_path_seconds = critical_path_seconds
             
     def finalize(self):
         """Finaliza el reporte y genera estadísticas"""
@@ -95,6 +109,17 @@ class SyncReport:
             if not result['success'] and result['error']:
                 report += f"   Error: {result['error']}\n"
         
+        if self.stage_timings:
+            report += f"""
+{'='*80}
+⏱️  TIEMPOS POR ETAPA:
+{'='*80}
+"""
+            for stage, timing in sorted(self.stage_timings.items(), key=lambda item: item[1]['started_at']):
+                marker = "🔥" if stage in self.critical_path else "  "
+                report += f"   {marker} {stage:<28} [{timing['lane']:<10}] {timing['started_at'].strftime('%H:%M:%S')} → {timing['ended_at'].strftime('%H:%M:%S')}  ({timing['wall_time_s']}s)\n"
+            report += f"\n   🔥 Camino crítico ({self.critical_path_seconds}s): {' → '.join(self.critical_path)}\n"
+
         if self.errors:
             report += f"""
 {'='*80}
@@ -147,6 +172,7 @@ from quantex.pipelines.price_ingestor.sync_bcentral import sync_all_bcentral_ser
 from quantex.pipelines.price_ingestor.cochilco_final_bot import FinalCochilcoBot
 from quantex.pipelines.price_ingestor.smm_playwright_bot import SMMPlaywrightBot
 from quantex.pipelines.price_ingestor.benchmarks import sync_btp_benchmarks, sync_latam_currency_index, sync_latam_currency_index_historical
+from quantex.pipelines.price_ingestor.sync_scheduler import SyncStage, SyncScheduler
 
 def sync_cochilco_inventories(report):
     """
@@ -293,10 +319,11 @@ def forward_fill_business_days_for_ticker(ticker: str) -> dict:
 
 
 def forward_fill_business_days_for_tickers(tickers: list[str]) -> dict:
-    summary = {}
-    for t in tickers:
-        summary[t] = forward_fill_business_days_for_ticker(t)
-    return summary
+    try:
+        return forward_fill_series_bulk(tickers, mode='daily')
+    except Exception as e:
+        logging.error(f"ForwardFill bulk error, usando modo por ticker: {e}")
+        return {t: forward_fill_business_days_for_ticker(t) for t in tickers}
 
 
 def forward_fill_monthly_series_for_ticker(ticker: str) -> dict:
@@ -364,11 +391,259 @@ def forward_fill_monthly_series_for_ticker(ticker: str) -> dict:
 
 def forward_fill_monthly_series_for_tickers(tickers: list[str]) -> dict:
     """Aplica forward fill mensual a múltiples tickers."""
+    try:
+        return forward_fill_series_bulk(tickers, mode='monthly')
+    except Exception as e:
+        logging.error(f"ForwardFillMonthly bulk error, usando modo por ticker: {e}")
+        return {t: forward_fill_monthly_series_for_ticker(t) for t in tickers}
+
+# --- Forward Fill masivo: pocas consultas para N series ---
+FORWARD_FILL_UPSERT_CHUNK = 1000
+# Ventana de respaldo si la RPC 'latest_time_series_points' no está desplegada
+FORWARD_FILL_LOOKBACK_DAYS = 45
+
+
+def _get_series_ids_by_tickers(tickers: list[str]) -> dict:
+    """Resuelve {ticker: series_id} con una sola consulta a series_definitions."""
+    res = supabase.table('series_definitions').select('id,ticker').in_('ticker', tickers).execute()
+    series_ids = {}
+    for row in (res.data or []):
+        # Igual que _get_series_id_by_ticker: se queda con la primera coincidencia
+        series_ids.setdefault(row['ticker'], row['id'])
+    return series_ids
+
+
+def _get_latest_points(series_ids: list[str]) -> dict:
+    """
+    Último punto {series_id: {'timestamp', 'value'}} de muchas series.
+    Usa la RPC agrupada (supabase/migrations/*_latest_time_series_points.sql)
+    y, si no existe, una consulta paginada acotada a los últimos días más una
+    consulta individual solo para las series que no tengan datos recientes.
+    """
+    if not series_ids:
+        return {}
+    try:
+        res = supabase.rpc('latest_time_series_points', {'series_ids': series_ids}).execute()
+        return {row['series_id']: row for row in (res.data or [])}
+    except Exception as e:
+        logging.warning(f"ForwardFill: RPC latest_time_series_points no disponible ({e}). Usando consulta por ventana.")
+
+    latest = {}
+    since = (datetime.now() - timedelta(days=FORWARD_FILL_LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+    page_size, offset = 1000, 0
+    while True:
+        res = supabase.table('time_series_data').select('series_id,timestamp,value') \
+            .in_('series_id', series_ids).gte('timestamp', since) \
+            .order('timestamp', desc=True).range(offset, offset + page_size - 1).execute()
+        rows = res.data or []
+        for row in rows:
+            latest.setdefault(row['series_id'], row)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+
+    for series_id in series_ids:
+        if series_id in latest:
+            continue
+        res = supabase.table('time_series_data').select('timestamp,value').eq('series_id', series_id).order('timestamp', desc=True).limit(1).execute()
+        if res and res.data:
+            latest[series_id] = res.data[0]
+    return latest
+
+
+def forward_fill_series_bulk(tickers: list[str], mode: str = 'daily') -> dict:
+    """
+    Forward fill de muchas series con un puñado de requests:
+    1 consulta de series_id, 1 RPC de últimos puntos, y upserts en lotes.
+
+    mode='daily'   -> misma semántica que forward_fill_business_days_for_ticker
+    mode='monthly' -> misma semántica que forward_fill_monthly_series_for_ticker
+    Devuelve {ticker: resumen} con el mismo formato que las funciones por ticker.
+    """
+    log_name = "ForwardFill" if mode == 'daily' else "ForwardFillMonthly"
     summary = {}
-    for t in tickers:
-        summary[t] = forward_fill_monthly_series_for_ticker(t)
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return summary
+
+    series_ids = _get_series_ids_by_tickers(tickers)
+    latest = _get_latest_points(list(dict.fromkeys(series_ids.values())))
+
+    today = pd.Timestamp(datetime.now().date())
+    frame_rows = []
+    for ticker in tickers:
+        series_id = series_ids.get(ticker)
+        if not series_id:
+            summary[ticker] = {"ticker": ticker, "filled": 0, "status": "series_not_found"}
+        elif series_id not in latest:
+            summary[ticker] = {"ticker": ticker, "filled": 0, "status": "no_existing_data"}
+        else:
+            point = latest[series_id]
+            # Normalizar timestamp a 'YYYY-MM-DD' (algunas filas vienen con 'T00:00:00+00:00')
+            frame_rows.append((ticker, series_id, str(point['timestamp'])[:10], point['value']))
+
+    if not frame_rows:
+        return summary
+
+    last = pd.DataFrame(frame_rows, columns=['ticker', 'series_id', 'last_date', 'value'])
+    last['last_date'] = pd.to_datetime(last['last_date'])
+    up_to_date = last['last_date'] >= today
+    for ticker in last.loc[up_to_date, 'ticker']:
+        summary[ticker] = {"ticker": ticker, "filled": 0, "status": "up_to_date"}
+    last = last[~up_to_date].copy()
+
+    # Primer día hábil a rellenar, vectorizado sobre todas las series:
+    #   daily:   último dato + 1 día hábil
+    #   monthly: bdate_range(desde el último dato) sin su primer elemento
+    bday = pd.offsets.BDay
+    if mode == 'monthly':
+        last['start'] = (last['last_date'] + bday(0)) + bday(1)
+    else:
+        last['start'] = last['last_date'] + bday(1)
+
+    no_gap = last['start'] > today
+    for ticker in last.loc[no_gap, 'ticker']:
+        summary[ticker] = {"ticker": ticker, "filled": 0, "status": "no_business_days_to_fill"}
+    last = last[~no_gap]
+    if last.empty:
+        return summary
+
+    # Producto cruzado contra un único calendario hábil y filtro por serie
+    calendar = pd.DataFrame({'timestamp': pd.bdate_range(start=last['start'].min(), end=today, freq='B')})
+    gaps = last.merge(calendar, how='cross')
+    gaps = gaps[gaps['timestamp'] >= gaps['start']]
+    gaps['timestamp'] = gaps['timestamp'].dt.strftime('%Y-%m-%d')
+    records = gaps[['series_id', 'timestamp', 'value', 'ticker']].to_dict('records')
+
+    filled = dict.fromkeys(last['ticker'], 0)
+    failed = set()
+    for start in range(0, len(records), FORWARD_FILL_UPSERT_CHUNK):
+        chunk = records[start:start + FORWARD_FILL_UPSERT_CHUNK]
+        try:
+            upsert = supabase.table('time_series_data').upsert(chunk, on_conflict='series_id,timestamp').execute()
+            if upsert and upsert.data is not None:
+                for record in chunk:
+                    filled[record['ticker']] += 1
+        except Exception as e:
+            logging.error(f"{log_name} bulk: error en upsert de lote ({len(chunk)} filas): {e}")
+            failed.update(record['ticker'] for record in chunk)
+
+    for row in last.itertuples(index=False):
+        if row.ticker in failed:
+            summary[row.ticker] = {"ticker": row.ticker, "filled": filled[row.ticker], "status": "error: upsert_failed"}
+            continue
+        result = {
+            "ticker": row.ticker, "filled": filled[row.ticker], "status": "ok",
+            "from": (row.last_date if mode == 'monthly' else row.start).strftime('%Y-%m-%d'),
+            "to": today.strftime('%Y-%m-%d')
+        }
+        if mode == 'monthly':
+            result["last_value"] = row.value
+        logging.info(f"{log_name}[{row.ticker}]: desde {result['from']} hasta {result['to']} -> {filled[row.ticker]} días hábiles")
+        summary[row.ticker] = result
+
     return summary
 
+
+# --- Grafo de etapas de la sincronización diaria ---
+# Cada carril agrupa las etapas que comparten un recurso con límite propio:
+#   - una API externa con cuota (EODHD: OHLCV + Treasuries comparten API key)
+#   - "browser": los bots Selenium/Playwright, que deben ir de a uno
+#   - "supabase": pasos derivados que solo leen/escriben en la base
+SYNC_LANE_LIMITS = {
+    'yahoo': 1,
+    'eodhd': 1,
+    'bce': 1,
+    'bcentral': 1,
+    'browser': 1,
+    'supabase': 2,
+}
+
+DAILY_FORWARD_FILL_TICKERS = [
+    # SMM precios diarios
+    'shfe', 'lme', 'Lithium China',
+    # Inventarios Cochilco (según mapeo en cochilco_final_bot)
+    'inventarios_lme', 'inventarios_comex', 'inventarios_shfe', 'inventarios_totales',
+    # Series Banco Central de Chile (según sync_bcentral)
+    'chile_tpm', 'Posicion Extranjera CLP', 'us_tpm',
+]
+
+# Series mensuales de expectativas del BCCh
+MONTHLY_FORWARD_FILL_TICKERS = [
+    'bcch_expectativas_tpm_prox_reunion',
+    'bcch_expectativas_tpm_subsiguiente_reunion',
+]
+
+
+def _run_simple_sync(report, source: str, func, details: dict | None = None, details_from_result: bool = False):
+    """Ejecuta una sincronización y registra el resultado (patrón común de las fuentes HTTP)."""
+    try:
+        result = func()
+        report.add_result(source, True, result if details_from_result else details)
+        logging.info(f"{source}: Sincronización exitosa" + (f" {result}" if details_from_result else ""))
+    except Exception as e:
+        error_msg = f"Error en {source}: {e}"
+        logging.error(error_msg)
+        report.add_result(source, False, error=error_msg)
+
+
+def _run_forward_fill_daily(report):
+    try:
+        ff_summary = forward_fill_business_days_for_tickers(DAILY_FORWARD_FILL_TICKERS)
+        report.add_result("ForwardFill Daily", True, ff_summary)
+        logging.info(f"ForwardFill Daily resumen: {ff_summary}")
+    except Exception as e:
+        error_msg = f"Error en ForwardFill centralizado: {e}"
+        logging.error(error_msg)
+        report.add_result("ForwardFill Daily", False, error=error_msg)
+
+
+def _run_forward_fill_monthly(report):
+    try:
+        ff_monthly_summary = forward_fill_monthly_series_for_tickers(MONTHLY_FORWARD_FILL_TICKERS)
+        report.add_result("ForwardFill Monthly", True, ff_monthly_summary)
+        logging.info(f"ForwardFill Monthly resumen: {ff_monthly_summary}")
+        
+        # Log detallado de cada serie mensual
+        for ticker, result in ff_monthly_summary.items():
+            if result.get('status') == 'ok':
+                print(f"   ✅ {ticker}: {result.get('filled')} días rellenados con valor {result.get('last_value')}")
+            else:
+                print(f"   ⚠️ {ticker}: {result.get('status')}")
+    except Exception as e:
+        error_msg = f"Error en ForwardFill Monthly: {e}"
+        logging.error(error_msg)
+        report.add_result("ForwardFill Monthly", False, error=error_msg)
+
+
+def _build_sync_stages(report) -> list[SyncStage]:
+    """Define las etapas de la sincronización diaria con sus carriles y dependencias."""
+    return [
+        # --- Renta Variable y Similares (OHLCV) ---
+        SyncStage("Yahoo Finance", lambda: _run_simple_sync(report, "Yahoo Finance", sync_yfinance_data_to_supabase, {"tipo": "OHLCV"}), lane='yahoo'),
+        SyncStage("EODHD OHLCV", lambda: _run_simple_sync(report, "EODHD OHLCV", sync_eodhd_data_to_supabase, {"tipo": "OHLCV"}), lane='eodhd'),
+        # --- Renta Fija Internacional ---
+        SyncStage("US Treasuries", lambda: _run_simple_sync(report, "US Treasuries", sync_us_treasuries_yields, {"tipo": "Renta Fija"}), lane='eodhd'),
+        SyncStage("BCE Rates", lambda: _run_simple_sync(report, "BCE Rates", sync_bce_rates, {"tipo": "Renta Fija"}), lane='bce'),
+        # --- Indicadores Económicos Chile (TPM y Posición Forward Extranjeros) ---
+        SyncStage("Banco Central Chile", lambda: _run_simple_sync(report, "Banco Central Chile", sync_all_bcentral_series, {"tipo": "Indicadores Económicos"}), lane='bcentral'),
+        # --- Benchmarks Renta Fija Chile (BTP 2/5/10), desde la ingesta PDF ---
+        SyncStage("BTP Benchmarks", lambda: _run_simple_sync(report, "BTP Benchmarks", sync_btp_benchmarks, details_from_result=True), lane='supabase'),
+        # --- Índice de Monedas LATAM: se calcula sobre los OHLCV recién sincronizados ---
+        SyncStage("LATAM Currency Index", lambda: _run_simple_sync(report, "LATAM Currency Index", sync_latam_currency_index, details_from_result=True),
+                  lane='supabase', depends_on=["Yahoo Finance", "EODHD OHLCV"]),
+        SyncStage("LATAM Historical Series", lambda: _run_simple_sync(report, "LATAM Historical Series", lambda: sync_latam_currency_index_historical(days_back=1000), details_from_result=True),
+                  lane='supabase', depends_on=["LATAM Currency Index"]),
+        # --- Bots de navegador: serializados en su propio carril ---
+        SyncStage("Cochilco", lambda: sync_cochilco_inventories(report), lane='browser'),
+        SyncStage("SMM", lambda: sync_smm_prices(report), lane='browser'),
+        # --- Forward Fill: solo cuando sus series de entrada terminaron ---
+        SyncStage("ForwardFill Daily", lambda: _run_forward_fill_daily(report),
+                  lane='supabase', depends_on=["SMM", "Cochilco", "Banco Central Chile"]),
+        SyncStage("ForwardFill Monthly", lambda: _run_forward_fill_monthly(report),
+                  lane='supabase', depends_on=["Banco Central Chile"]),
+    ]
+
 def orchestrate_all_syncs():
     """
     Orquesta la sincronización de todas las fuentes de datos AUTOMÁTICAS
@@ -396,157 +671,11 @@ def orchestrate_all_syncs():
         return
 
     try:
-        # --- Tareas de Renta Variable y Similares (OHLCV) ---
-        print("\n--- ▶️  Iniciando sincronización de datos OHLCV... ---")
-        logging.info("Iniciando sincronización OHLCV")
-        
-        try:
-            sync_yfinance_data_to_supabase()
-            report.add_result("Yahoo Finance", True, {"tipo": "OHLCV"})
-            logging.info("Yahoo Finance: Sincronización exitosa")
-        except Exception as e:
-            error_msg = f"Error en Yahoo Finance: {e}"
-            logging.error(error_msg)
-            report.add_result("Yahoo Finance", False, error=error_msg)
-        
-        try:
-            sync_eodhd_data_to_supabase() # La parte de OHLCV de EODHD
-            report.add_result("EODHD OHLCV", True, {"tipo": "OHLCV"})
-            logging.info("EODHD OHLCV: Sincronización exitosa")
-        except Exception as e:
-            error_msg = f"Error en EODHD OHLCV: {e}"
-            logging.error(error_msg)
-            report.add_result("EODHD OHLCV", False, error=error_msg)
-
-        # --- Tareas de Renta Fija Internacional ---
-        print("\n--- ▶️  Iniciando sincronización de Renta Fija Internacional... ---")
-        logging.info("Iniciando sincronización Renta Fija Internacional")
-        
-        try:
-            sync_us_treasuries_yields() # Bonos USA de EODHD
-            report.add_result("US Treasuries", True, {"tipo": "Renta Fija"})
-            logging.info("US Treasuries: Sincronización exitosa")
-        except Exception as e:
-            error_msg = f"Error en US Treasuries: {e}"
-            logging.error(error_msg)
-            report.add_result("US Treasuries", False, error=error_msg)
-        
-        try:
-            sync_bce_rates()            # Curva de rendimientos de BCE
-            report.add_result("BCE Rates", True, {"tipo": "Renta Fija"})
-            logging.info("BCE Rates: Sincronización exitosa")
-        except Exception as e:
-            error_msg = f"Error en BCE Rates: {e}"
-            logging.error(error_msg)
-            report.add_result("BCE Rates", False, error=error_msg)
-
-        # --- Tareas de Indicadores Económicos Chile ---
-        print("\n--- ▶️  Iniciando sincronización de Indicadores Económicos Chile... ---")
-        logging.info("Iniciando sincronización Indicadores Económicos Chile")
-        
-        try:
-            sync_all_bcentral_series()  # TPM y Posición Forward Extranjeros
-            report.add_result("Banco Central Chile", True, {"tipo": "Indicadores Económicos"})
-            logging.info("Banco Central Chile: Sincronización exitosa")
-        except Exception as e:
-            error_msg = f"Error en Banco Central Chile: {e}"
-            logging.error(error_msg)
-            report.add_result("Banco Central Chile", False, error=error_msg)
-
-        # --- Benchmarks Renta Fija Chile (BTP 2/5/10) ---
-        print("\n--- ▶️  Actualizando Benchmarks BTP (CLP) ... ---")
-        try:
-            bench_res = sync_btp_benchmarks()
-            report.add_result("BTP Benchmarks", True, bench_res)
-            logging.info(f"BTP Benchmarks: {bench_res}")
-        except Exception as e:
-            error_msg = f"Error en BTP Benchmarks: {e}"
-            logging.error(error_msg)
-            report.add_result("BTP Benchmarks", False, error=error_msg)
-
-        # --- Índice de Monedas LATAM ---
-        print("\n--- ▶️  Actualizando Índice de Monedas LATAM ... ---")
-        try:
-            latam_res = sync_latam_currency_index()
-            report.add_result("LATAM Currency Index", True, latam_res)
-            logging.info(f"LATAM Currency Index: {latam_res}")
-        except Exception as e:
-            error_msg = f"Error en LATAM Currency Index: {e}"
-            logging.error(error_msg)
-            report.add_result("LATAM Currency Index", False, error=error_msg)
-
-        # --- Serie Histórica Índice LATAM ---
-        print("\n--- ▶️  Generando Serie Histórica Índice LATAM ... ---")
-        try:
-            historical_res = sync_latam_currency_index_historical(days_back=1000)
-            report.add_result("LATAM Historical Series", True, historical_res)
-            logging.info(f"LATAM Historical Series: {historical_res}")
-        except Exception as e:
-            error_msg = f"Error en Serie Histórica LATAM: {e}"
-            logging.error(error_msg)
-            report.add_result("LATAM Historical Series", False, error=error_msg)
-
-        # --- Tareas de Inventarios de Cobre (Cochilco) ---
-        print("\n--- ▶️  Iniciando sincronización de Inventarios de Cobre... ---")
-        sync_cochilco_inventories(report)
-
-        # --- Tareas de Precios SMM (Cobre + Litio) ---
-        print("\n--- ▶️  Iniciando sincronización de Precios SMM... ---")
-        sync_smm_prices(report)
-
-        # --- Forward Fill centralizado para series diarias (Business Days) ---
-        print("\n--- ▶️  Forward Fill (Business Days) para series diarias ... ---")
-        try:
-            # SMM precios diarios
-            smm_tickers = ['shfe', 'lme', 'Lithium China']
-
-            # Inventarios Cochilco (según mapeo en cochilco_final_bot)
-            cochilco_inventory_tickers = [
-                'inventarios_lme',
-                'inventarios_comex',
-                'inventarios_shfe',
-                'inventarios_totales'
-            ]
-
-            # Series Banco Central de Chile (según sync_bcentral)
-            bcch_tickers = [
-                'chile_tpm',
-                'Posicion Extranjera CLP',
-                'us_tpm'
-            ]
-
-            all_ff_tickers = smm_tickers + cochilco_inventory_tickers + bcch_tickers
-            ff_summary = forward_fill_business_days_for_tickers(all_ff_tickers)
-            report.add_result("ForwardFill Daily", True, ff_summary)
-            logging.info(f"ForwardFill Daily resumen: {ff_summary}")
-        except Exception as e:
-            error_msg = f"Error en ForwardFill centralizado: {e}"
-            logging.error(error_msg)
-            report.add_result("ForwardFill Daily", False, error=error_msg)
-
-        # --- Forward Fill para series mensuales (Expectativas TPM) ---
-        print("\n--- ▶️  Forward Fill (Monthly Series) para expectativas mensuales ... ---")
-        try:
-            # Series mensuales de expectativas del BCCh
-            monthly_bcch_tickers = [
-                'bcch_expectativas_tpm_prox_reunion',
-                'bcch_expectativas_tpm_subsiguiente_reunion'
-            ]
-
-            ff_monthly_summary = forward_fill_monthly_series_for_tickers(monthly_bcch_tickers)
-            report.add_result("ForwardFill Monthly", True, ff_monthly_summary)
-            logging.info(f"ForwardFill Monthly resumen: {ff_monthly_summary}")
-            
-            # Log detallado de cada serie mensual
-            for ticker, result in ff_monthly_summary.items():
-                if result.get('status') == 'ok':
-                    print(f"   ✅ {ticker}: {result.get('filled')} días rellenados con valor {result.get('last_value')}")
-                else:
-                    print(f"   ⚠️ {ticker}: {result.get('status')}")
-        except Exception as e:
-            error_msg = f"Error en ForwardFill Monthly: {e}"
-            logging.error(error_msg)
-            report.add_result("ForwardFill Monthly", False, error=error_msg)
+        scheduler = SyncScheduler(_build_sync_stages(report), lane_limits=SYNC_LANE_LIMITS)
+        scheduler.run()
+        critical_path, critical_seconds = scheduler.critical_path()
+        report.set_stage_timings(scheduler.timings, critical_path, critical_seconds)
+        logging.info(f"Camino crítico ({critical_seconds}s): {' -> '.join(critical_path)}")
 
         print("\n\n--- ✅ Orquestación Automática Completada Exitosamente ---")
         print("ℹ️  Nota: La ingesta de Renta Fija local (PDF) se ejecuta por separado.")
@@ -2,9 +2,11 @@
 
 import os
 import sys
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Configuración de Rutas ---
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
@@ -13,6 +15,19 @@ if PROJECT_ROOT not in sys.path:
 
 from quantex.core.database_manager import supabase
 
+# --- Auditoría masiva ---
+AUDIT_ROW_LIMIT = 800            # Registros recientes auditados por serie
+AUDIT_SERIES_PER_REQUEST = 25    # Series por llamada RPC
+AUDIT_MAX_WORKERS = 6            # Llamadas simultáneas a Supabase
+AUDIT_STALE_DAYS = 5
+
+# RPCs de ventana reciente (supabase/migrations/*_audit_recent_series.sql): tabla -> (función, parámetro)
+AUDIT_RPCS = {
+    'market_data_ohlcv': ('audit_recent_market_data', 'tickers'),
+    'fixed_income_trades': ('audit_recent_fixed_income', 'instrument_names'),
+    'time_series_data': ('audit_recent_time_series', 'series_ids'),
+}
+
 def audit_series(table_name: str, ticker_col: str, ticker_value: str, date_col: str, value_col: str, display_name: str | None = None):
     """
     Audita los últimos 800 registros de una única serie de tiempo.
@@ -66,6 +81,133 @@ def audit_series(table_name: str, ticker_col: str, ticker_value: str, date_col:
 
     return result
 
+def _fetch_recent_windows(table_name: str, keys: list) -> tuple[pd.DataFrame, dict]:
+    """
+    Últimos AUDIT_ROW_LIMIT registros de varias series en una llamada RPC.
+    Devuelve (filas largas [key, date], {key: nulos}); las series sin datos no aparecen.
+    """
+    rpc_name, param = AUDIT_RPCS[table_name]
+    res = supabase.rpc(rpc_name, {param: keys, 'row_limit': AUDIT_ROW_LIMIT}).execute()
+    rows = res.data or []
+    long_rows = pd.DataFrame({
+        'key': [row['series_key'] for row in rows for _ in (row['obs_dates'] or [])],
+        'date': [d for row in rows for d in (row['obs_dates'] or [])],
+    })
+    return long_rows, {row['series_key']: int(row['null_values'] or 0) for row in rows}
+
+
+def summarize_recent_windows(windows: pd.DataFrame, null_counts: dict) -> pd.DataFrame:
+    """
+    Métricas de audit_series para todas las series a la vez (un groupby vectorizado):
+    rango de fechas, registros, nulos, antigüedad y gaps de días hábiles.
+
+    gaps replica pd.date_range(min, max, freq='B').difference(fechas): los días hábiles
+    a la hora del primer registro entre min y max, menos los registros que caen en ellos.
+    """
+    if windows.empty:
+        return pd.DataFrame(columns=['min_date', 'max_date', 'records', 'nulls', 'gaps', 'stale'])
+
+    dates = pd.to_datetime(windows['date'], format='ISO8601', utc=True).dt.tz_localize(None)
+    keys = windows['key']
+    grouped = dates.groupby(keys)
+    stats = pd.DataFrame({'min_date': grouped.min(), 'max_date': grouped.max(), 'records': grouped.size()})
+    stats['nulls'] = stats.index.map(lambda k: null_counts.get(k, 0)).astype(int)
+
+    # Hora del día del primer registro: la grilla 'B' de date_range la conserva
+    first_day = stats['min_date'].dt.normalize()
+    time_of_day = stats['min_date'] - first_day
+    # Un 'end' en fin de semana: si el inicio cae en día hábil, date_range lo retrocede
+    # al viernes con su misma hora; si el inicio cae en fin de semana no lo retrocede
+    # y el viernes a la hora de la grilla siempre entra.
+    weekend_days = (stats['max_date'].dt.dayofweek - 4).clip(lower=0)
+    last_date = stats['max_date'] - pd.to_timedelta(weekend_days, unit='D')
+    last_day = last_date.dt.normalize()
+    end_on_grid = (last_date - last_day >= time_of_day) | ((weekend_days > 0) & (stats['min_date'].dt.dayofweek >= 5))
+    last_day = last_day.where(end_on_grid, last_day - pd.Timedelta(days=1))
+    expected = np.busday_count(
+        first_day.values.astype('datetime64[D]'),
+        (last_day + pd.Timedelta(days=1)).values.astype('datetime64[D]'),
+    ).clip(min=0)
+
+    # Registros (distintos) que caen exactamente sobre la grilla de días hábiles,
+    # sin pasar del último punto de la grilla
+    row_first = keys.map(stats['min_date'])
+    row_grid_end = keys.map(last_day + time_of_day)
+    on_grid = ((dates - row_first) % pd.Timedelta(days=1) == pd.Timedelta(0)) & (dates.dt.dayofweek < 5) & (dates <= row_grid_end)
+    matched = pd.DataFrame({'key': keys[on_grid], 'date': dates[on_grid]}).drop_duplicates().groupby('key').size()
+
+    stats['gaps'] = expected - matched.reindex(stats.index, fill_value=0).values
+    stats['stale'] = stats['max_date'] < (datetime.now() - timedelta(days=AUDIT_STALE_DAYS))
+    return stats
+
+
+def _build_result(table_name: str, name: str, row) -> dict:
+    """Traduce una fila de summarize_recent_windows al formato de audit_series."""
+    result = {"table": table_name, "name": name, "status": "✅ OK", "date_range": "N/A", "records": 0, "nulls": 0, "gaps": 0}
+    if row is None:
+        result["status"] = "🟡 Advertencia"
+        result["date_range"] = "Sin datos"
+        return result
+    result["date_range"] = f"{row.min_date.strftime('%Y-%m-%d')} a {row.max_date.strftime('%Y-%m-%d')}"
+    result["records"] = int(row.records)
+    result["nulls"] = int(row.nulls)
+    result["gaps"] = int(row.gaps)
+    if row.nulls > 0 or row.stale:
+        result["status"] = "🟡 Advertencia"
+    if row.gaps > 0:
+        result["status"] = "🚨 Crítico"
+    return result
+
+
+def audit_series_bulk(table_name: str, ticker_col: str, date_col: str, value_col: str, series: dict,
+                      max_workers: int = AUDIT_MAX_WORKERS) -> list:
+    """
+    Audita muchas series de una tabla con el mismo resultado que audit_series.
+
+    Args:
+        series: {valor de ticker_col: nombre a mostrar}
+
+    Las ventanas recientes se piden en lotes de AUDIT_SERIES_PER_REQUEST series por
+    RPC, en paralelo con un pool acotado; las métricas se calculan para todas las
+    series en una sola pasada vectorizada. Si un lote falla (p. ej. la RPC no está
+    desplegada), esas series se auditan una a una con audit_series.
+    """
+    keys = [str(k) for k in series]
+    names = {str(k): v for k, v in series.items()}
+    chunks = [keys[i:i + AUDIT_SERIES_PER_REQUEST] for i in range(0, len(keys), AUDIT_SERIES_PER_REQUEST)]
+    if not chunks:
+        return []
+
+    def fetch(chunk):
+        try:
+            return chunk, _fetch_recent_windows(table_name, chunk), None
+        except Exception as e:
+            return chunk, None, e
+
+    windows, null_counts, fallback_keys = [], {}, []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))), thread_name_prefix="audit") as executor:
+        for chunk, fetched, error in executor.map(fetch, chunks):
+            if error is not None:
+                print(f" -> ⚠️ {table_name}: ventana masiva no disponible ({error}). Auditando {len(chunk)} series una a una.")
+                fallback_keys.extend(chunk)
+                continue
+            windows.append(fetched[0])
+            null_counts.update(fetched[1])
+
+        fallback_results = list(executor.map(
+            lambda key: audit_series(table_name, ticker_col, key, date_col, value_col, display_name=names[key]),
+            fallback_keys
+        ))
+
+    stats = summarize_recent_windows(pd.concat(windows, ignore_index=True) if windows else pd.DataFrame(columns=['key', 'date']), null_counts)
+    fallback = set(fallback_keys)
+    results = [
+        _build_result(table_name, names[key], stats.loc[key] if key in stats.index else None)
+        for key in keys if key not in fallback
+    ]
+    return results + fallback_results
+
+
 def generate_html_report(audit_results: list):
     """
     Toma una lista de resultados de auditoría y genera un reporte HTML.
@@ -136,48 +278,48 @@ def generate_html_report(audit_results: list):
     print(f"\n--- ✅ Reporte Finalizado. Abre el archivo '{report_filename}' en tu navegador. ---")
 
 
-def main():
-    print("--- 🩺 Iniciando Auditoría de Datos de Quantex (Modo Rápido: 800 registros) ---")
+def main(bulk: bool = True):
+    """
+    Args:
+        bulk: True = auditoría masiva (RPC por lotes + pool + pasada vectorizada);
+              False = una consulta por serie, en serie (modo anterior).
+    """
+    print(f"--- 🩺 Iniciando Auditoría de Datos de Quantex (Modo Rápido: {AUDIT_ROW_LIMIT} registros{', masivo' if bulk else ''}) ---")
     if not supabase: return
 
     all_audit_results = []
+    audits = []  # (tabla, columna clave, columna fecha, columna valor, {clave: nombre a mostrar})
     
     # 1. Auditar market_data_ohlcv
     defs_res = supabase.table('instrument_definitions').select('ticker').eq('is_active', True).execute()
     if defs_res.data:
-        for item in defs_res.data:
-            result = audit_series('market_data_ohlcv', 'ticker', item['ticker'], 'timestamp', 'close')
-            all_audit_results.append(result)
+        audits.append(('market_data_ohlcv', 'ticker', 'timestamp', 'close',
+                       {item['ticker']: item['ticker'] for item in defs_res.data}))
     
     # 2. Auditar fixed_income_trades
     defs_res = supabase.table('fixed_income_definitions').select('name').execute()
     if defs_res.data:
-        for item in defs_res.data:
-            result = audit_series('fixed_income_trades', 'instrument_name', item['name'], 'trade_date', 'average_yield')
-            all_audit_results.append(result)
+        audits.append(('fixed_income_trades', 'instrument_name', 'trade_date', 'average_yield',
+                       {item['name']: item['name'] for item in defs_res.data}))
 
     # 3. Auditar time_series_data
-    # --- INICIO DE LA CORRECCIÓN ---
-    # Ahora pedimos el id y el ticker para usar el ticker en el reporte
+    # Pedimos el id y el ticker para usar el ticker en el reporte
     defs_res = supabase.table('series_definitions').select('id, ticker').execute()
     if defs_res.data:
         series_map = {item['id']: item['ticker'] for item in defs_res.data if item.get('ticker')}
         print(f" -> Encontradas {len(series_map)} series en la tabla de definiciones.")
-        for series_id, ticker_name in series_map.items():
-            result = audit_series(
-                table_name='time_series_data', 
-                ticker_col='series_id', 
-                ticker_value=series_id, 
-                date_col='timestamp', 
-                value_col='value',
-                display_name=ticker_name # <--- Le pasamos el ticker como nombre descriptivo
-            )
-            all_audit_results.append(result)
-    # --- FIN DE LA CORRECCIÓN ---
+        audits.append(('time_series_data', 'series_id', 'timestamp', 'value', series_map))
+
+    for table_name, ticker_col, date_col, value_col, series in audits:
+        if bulk:
+            all_audit_results.extend(audit_series_bulk(table_name, ticker_col, date_col, value_col, series))
+        else:
+            for key, name in series.items():
+                all_audit_results.append(audit_series(table_name, ticker_col, key, date_col, value_col, display_name=name))
     
     generate_html_report(all_audit_results)
 
 
 if __name__ == "__main__":
     load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
-    main()
\ No newline at end of file
+    main(bulk='--serial' not in sys.argv)
\ No newline at end of file
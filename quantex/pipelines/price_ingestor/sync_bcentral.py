@@ -2,12 +2,20 @@
 
 import requests
 import os
+import sys
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import pandas as pd
-from supabase import create_client, Client
+from supabase import Client
 import math
 
+# --- Configuración de Rutas ---
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+
+from quantex.core.supabase_pool import get_supabase_client
+
 # Cargar variables de entorno
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '..', '..', '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -22,7 +30,7 @@ if not all([BC_USER, BC_PASSWORD, SUPABASE_URL, SUPABASE_KEY]):
     exit(1)
 
 # Inicializar cliente Supabase
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase: Client = get_supabase_client(SUPABASE_URL, SUPABASE_KEY)
 
 BC_BASE_URL = "https://si3.bcentral.cl/SieteRestWS/SieteRestWS.ashx"
 
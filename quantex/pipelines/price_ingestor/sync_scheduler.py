@@ -0,0 +1,136 @@
+# quantex/pipelines/price_ingestor/sync_scheduler.py
+# Planificador de etapas con dependencias para la sincronización diaria.
+# Cada etapa declara sus dependencias y su "carril" (lane). Las etapas de carriles
+# distintos corren en paralelo; dentro de un carril se respeta su límite de
+# concurrencia (p. ej. 1 para los bots de navegador o para una misma API con cuota).
+
+import time
+import logging
+import traceback
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class SyncStage:
+    """Una etapa del DAG de sincronización."""
+
+    def __init__(self, name: str, func, lane: str, depends_on: list[str] | None = None):
+        self.name = name
+        self.func = func
+        self.lane = lane
+        self.depends_on = depends_on or []
+
+
+class SyncScheduler:
+    """
+    Ejecuta un conjunto de SyncStage respetando dependencias y límites por carril.
+    Una dependencia fallida no bloquea a sus dependientes (igual que el orquestador
+    secuencial original, que ejecutaba todo); solo fija el orden.
+    """
+
+    def __init__(self, stages: list[SyncStage], lane_limits: dict[str, int] | None = None, default_lane_limit: int = 1):
+        self.stages = {stage.name: stage for stage in stages}
+        self.lane_limits = lane_limits or {}
+        self.default_lane_limit = default_lane_limit
+        self.timings = {}
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"La etapa '{stage.name}' depende de '{dep}', que no existe.")
+        # Detección de ciclos (orden topológico)
+        self.topological_order()
+
+    def topological_order(self) -> list[str]:
+        order, visiting, visited = [], set(), set()
+
+        def _visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Ciclo de dependencias detectado en la etapa '{name}'.")
+            visiting.add(name)
+            for dep in self.stages[name].depends_on:
+                _visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+
+        for name in self.stages:
+            _visit(name)
+        return order
+
+    def _run_stage(self, stage: SyncStage):
+        started_at = datetime.now()
+        start = time.perf_counter()
+        print(f"\n--- ▶️  [{stage.lane}] Iniciando etapa '{stage.name}' ---")
+        try:
+            stage.func()
+        except Exception as e:
+            # Las etapas registran su propio resultado en el reporte; esto es una red de seguridad.
+            logging.error(f"Etapa '{stage.name}' terminó con excepción no controlada: {e}")
+            logging.error(traceback.format_exc())
+        duration = time.perf_counter() - start
+        self.timings[stage.name] = {
+            'lane': stage.lane,
+            'started_at': started_at,
+            'ended_at': datetime.now(),
+            'wall_time_s': round(duration, 2),
+        }
+        print(f"--- ⏹️  [{stage.lane}] Etapa '{stage.name}' finalizada en {duration:.1f}s ---")
+
+    def run(self) -> dict:
+        """Ejecuta todas las etapas. Devuelve los tiempos por etapa."""
+        order = self.topological_order()
+        pending = set(self.stages)
+        completed = set()
+        running = {}
+        lane_running = {}
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.stages)), thread_name_prefix="sync_stage") as executor:
+            while pending or running:
+                for name in sorted(pending, key=order.index):
+                    stage = self.stages[name]
+                    lane_limit = self.lane_limits.get(stage.lane, self.default_lane_limit)
+                    if not all(dep in completed for dep in stage.depends_on):
+                        continue
+                    if lane_running.get(stage.lane, 0) >= lane_limit:
+                        continue
+                    lane_running[stage.lane] = lane_running.get(stage.lane, 0) + 1
+                    running[executor.submit(self._run_stage, stage)] = name
+                    pending.discard(name)
+
+                if not running:
+                    # No debería ocurrir tras _validate, pero evita un bucle infinito
+                    raise RuntimeError(f"Etapas sin poder ejecutarse: {sorted(pending)}")
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    lane = self.stages[name].lane
+                    lane_running[lane] -= 1
+                    completed.add(name)
+
+        return self.timings
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """
+        Camino crítico del DAG: la cadena de dependencias con mayor suma de
+        tiempos de pared. Devuelve (etapas, segundos).
+        """
+        best = {}
+        for name in self.topological_order():
+            own = self.timings.get(name, {}).get('wall_time_s', 0.0)
+            deps = self.stages[name].depends_on
+            if deps:
+                prev = max(deps, key=lambda d: best[d][1])
+                best[name] = (best[prev][0] + [name], best[prev][1] + own)
+            else:
+                best[name] = ([name], own)
+        if not best:
+            return [], 0.0
+        path, total = max(best.values(), key=lambda item: item[1])
+        return path, round(total, 2)
+
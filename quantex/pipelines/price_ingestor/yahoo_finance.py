@@ -18,6 +18,7 @@ load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
 
 # Importamos el cliente de Supabase
 from quantex.core.database_manager import supabase
+from quantex.core.record_serializer import ohlcv_to_upsert_records
 
 # ==============================================================================
 # SECCIÓN 1: TU FUNCIÓN ORIGINAL (SE MANTIENE INTACTA)
@@ -125,19 +126,7 @@ def sync_yfinance_data_to_supabase():
                     data_df.index = data_df.index.tz_localize(None)
 
                 print(f"    -> Preparando {len(data_df)} registros para upsertar...")
-                records_to_upsert = []
-                for index, row in data_df.iterrows():
-                    record = {
-                        "timestamp": index.strftime('%Y-%m-%d'),
-                        "ticker": ticker,
-                        "open": float(row['Open']),
-                        "high": float(row['High']),
-                        "low": float(row['Low']),
-                        "close": float(row['Close']),
-                        "volume": int(row['Volume']),
-                        "source": SOURCE_NAME
-                    }
-                    records_to_upsert.append(record)
+                records_to_upsert = ohlcv_to_upsert_records(data_df, ticker, SOURCE_NAME)
 
                 if records_to_upsert:
                     supabase.table(TABLE_NAME).upsert(records_to_upsert, on_conflict='timestamp,ticker').execute()
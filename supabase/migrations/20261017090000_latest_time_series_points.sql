@@ -0,0 +1,19 @@
+-- Último punto de cada serie de time_series_data en una sola llamada.
+-- Usado por el forward fill masivo (run_all_syncs.forward_fill_series_bulk).
+-- El LATERAL ... LIMIT 1 aprovecha el índice único (series_id, timestamp).
+
+create or replace function public.latest_time_series_points(series_ids uuid[])
+returns table (series_id uuid, "timestamp" timestamptz, value double precision)
+language sql
+stable
+as $$
+    select s.id as series_id, d."timestamp", d.value::double precision
+    from unnest(series_ids) as s(id)
+    cross join lateral (
+        select t."timestamp", t.value
+        from public.time_series_data t
+        where t.series_id = s.id
+        order by t."timestamp" desc
+        limit 1
+    ) d;
+$$;
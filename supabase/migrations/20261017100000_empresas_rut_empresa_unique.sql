@@ -0,0 +1,6 @@
+-- Clave única para el upsert masivo de empresas (on_conflict='rut_empresa').
+-- Los scripts de ingesta ya deduplicaban por RUT normalizado antes de insertar,
+-- así que la tabla no debería contener RUTs repetidos.
+
+create unique index if not exists empresas_rut_empresa_key
+    on public.empresas (rut_empresa);
@@ -0,0 +1,108 @@
+-- Agregados del grafo de conocimiento calculados en el servidor.
+-- Los analizadores (TemporalAnalyzer, KnowledgeGraphCurator) reciben kilobytes de
+-- conteos en vez de descargar todas las filas de nodes / edges.
+-- Fachada en Python: quantex/core/autoconocimiento/graph_stats.py
+
+-- Índices para grado / huérfanos (búsquedas por extremo de la conexión)
+create index if not exists edges_source_id_idx on public.edges (source_id);
+create index if not exists edges_target_id_idx on public.edges (target_id);
+create index if not exists nodes_created_at_idx on public.nodes (created_at);
+
+-- Conteo de nodos por día (UTC) y tipo. Semanas y meses se derivan de los días.
+-- Los nodos sin created_at vuelven con bucket_day null (y siempre se incluyen).
+create or replace function public.graph_node_buckets(since timestamptz default null)
+returns table (bucket_day date, node_type text, node_count bigint)
+language sql
+stable
+as $$
+    select (n.created_at at time zone 'UTC')::date as bucket_day,
+           coalesce(n.type, 'Desconocido') as node_type,
+           count(*) as node_count
+    from public.nodes n
+    where since is null or n.created_at is null or n.created_at >= since
+    group by 1, 2;
+$$;
+
+-- Palabras de las etiquetas por mes (UTC): minúsculas, solo letras y más de min_length - 1 caracteres
+-- (misma regla que TemporalAnalyzer: len(word) > 3 and word.isalpha()).
+create or replace function public.graph_topic_counts(since timestamptz default null, min_length int default 4)
+returns table (bucket_month text, topic text, topic_count bigint)
+language sql
+stable
+as $$
+    select to_char(coalesce(n.created_at, now()) at time zone 'UTC', 'YYYY-MM') as bucket_month,
+           w.word as topic,
+           count(*) as topic_count
+    from public.nodes n
+    cross join lateral regexp_split_to_table(lower(n.label), '\s+') as w(word)
+    where (since is null or n.created_at is null or n.created_at >= since)
+      and length(w.word) >= min_length
+      and w.word ~ '^[[:alpha:]]+$'
+    group by 1, 2;
+$$;
+
+-- Grado de cada nodo: número de extremos de conexión (un self-loop cuenta 2).
+create or replace function public.graph_node_degrees()
+returns table (node_id text, degree bigint)
+language sql
+stable
+as $$
+    select e.node_id, count(*) as degree
+    from (
+        select source_id::text as node_id from public.edges where source_id is not null
+        union all
+        select target_id::text from public.edges where target_id is not null
+    ) e
+    group by e.node_id;
+$$;
+
+-- Distribución de grados (incluye grado 0 = nodos huérfanos).
+create or replace function public.graph_degree_distribution()
+returns table (degree bigint, node_count bigint)
+language sql
+stable
+as $$
+    select coalesce(d.degree, 0) as degree, count(*) as node_count
+    from public.nodes n
+    left join public.graph_node_degrees() d on d.node_id = n.id::text
+    group by 1
+    order by 1;
+$$;
+
+-- Nodos sin ninguna conexión entrante o saliente.
+create or replace function public.graph_orphan_nodes(limit_count int default null)
+returns table (id text, label text, node_type text)
+language sql
+stable
+as $$
+    select n.id::text, n.label, n.type
+    from public.nodes n
+    where not exists (select 1 from public.edges e where e.source_id = n.id)
+      and not exists (select 1 from public.edges e where e.target_id = n.id)
+    order by n.created_at desc nulls last
+    limit limit_count;
+$$;
+
+-- Nodos con más conexiones.
+create or replace function public.graph_hub_nodes(limit_count int default 10)
+returns table (id text, label text, node_type text, degree bigint)
+language sql
+stable
+as $$
+    select n.id::text, n.label, n.type, d.degree
+    from public.graph_node_degrees() d
+    join public.nodes n on n.id::text = d.node_id
+    order by d.degree desc, n.id
+    limit limit_count;
+$$;
+
+-- Totales del grafo.
+create or replace function public.graph_summary()
+returns table (total_nodes bigint, total_edges bigint, connected_nodes bigint)
+language sql
+stable
+as $$
+    select (select count(*) from public.nodes),
+           (select count(*) from public.edges),
+           (select count(*) from public.graph_node_degrees());
+$$;
@@ -0,0 +1,27 @@
+-- Claves de deduplicación indexadas para Documentos y upsert de Entidades.
+-- Antes los filtros properties->>'original_url' / properties->>'hash' recorrían
+-- toda la tabla nodes. Las columnas generadas se mantienen solas al insertar o
+-- actualizar properties; los helpers de quantex/core/node_dedup.py filtran por ellas.
+-- Benchmark: supabase/benchmarks/nodes_dedup_keys.py
+
+alter table public.nodes
+    add column if not exists dedup_url text
+        generated always as (properties->>'original_url') stored;
+
+alter table public.nodes
+    add column if not exists dedup_hash text
+        generated always as (properties->>'hash') stored;
+
+-- Parciales: todas las búsquedas de duplicados filtran type = 'Documento'
+create index if not exists nodes_documento_dedup_url_idx
+    on public.nodes (dedup_url)
+    where type = 'Documento';
+
+create index if not exists nodes_documento_dedup_hash_idx
+    on public.nodes (dedup_hash)
+    where type = 'Documento';
+
+-- Lookups de entidades por (type, label): precarga del caché e in_() de etiquetas.
+-- El upsert on_conflict='label,type' sigue usando la restricción única existente.
+create index if not exists nodes_type_label_idx
+    on public.nodes (type, label);
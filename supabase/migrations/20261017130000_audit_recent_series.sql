@@ -0,0 +1,56 @@
+-- Ventana reciente (últimos row_limit registros) de muchas series en una sola llamada.
+-- Usado por la auditoría masiva (supabase_auditor.audit_series_bulk).
+-- Devuelve una fila por serie con sus fechas ordenadas y el conteo de nulos, así
+-- la respuesta no choca con el límite de filas de PostgREST. Cada LATERAL ... LIMIT
+-- recorre el índice (clave, fecha) desde el final.
+
+create or replace function public.audit_recent_market_data(tickers text[], row_limit int default 800)
+returns table (series_key text, obs_dates text[], null_values bigint)
+language sql
+stable
+as $$
+    select s.key, array_agg(to_jsonb(d.obs_date) #>> '{}' order by d.obs_date), count(*) filter (where d.obs_value is null)
+    from unnest(tickers) as s(key)
+    cross join lateral (
+        select t."timestamp" as obs_date, t.close as obs_value
+        from public.market_data_ohlcv t
+        where t.ticker = s.key
+        order by t."timestamp" desc
+        limit row_limit
+    ) d
+    group by s.key;
+$$;
+
+create or replace function public.audit_recent_fixed_income(instrument_names text[], row_limit int default 800)
+returns table (series_key text, obs_dates text[], null_values bigint)
+language sql
+stable
+as $$
+    select s.key, array_agg(to_jsonb(d.obs_date) #>> '{}' order by d.obs_date), count(*) filter (where d.obs_value is null)
+    from unnest(instrument_names) as s(key)
+    cross join lateral (
+        select t.trade_date as obs_date, t.average_yield as obs_value
+        from public.fixed_income_trades t
+        where t.instrument_name = s.key
+        order by t.trade_date desc
+        limit row_limit
+    ) d
+    group by s.key;
+$$;
+
+create or replace function public.audit_recent_time_series(series_ids uuid[], row_limit int default 800)
+returns table (series_key text, obs_dates text[], null_values bigint)
+language sql
+stable
+as $$
+    select s.id::text, array_agg(to_jsonb(d.obs_date) #>> '{}' order by d.obs_date), count(*) filter (where d.obs_value is null)
+    from unnest(series_ids) as s(id)
+    cross join lateral (
+        select t."timestamp" as obs_date, t.value as obs_value
+        from public.time_series_data t
+        where t.series_id = s.id
+        order by t."timestamp" desc
+        limit row_limit
+    ) d
+    group by s.id;
+$$;
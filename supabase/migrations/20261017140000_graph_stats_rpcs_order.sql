@@ -0,0 +1,50 @@
+-- Orden estable para paginar las RPC de agregados del grafo con .range().
+-- El límite max-rows de PostgREST (1000) también recorta las funciones que devuelven
+-- conjuntos: graph_topic_counts (mes x palabra), graph_node_buckets sin 'since'
+-- (día x tipo) y graph_orphan_nodes lo superan. SupabaseGraphStats pide páginas con
+-- .range(), y para que no se solapen ni salten filas cada función ordena por una
+-- clave única.
+
+create or replace function public.graph_node_buckets(since timestamptz default null)
+returns table (bucket_day date, node_type text, node_count bigint)
+language sql
+stable
+as $$
+    select (n.created_at at time zone 'UTC')::date as bucket_day,
+           coalesce(n.type, 'Desconocido') as node_type,
+           count(*) as node_count
+    from public.nodes n
+    where since is null or n.created_at is null or n.created_at >= since
+    group by 1, 2
+    order by 1 nulls first, 2;
+$$;
+
+create or replace function public.graph_topic_counts(since timestamptz default null, min_length int default 4)
+returns table (bucket_month text, topic text, topic_count bigint)
+language sql
+stable
+as $$
+    select to_char(coalesce(n.created_at, now()) at time zone 'UTC', 'YYYY-MM') as bucket_month,
+           w.word as topic,
+           count(*) as topic_count
+    from public.nodes n
+    cross join lateral regexp_split_to_table(lower(n.label), '\s+') as w(word)
+    where (since is null or n.created_at is null or n.created_at >= since)
+      and length(w.word) >= min_length
+      and w.word ~ '^[[:alpha:]]+$'
+    group by 1, 2
+    order by 1, 2;
+$$;
+
+create or replace function public.graph_orphan_nodes(limit_count int default null)
+returns table (id text, label text, node_type text)
+language sql
+stable
+as $$
+    select n.id::text, n.label, n.type
+    from public.nodes n
+    where not exists (select 1 from public.edges e where e.source_id = n.id)
+      and not exists (select 1 from public.edges e where e.target_id = n.id)
+    order by n.created_at desc nulls last, n.id
+    limit limit_count;
+$$;
@@ -466,7 +466,17 @@ def _generate_committee_table(committee_data: list) -> str:
     """
     table_rows = ""
     
-    for data in committee_data:
+    # Todos los resúmenes (3 por ticker) son independientes: se piden en paralelo
+    summaries = _summarize_many_with_ai(
+        [text for data in committee_data for text in (
+            data['chartista']['sintesis_y_perspectiva'],
+            data['quant']['sintesis_cuantitativa'],
+            data['cio']['resumen_cio'],
+        )],
+        30
+    )
+    
+    for i, data in enumerate(committee_data):
         ticker = data['ticker']
         instrument_name = data['instrument_name']
         conviccion = data['conviccion']
@@ -487,9 +497,7 @@ def _generate_committee_table(committee_data: list) -> str:
         # print(f"  -> 🕵️ ESPÍA Texto Quant original: '{data['quant']['sintesis_cuantitativa'][:100]}...'")
         # print(f"  -> 🕵️ ESPÍA Texto CIO original: '{data['cio']['resumen_cio'][:100]}...'")
         
-        chartista_resumen = _summarize_with_ai(data['chartista']['sintesis_y_perspectiva'], 30)
-        quant_resumen = _summarize_with_ai(data['quant']['sintesis_cuantitativa'], 30)
-        cio_resumen = _summarize_with_ai(data['cio']['resumen_cio'], 30)
+        chartista_resumen, quant_resumen, cio_resumen = summaries[i * 3:i * 3 + 3]
         
         # Convertir recomendación a términos regulatorios
         recomendacion_regulatoria = _convert_to_regulatory_terms(recomendacion_final)
@@ -573,18 +581,11 @@ def _smart_cut_summary(text: str, max_words: int) -> str:
     return ' '.join(words[:max_words])
 
 
-def _summarize_with_ai(text: str, max_words: int) -> str:
-    """
-    Usa IA para resumir el texto a máximo X palabras manteniendo el sentido.
-    """
-    if not text or text == 'N/A':
-        return 'N/A'
-    
-    try:
-        # Importar llm_manager
-        from quantex.core import llm_manager
-        
-        prompt = f"""
+SUMMARY_SYSTEM_PROMPT = "Eres un experto en análisis técnico. Resume de manera concisa y precisa, manteniendo el contexto clave. Usa entre 25-35 palabras. NO uses puntos suspensivos (...). Completa cada frase con sentido. Prioriza la coherencia sobre el conteo exacto."
+
+
+def _build_summary_prompt(text: str, max_words: int) -> str:
+    return f"""
         Resume el siguiente análisis técnico en entre {max_words-5} y {max_words+5} palabras completas.
         
         REGLAS:
@@ -599,44 +600,63 @@ def _summarize_with_ai(text: str, max_words: int) -> str:
         
         Resumen coherente de {max_words-5} a {max_words+5} palabras:
         """
-        
-        response = llm_manager.generate_completion(
-            task_complexity='simple',
-            system_prompt="Eres un experto en análisis técnico. Resume de manera concisa y precisa, manteniendo el contexto clave. Usa entre 25-35 palabras. NO uses puntos suspensivos (...). Completa cada frase con sentido. Prioriza la coherencia sobre el conteo exacto.",
-            user_prompt=prompt,
-            model_preference='haiku'  # Usar Haiku para resúmenes simples y baratos
-        )
-        
-        summary = response.get('raw_text', text)
-        
-        # ESPÍA: Ver qué está generando Haiku
-        # print(f"  -> 🕵️ ESPÍA Haiku: '{summary}'")
-        # print(f"  -> 🕵️ ESPÍA Palabras generadas: {len(summary.split())}")
-        
-        # Verificar que esté en el rango aceptable (25-35 palabras)
-        words = summary.split()
-        word_count = len(words)
-        
-        if word_count < max_words-5 or word_count > max_words+5:
-            print(f"  -> ⚠️ Haiku generó {word_count} palabras, rango aceptable: {max_words-5}-{max_words+5}. Ajustando...")
-            if word_count > max_words+5:
-                # Corte inteligente: buscar puntos, comas o punto y coma
-                summary = _smart_cut_summary(summary, max_words+5)
-                # print(f"  -> 🕵️ ESPÍA Después del corte inteligente: '{summary}'")
-            else:
-                # Si es muy corto, usar resumen simple
-                summary = "Análisis técnico muestra indicadores mixtos y tendencia variable en el activo"
-                # print(f"  -> 🕵️ ESPÍA Después del ajuste: '{summary}'")
+
+
+def _adjust_summary_length(summary: str, max_words: int) -> str:
+    """Verifica que el resumen esté en el rango aceptable (max_words ± 5 palabras)."""
+    words = summary.split()
+    word_count = len(words)
+    
+    if word_count < max_words-5 or word_count > max_words+5:
+        print(f"  -> ⚠️ Haiku generó {word_count} palabras, rango aceptable: {max_words-5}-{max_words+5}. Ajustando...")
+        if word_count > max_words+5:
+            # Corte inteligente: buscar puntos, comas o punto y coma
+            summary = _smart_cut_summary(summary, max_words+5)
         else:
-            print(f"  -> ✅ Haiku generó {word_count} palabras, dentro del rango aceptable")
+            # Si es muy corto, usar resumen simple
+            summary = "Análisis técnico muestra indicadores mixtos y tendencia variable en el activo"
+    else:
+        print(f"  -> ✅ Haiku generó {word_count} palabras, dentro del rango aceptable")
+    return summary
+
+
+def _summarize_with_ai(text: str, max_words: int) -> str:
+    """
+    Usa IA para resumir el texto a máximo X palabras manteniendo el sentido.
+    """
+    return _summarize_many_with_ai([text], max_words)[0]
+
+
+def _summarize_many_with_ai(texts: list, max_words: int) -> list:
+    """
+    Resume varios textos a la vez: las llamadas a Haiku se lanzan en paralelo con
+    llm_manager.gather_completions. Devuelve los resúmenes en el mismo orden.
+    """
+    summaries = ['N/A' if not text or text == 'N/A' else None for text in texts]
+    pending = [i for i, summary in enumerate(summaries) if summary is None]
+    if not pending:
+        return summaries
+    
+    try:
+        # Importar llm_manager
+        from quantex.core import llm_manager
         
-        # print(f"  -> 🕵️ ESPÍA Final: '{summary}' ({len(summary.split())} palabras)")
-        return summary
+        responses = llm_manager.gather_completions([
+            {
+                'task_complexity': 'simple',  # Haiku para resúmenes simples y baratos
+                'system_prompt': SUMMARY_SYSTEM_PROMPT,
+                'user_prompt': _build_summary_prompt(texts[i], max_words),
+            }
+            for i in pending
+        ])
+        for i, response in zip(pending, responses):
+            summaries[i] = _adjust_summary_length(response.get('raw_text', texts[i]), max_words)
+        return summaries
         
     except Exception as e:
         print(f"  -> ⚠️ Error resumiendo con IA: {e}")
         # Fallback al truncado simple
-        return _truncate_to_words(text, max_words)
+        return [summary if summary is not None else _truncate_to_words(texts[i], max_words) for i, summary in enumerate(summaries)]
 
 def _convert_to_regulatory_terms(recomendacion: str) -> str:
     """
@@ -7,7 +7,10 @@ import pandas as pd
 import requests
 import PIL.Image
 import io
+import time
+import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from flask import jsonify
 from jinja2 import Environment, FileSystemLoader
 
@@ -20,7 +23,11 @@ from quantex.core import database_manager as db
 from quantex.core import llm_manager
 from quantex.core.data_fetcher import get_data_series 
 from quantex.core.tools.technical_tools import calculate_all_indicators
-from quantex.core.tools.visualization_tools import generate_and_upload_clean_price_chart, generate_and_upload_full_indicator_chart
+from quantex.core.tools.visualization_tools import generate_and_upload_clean_price_chart, generate_full_indicator_chart
+
+# --- Concurrencia por ticker (sobrescribible vía receta o parámetros) ---
+DEFAULT_MAX_CONCURRENT_TICKERS = 4
+DEFAULT_TICKER_TIMEOUT_SECONDS = 600
 
 # --- Lógica Interna de la Vertical ---
 
@@ -54,16 +61,17 @@ def _prepare_technical_dossier(ticker: str, report_definition: dict) -> dict | N
         # --- INICIO DE LA MODIFICACIÓN: Generar ambos gráficos ---
         
         # 1. Gráfico Estratégico (Usa todos los datos de 'strategic_days')
+        # Los PNG se conservan en memoria para el comité; la subida a Storage corre en segundo plano.
         df_strategic_chart_data = df_indicators.tail(strategic_days)
-        strategic_chart_url = generate_and_upload_full_indicator_chart(df_strategic_chart_data, f"{ticker}_Strategic", tech_params)
+        strategic_chart = generate_full_indicator_chart(df_strategic_chart_data, f"{ticker}_Strategic", tech_params)
 
         # 2. Gráfico Táctico (Usa solo los últimos 'tactical_days')
         df_tactical_chart_data = df_indicators.tail(tactical_days)
-        tactical_chart_url = generate_and_upload_full_indicator_chart(df_tactical_chart_data, f"{ticker}_Tactical", tech_params)
+        tactical_chart = generate_full_indicator_chart(df_tactical_chart_data, f"{ticker}_Tactical", tech_params)
         
         # --- FIN DE LA MODIFICACIÓN ---
 
-        if not strategic_chart_url or not tactical_chart_url:
+        if not strategic_chart or not tactical_chart or not strategic_chart.get("url") or not tactical_chart.get("url"):
             raise Exception("Fallo en la generación o subida de uno o más gráficos.")
 
         # --- INICIO DE LA MODIFICACIÓN: Actualizar el dossier de salida ---
@@ -71,8 +79,17 @@ def _prepare_technical_dossier(ticker: str, report_definition: dict) -> dict | N
             "ticker": ticker,
             "analysis_date": df_indicators.index[-1].strftime('%Y-%m-%d'),
             "numerical_data": df_indicators.iloc[-1].to_dict(),
-            "chart_url_strategic": strategic_chart_url,
-            "chart_url_tactical": tactical_chart_url
+            "chart_url_strategic": strategic_chart["url"],
+            "chart_url_tactical": tactical_chart["url"],
+            # Claves internas (no serializables): se retiran antes de persistir resultados
+            "_chart_images": {
+                "chart_url_strategic": strategic_chart["image_bytes"],
+                "chart_url_tactical": tactical_chart["image_bytes"]
+            },
+            "_chart_uploads": {
+                "chart_url_strategic": (strategic_chart["file_name"], strategic_chart["upload_future"]),
+                "chart_url_tactical": (tactical_chart["file_name"], tactical_chart["upload_future"])
+            }
         }
         # --- FIN DE LA MODIFICACIÓN ---
         
@@ -97,6 +114,8 @@ def _run_investment_committee(dossier: dict, report_definition: dict) -> dict |
             raise ValueError("Pipeline de síntesis no definido en la receta.")
 
         chained_context = dossier.copy()
+        chart_images = chained_context.pop("_chart_images", {})
+        chained_context.pop("_chart_uploads", None)
 
         for specialist in synthesis_pipeline:
             specialist_name = specialist.get("specialist_name")
@@ -116,15 +135,7 @@ def _run_investment_committee(dossier: dict, report_definition: dict) -> dict |
                 ticker = chained_context.get('ticker')
                 if ticker:
                     # Detectar tipo de comité basado en el ticker
-                    if ticker == "USDCLP.FOREX":
-                        cio_key = "cio_clp"
-                        comite_type = "CLP"
-                    elif ticker == "HG=F":
-                        cio_key = "cio_cobre"
-                        comite_type = "Cobre"
-                    else:
-                        cio_key = f"cio_{ticker}"
-                        comite_type = "Mercado"
+                    cio_key, comite_type = _resolve_cio_key(ticker)
                     
                     expert_context = db.get_expert_context(cio_key)
                     if expert_context:
@@ -146,17 +157,23 @@ def _run_investment_committee(dossier: dict, report_definition: dict) -> dict |
             
             images_for_prompt = []
             # --- INICIO DE LA MODIFICACIÓN: Lógica de asignación de gráficos ---
+            chart_key = None
             if specialist_name == "Chartista" and "chart_url_strategic" in chained_context:
                 print("    -> 🖼️  Adjuntando gráfico estratégico para el Chartista...")
-                response = requests.get(chained_context["chart_url_strategic"])
-                if response.status_code == 200:
-                    images_for_prompt.append(PIL.Image.open(io.BytesIO(response.content)))
-
+                chart_key = "chart_url_strategic"
             elif specialist_name == "Quant" and "chart_url_tactical" in chained_context:
                 print("    -> 🖼️  Adjuntando gráfico táctico para el Quant Visual...")
-                response = requests.get(chained_context["chart_url_tactical"])
-                if response.status_code == 200:
-                    images_for_prompt.append(PIL.Image.open(io.BytesIO(response.content)))
+                chart_key = "chart_url_tactical"
+
+            if chart_key:
+                image_bytes = chart_images.get(chart_key)
+                if image_bytes is None:
+                    # Sin imagen en memoria (dossier externo): descargar desde Storage
+                    response = requests.get(chained_context[chart_key])
+                    if response.status_code == 200:
+                        image_bytes = response.content
+                if image_bytes:
+                    images_for_prompt.append(PIL.Image.open(io.BytesIO(image_bytes)))
             # --- FIN DE LA MODIFICACIÓN ---                    
 
             structured_data = llm_manager.generate_structured_output(
@@ -227,6 +244,148 @@ def _create_committee_html_report(committee_results: dict, template_path: str) -
         return f"<html><body><h1>Error generando el informe</h1><p>{e}</p></body></html>"
 
 
+def _await_chart_uploads(dossier: dict) -> None:
+    """
+    Espera las subidas en segundo plano de los gráficos del dossier. Si alguna
+    falló, reintenta de forma síncrona con los bytes en memoria.
+    """
+    uploads = dossier.get("_chart_uploads", {})
+    images = dossier.get("_chart_images", {})
+    for chart_key, (file_name, future) in uploads.items():
+        if future.result():
+            continue
+        print(f"    -> 🟡 Subida en segundo plano de '{chart_key}' falló. Reintentando...")
+        if not db.upload_file_to_storage("report-charts", file_name, images.get(chart_key)):
+            raise Exception(f"No se pudo subir el gráfico '{chart_key}' a Storage.")
+
+def _resolve_cio_key(ticker: str) -> tuple[str, str]:
+    """Devuelve (cio_key, comite_type) para la memoria del CIO según el ticker."""
+    if ticker == "USDCLP.FOREX":
+        return "cio_clp", "CLP"
+    if ticker == "HG=F":
+        return "cio_cobre", "Cobre"
+    return f"cio_{ticker}", "Mercado"
+
+def _process_single_ticker(ticker: str, report_def: dict, report_keyword: str, template_path: str, cancel_event: threading.Event | None = None) -> tuple[dict, str | None, dict | None]:
+    """
+    Ejecuta el flujo completo de un ticker (dossier -> comité -> HTML -> artifact).
+    Devuelve (status, html_report, artifact). Si 'cancel_event' se activa (timeout),
+    no se persiste nada en Supabase.
+    """
+    try:
+        dossier = _prepare_technical_dossier(ticker, report_def)
+        if not dossier:
+            return {"ticker": ticker, "status": "error", "reason": "prep_failed"}, None, None
+
+        committee_results = _run_investment_committee(dossier, report_def)
+        if not committee_results:
+            return {"ticker": ticker, "status": "error", "reason": "committee_failed"}, None, None
+
+        # Espía opcional para depuración por ticker
+        # import pprint
+        # print("\n🕵️  ESPÍA (PRE-REPORTE) - Datos finales para la plantilla de", ticker)
+        # pprint.pprint(committee_results)
+        # print("---------------------------------\n")
+
+        # Render HTML individual del comité técnico
+        html_report = _create_committee_html_report(committee_results, template_path)
+
+        # El HTML referencia las URLs públicas: las subidas deben haber terminado antes de persistir
+        _await_chart_uploads(dossier)
+
+        if cancel_event is not None and cancel_event.is_set():
+            print(f"  -> 🟡 [Vertical Tec] {ticker} terminó después de su timeout. No se guarda el artifact.")
+            return {"ticker": ticker, "status": "error", "reason": "timeout"}, None, None
+
+        # Guardar UN SOLO artifact por ticker (HTML + JSON en una fila)
+        artifact = db.insert_generated_artifact(
+            report_keyword=report_keyword,
+            artifact_content=html_report,
+            artifact_type=f"report_{report_keyword}_final",
+            results_packet=committee_results,
+            ticker=ticker  # <-- AÑADIMOS EL TICKER
+        )
+
+        # Guardar memoria del CIO después de crear el artefacto
+        if artifact and committee_results.get('expert_context_output'):
+            cio_key, comite_type = _resolve_cio_key(ticker)
+            
+            expert_vision = committee_results.get('expert_context_output')
+            if expert_vision and expert_vision.get('current_view_label') and expert_vision.get('core_thesis_summary'):
+                db.update_expert_context(
+                    report_keyword=cio_key,
+                    view_label=expert_vision['current_view_label'],
+                    thesis_summary=expert_vision['core_thesis_summary'],
+                    artifact_id=artifact.get('id')
+                )
+                print(f"    -> 🧠 Memoria del CIO guardada para {comite_type} ({ticker})")
+            else:
+                print(f"    -> 🟡 No se encontró una 'Visión Experta' válida para guardar para {comite_type} ({ticker})")
+
+        return {"ticker": ticker, "status": "ok", "artifact_id": (artifact or {}).get("id")}, html_report, artifact
+    except Exception as inner_e:
+        print(f"❌ [Vertical Análisis Técnico] Falló el procesamiento de {ticker}: {inner_e}")
+        traceback.print_exc()
+        return {"ticker": ticker, "status": "error", "reason": str(inner_e)}, None, None
+
+def _get_concurrency_settings(parameters: dict, report_def: dict) -> tuple[int, float | None]:
+    """
+    Lee la concurrencia y el timeout por ticker. Prioridad: parámetros de la
+    llamada > 'config_params' de la receta > valores por defecto.
+    """
+    data_reqs_str = report_def.get("data_requirements", "{}")
+    data_reqs = json.loads(data_reqs_str) if isinstance(data_reqs_str, str) else (data_reqs_str or {})
+    config_params = data_reqs.get("config_params", {}) or {}
+
+    max_workers = parameters.get("max_concurrent_tickers") or config_params.get("max_concurrent_tickers") or DEFAULT_MAX_CONCURRENT_TICKERS
+    ticker_timeout = parameters.get("ticker_timeout_seconds") or config_params.get("ticker_timeout_seconds") or DEFAULT_TICKER_TIMEOUT_SECONDS
+    return max(1, int(max_workers)), (float(ticker_timeout) if ticker_timeout else None)
+
+def _run_tickers_concurrently(tickers: list, report_def: dict, report_keyword: str, template_path: str, max_workers: int, ticker_timeout: float | None) -> list:
+    """
+    Procesa los tickers en un pool acotado de hilos para que las esperas de LLM
+    y de I/O de distintos tickers se solapen. El timeout se mide desde que cada
+    ticker empieza a ejecutarse (no desde que entra a la cola). Devuelve la
+    lista de (status, html_report, artifact) en el orden original de 'tickers'.
+    """
+    results = [None] * len(tickers)
+    start_times = {}
+    cancel_events = [threading.Event() for _ in tickers]
+
+    def _worker(index: int, ticker: str):
+        start_times[index] = time.monotonic()
+        return _process_single_ticker(ticker, report_def, report_keyword, template_path, cancel_events[index])
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tickers)) or 1, thread_name_prefix="comite_tec")
+    try:
+        future_to_index = {executor.submit(_worker, i, ticker): i for i, ticker in enumerate(tickers)}
+        pending = set(future_to_index)
+        while pending:
+            done, pending = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = future_to_index[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = ({"ticker": tickers[index], "status": "error", "reason": str(e)}, None, None)
+
+            if ticker_timeout is None:
+                continue
+            now = time.monotonic()
+            for future in list(pending):
+                index = future_to_index[future]
+                started = start_times.get(index)
+                if started is not None and now - started > ticker_timeout:
+                    print(f"  -> ⏱️  [Vertical Tec] Timeout de {ticker_timeout}s para {tickers[index]}.")
+                    cancel_events[index].set()
+                    results[index] = ({"ticker": tickers[index], "status": "error", "reason": "timeout"}, None, None)
+                    pending.discard(future)
+    finally:
+        # No bloquear la respuesta esperando hilos que ya excedieron su timeout
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
 # --- FUNCIÓN DE ENTRADA PÚBLICA DE LA VERTICAL ---
 
 def run(parameters: dict) -> dict:
@@ -248,72 +407,19 @@ def run(parameters: dict) -> dict:
 
         template_path = report_def.get("template_file")
 
+        max_workers, ticker_timeout = _get_concurrency_settings(parameters, report_def)
+        print(f"  -> ⚙️  [Vertical Tec] Procesando {len(tickers)} tickers (concurrencia={max_workers}, timeout={ticker_timeout}s)")
+
         per_ticker_status = []
         last_html_report = None
         last_artifact = None
 
-        for ticker in tickers:
-            try:
-                dossier = _prepare_technical_dossier(ticker, report_def)
-                if not dossier:
-                    per_ticker_status.append({"ticker": ticker, "status": "error", "reason": "prep_failed"})
-                    continue
-
-                committee_results = _run_investment_committee(dossier, report_def)
-                if not committee_results:
-                    per_ticker_status.append({"ticker": ticker, "status": "error", "reason": "committee_failed"})
-                    continue
-
-                # Espía opcional para depuración por ticker
-                # import pprint
-                # print("\n🕵️  ESPÍA (PRE-REPORTE) - Datos finales para la plantilla de", ticker)
-                # pprint.pprint(committee_results)
-                # print("---------------------------------\n")
-
-                # Render HTML individual del comité técnico
-                html_report = _create_committee_html_report(committee_results, template_path)
-
-                # Guardar UN SOLO artifact por ticker (HTML + JSON en una fila)
-                artifact = db.insert_generated_artifact(
-                    report_keyword=report_keyword,
-                    artifact_content=html_report,
-                    artifact_type=f"report_{report_keyword}_final",
-                    results_packet=committee_results,
-                    ticker=ticker  # <-- AÑADIMOS EL TICKER
-                )
-
-                # Guardar memoria del CIO después de crear el artefacto
-                if artifact and committee_results.get('expert_context_output'):
-                    # Detectar tipo de comité basado en el ticker
-                    if ticker == "USDCLP.FOREX":
-                        cio_key = "cio_clp"
-                        comite_type = "CLP"
-                    elif ticker == "HG=F":
-                        cio_key = "cio_cobre"
-                        comite_type = "Cobre"
-                    else:
-                        cio_key = f"cio_{ticker}"
-                        comite_type = "Mercado"
-                    
-                    expert_vision = committee_results.get('expert_context_output')
-                    if expert_vision and expert_vision.get('current_view_label') and expert_vision.get('core_thesis_summary'):
-                        db.update_expert_context(
-                            report_keyword=cio_key,
-                            view_label=expert_vision['current_view_label'],
-                            thesis_summary=expert_vision['core_thesis_summary'],
-                            artifact_id=artifact.get('id')
-                        )
-                        print(f"    -> 🧠 Memoria del CIO guardada para {comite_type} ({ticker})")
-                    else:
-                        print(f"    -> 🟡 No se encontró una 'Visión Experta' válida para guardar para {comite_type} ({ticker})")
-
-                per_ticker_status.append({"ticker": ticker, "status": "ok", "artifact_id": (artifact or {}).get("id")})
+        # Los resultados vuelven en el mismo orden que 'market_data_series'
+        for status, html_report, artifact in _run_tickers_concurrently(tickers, report_def, report_keyword, template_path, max_workers, ticker_timeout):
+            per_ticker_status.append(status)
+            if status.get("status") == "ok":
                 last_html_report = html_report
                 last_artifact = artifact
-            except Exception as inner_e:
-                print(f"❌ [Vertical Análisis Técnico] Falló el procesamiento de {ticker}: {inner_e}")
-                traceback.print_exc()
-                per_ticker_status.append({"ticker": ticker, "status": "error", "reason": str(inner_e)})
 
         # Construir respuesta resumida
         summary_lines = ["### ✅ Datos base generados - Comité Técnico"]
@@ -9,13 +9,15 @@ import sys
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import Client
 
 # Agregar el directorio raíz al path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+from quantex.core.supabase_pool import get_supabase_client
+
 # Cargar variables de entorno
 load_dotenv(os.path.join(PROJECT_ROOT, '.env'))
 
@@ -48,7 +50,7 @@ class LinkedInMonitorSupabase(LinkedInMonitor):
         if not supabase_url or not supabase_key:
             raise ValueError("SUPABASE_URL y SUPABASE_SERVICE_KEY son requeridas")
         
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        self.supabase: Client = get_supabase_client(supabase_url, supabase_key)
         logger.info("LinkedIn Monitor Supabase inicializado correctamente")
     
     def update_supabase_with_results(self, processed_results: list) -> bool: